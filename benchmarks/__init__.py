@@ -0,0 +1 @@
+"""Define benchmarks for pytile."""
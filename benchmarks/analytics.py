@@ -0,0 +1,77 @@
+"""Measure how long history analytics take for a fleet of Tiles.
+
+Run with:
+
+    python -m benchmarks.analytics --tiles 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from time import perf_counter
+
+from pytile.analytics import find_stay_points, split_trips, total_distance
+from pytile.history import HistoryColumns
+
+START_MS = 1672531200000  # 2023-01-01T00:00:00Z
+
+
+def _build_history(points: int, interval_ms: int) -> HistoryColumns:
+    """Build a year-like history that alternates between stays and trips.
+
+    Args:
+        points: The number of location updates.
+        interval_ms: The time between location updates.
+
+    Returns:
+        Location updates.
+    """
+    latitude, longitude = 51.5, -0.38
+    moving = False
+    updates = []
+    for idx in range(points):
+        if random.random() < 0.02:
+            moving = not moving
+        if moving:
+            latitude += random.uniform(-0.005, 0.005)
+            longitude += random.uniform(-0.005, 0.005)
+        updates.append(
+            {
+                "latitude": latitude + random.gauss(0, 0.0001),
+                "location_timestamp": START_MS + idx * interval_ms,
+                "longitude": longitude + random.gauss(0, 0.0001),
+            }
+        )
+    return HistoryColumns.from_updates(updates)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tiles", type=int, default=100, help="number of Tiles")
+    parser.add_argument(
+        "--interval", type=int, default=600, help="seconds between location updates"
+    )
+    args = parser.parse_args()
+
+    points = 365 * 86400 // args.interval
+    history = _build_history(points, args.interval * 1000)
+
+    start = perf_counter()
+    trips = stay_points = 0
+    for _ in range(args.tiles):
+        total_distance(history)
+        trips += len(split_trips(history))
+        stay_points += len(find_stay_points(history))
+    elapsed = perf_counter() - start
+
+    print(
+        f"{args.tiles} Tiles x {points} updates: {elapsed:.2f} s "
+        f"({elapsed / args.tiles * 1000:.1f} ms/Tile; "
+        f"{trips // args.tiles} trips, {stay_points // args.tiles} stay points per Tile)"
+    )
+
+
+if __name__ == "__main__":
+    main()
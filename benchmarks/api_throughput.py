@@ -0,0 +1,347 @@
+"""Measure pytile's throughput against a local simulated Tile API.
+
+For each account size, a simulated Tile API (see benchmarks.tile_api_server) is
+started in a separate process, and the following operations are measured:
+
+- async_login (a number of concurrent logins)
+- API.async_get_tiles
+- Tile.async_update (every Tile, concurrently)
+- Tile.async_history (every Tile, concurrently)
+
+For each operation, the report includes HTTP requests/sec, p50/p99 HTTP request
+latency, and the peak memory allocated by the client (via tracemalloc, which slows
+everything down somewhat; pass --no-memory to skip it).
+
+Run with:
+
+    python -m benchmarks.api_throughput --tiles 10,1000,10000 --latency 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import statistics
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import ClientSession, TraceConfig, TraceRequestEndParams
+
+from pytile import async_login
+from pytile.api import API, APIOptions
+from pytile.retry import RetryPolicy
+
+from .tile_api_server import ServerConfig, run_server
+
+SERVER_STARTUP_TIMEOUT = 10.0
+
+
+@dataclass
+class RequestStats:
+    """Define HTTP request statistics collected by an aiohttp trace."""
+
+    latencies: list[float] = field(default_factory=list)
+    failures: int = 0
+
+    def reset(self) -> None:
+        """Start collecting from scratch."""
+        self.latencies.clear()
+        self.failures = 0
+
+
+def _build_trace_config(stats: RequestStats) -> TraceConfig:
+    """Build an aiohttp trace config that records every request into stats.
+
+    Args:
+        stats: The statistics to record into.
+
+    Returns:
+        An aiohttp trace config.
+    """
+
+    async def on_request_start(
+        session: ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        """Record the start of a request.
+
+        Args:
+            session: The aiohttp session.
+            context: The trace context of the request.
+            params: The trace parameters.
+        """
+        context.start = perf_counter()
+
+    async def on_request_end(
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceRequestEndParams,
+    ) -> None:
+        """Record the end of a request.
+
+        Args:
+            session: The aiohttp session.
+            context: The trace context of the request.
+            params: The trace parameters.
+        """
+        stats.latencies.append(perf_counter() - context.start)
+        if params.response.status >= 400:
+            stats.failures += 1
+
+    async def on_request_exception(
+        session: ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        """Record a failed request.
+
+        Args:
+            session: The aiohttp session.
+            context: The trace context of the request.
+            params: The trace parameters.
+        """
+        stats.latencies.append(perf_counter() - context.start)
+        stats.failures += 1
+
+    trace_config = TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+def _get_free_port() -> int:
+    """Return a free TCP port on the loopback interface.
+
+    Returns:
+        A port number.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+async def _async_wait_for_server(port: int) -> None:
+    """Wait until the simulated Tile API accepts connections.
+
+    Args:
+        port: The port of the server.
+
+    Raises:
+        TimeoutError: Raised when the server doesn't start in time.
+    """
+    deadline = perf_counter() + SERVER_STARTUP_TIMEOUT
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            if perf_counter() > deadline:
+                raise TimeoutError("The simulated Tile API didn't start") from None
+            await asyncio.sleep(0.05)
+            continue
+        writer.close()
+        await writer.wait_closed()
+        return
+
+
+def _percentile(latencies: list[float], percentile: int) -> float:
+    """Return a latency percentile in milliseconds.
+
+    Args:
+        latencies: Latencies in seconds.
+        percentile: The percentile (between 1 and 99).
+
+    Returns:
+        The latency in milliseconds (NaN without enough data).
+    """
+    if len(latencies) < 2:
+        return latencies[0] * 1000 if latencies else float("nan")
+    return statistics.quantiles(latencies, n=100)[percentile - 1] * 1000
+
+
+async def _async_measure(
+    label: str,
+    tile_count: int,
+    stats: RequestStats,
+    measure_memory: bool,
+    operation: Callable[[], Awaitable[Any]],
+) -> Any:
+    """Run an operation and print its statistics.
+
+    Args:
+        label: The name of the operation.
+        tile_count: The number of Tiles in the account.
+        stats: The HTTP request statistics of the session.
+        measure_memory: Whether to measure peak memory.
+        operation: The operation.
+
+    Returns:
+        The result of the operation.
+    """
+    stats.reset()
+    if measure_memory:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+
+    start = perf_counter()
+    result = await operation()
+    elapsed = perf_counter() - start
+
+    peak = "n/a"
+    if measure_memory:
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        peak = f"{(peak_bytes - baseline) / 2**20:.1f}"
+
+    print(
+        f"{tile_count:>7}  {label:<22}{len(stats.latencies):>9}{stats.failures:>8}"
+        f"{len(stats.latencies) / elapsed:>10.0f}"
+        f"{_percentile(stats.latencies, 50):>10.1f}"
+        f"{_percentile(stats.latencies, 99):>10.1f}{peak:>10}"
+    )
+    return result
+
+
+async def async_run(  # pylint: disable=too-many-arguments
+    config: ServerConfig,
+    *,
+    logins: int,
+    max_concurrency: int,
+    measure_memory: bool,
+) -> None:
+    """Benchmark pytile against a simulated Tile API with a given config.
+
+    Args:
+        config: The server config.
+        logins: The number of concurrent logins to measure.
+        max_concurrency: The maximum number of simultaneous requests per API object.
+        measure_memory: Whether to measure peak memory.
+    """
+    port = _get_free_port()
+    server = multiprocessing.get_context("spawn").Process(
+        target=run_server, args=(config,), kwargs={"port": port}, daemon=True
+    )
+    server.start()
+
+    stats = RequestStats()
+    try:
+        await _async_wait_for_server(port)
+
+        async with ClientSession(trace_configs=[_build_trace_config(stats)]) as session:
+            options = APIOptions(
+                api_url=f"http://127.0.0.1:{port}/api/v1",
+                max_concurrency=max_concurrency,
+                # Simulated failures are only retried when they're expected:
+                retry_policy=RetryPolicy() if config.error_rate else None,
+            )
+
+            apis = await _async_measure(
+                "async_login",
+                config.tile_count,
+                stats,
+                measure_memory,
+                lambda: asyncio.gather(
+                    *(
+                        async_login(
+                            f"user{idx}@example.com",
+                            "password",
+                            session,
+                            options=options,
+                        )
+                        for idx in range(logins)
+                    ),
+                    return_exceptions=True,
+                ),
+            )
+            # Carry on with the first successful login (session creation isn't
+            # retried, so some logins may have failed):
+            apis = [api for api in apis if isinstance(api, API)]
+            if not apis:
+                raise RuntimeError("Every login failed")
+            api = apis.pop(0)
+            for other_api in apis:
+                await other_api.async_close()
+
+            tiles = await _async_measure(
+                "async_get_tiles",
+                config.tile_count,
+                stats,
+                measure_memory,
+                api.async_get_tiles,
+            )
+
+            await _async_measure(
+                "Tile.async_update",
+                config.tile_count,
+                stats,
+                measure_memory,
+                lambda: asyncio.gather(
+                    *(tile.async_update() for tile in tiles.values()),
+                    return_exceptions=True,
+                ),
+            )
+
+            end = datetime.now()
+            start = end - timedelta(days=1)
+            await _async_measure(
+                "Tile.async_history",
+                config.tile_count,
+                stats,
+                measure_memory,
+                lambda: asyncio.gather(
+                    *(tile.async_history(start, end) for tile in tiles.values()),
+                    return_exceptions=True,
+                ),
+            )
+
+            await api.async_close()
+    finally:
+        server.terminate()
+        server.join()
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--tiles", default="10,1000,10000", help="comma-separated account sizes"
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="mean latency (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="failure rate")
+    parser.add_argument("--padding", type=int, default=0, help="bytes of filler")
+    parser.add_argument("--history-updates", type=int, default=100)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--max-concurrency", type=int, default=50)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc")
+    args = parser.parse_args()
+
+    measure_memory = not args.no_memory
+    if measure_memory:
+        tracemalloc.start()
+
+    print(
+        f"{'tiles':>7}  {'operation':<22}{'requests':>9}{'errors':>8}{'req/s':>10}"
+        f"{'p50 ms':>10}{'p99 ms':>10}{'peak MiB':>10}"
+    )
+    for tile_count in (int(count) for count in args.tiles.split(",")):
+        asyncio.run(
+            async_run(
+                ServerConfig(
+                    tile_count=tile_count,
+                    latency=args.latency / 1000,
+                    error_rate=args.error_rate,
+                    payload_padding=args.padding,
+                    history_updates=args.history_updates,
+                ),
+                logins=args.logins,
+                max_concurrency=args.max_concurrency,
+                measure_memory=measure_memory,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""Define a local stand-in for the Tile API that serves synthetic accounts.
+
+Responses are built from the shapes in tests/fixtures. Run standalone with:
+
+    python -m benchmarks.tile_api_server --tiles 1000 --latency 20 --port 8080
+
+...and point an API object at it with
+APIOptions(api_url="http://127.0.0.1:8080/api/v1").
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from time import time
+from typing import Any, cast
+
+from aiohttp import web
+
+FIXTURES_PATH = Path(__file__).parent.parent / "tests" / "fixtures"
+
+# The center of the area that synthetic Tiles are scattered around:
+CENTER_LATITUDE = 51.528308
+CENTER_LONGITUDE = -0.3817765
+
+SESSION_LIFETIME_MS = 24 * 60 * 60 * 1000
+
+
+@dataclass(frozen=True)
+class ServerConfig:
+    """Define the behavior of the simulated Tile API."""
+
+    tile_count: int = 10
+    # The mean latency (in seconds) of a response; actual latencies are uniformly
+    # distributed between half and one and a half times this:
+    latency: float = 0.0
+    # The fraction of requests that fail with an HTTP 503:
+    error_rate: float = 0.0
+    # The number of bytes of filler to add to each Tile details payload:
+    payload_padding: int = 0
+    # The number of location updates in each history response:
+    history_updates: int = 100
+
+
+def _load_fixture(filename: str) -> dict[str, Any]:
+    """Load a fixture payload.
+
+    Args:
+        filename: The filename of the fixtures/ file to load.
+
+    Returns:
+        An API response payload.
+    """
+    return cast(
+        dict[str, Any],
+        json.loads((FIXTURES_PATH / filename).read_text(encoding="utf-8")),
+    )
+
+
+def get_tile_uuid(index: int) -> str:
+    """Return the UUID of a synthetic Tile.
+
+    Args:
+        index: The index of the Tile.
+
+    Returns:
+        A Tile UUID.
+    """
+    return f"{index:016x}"
+
+
+class SimulatedTileAPI:
+    """Define a simulated Tile API.
+
+    Every account has the same config.tile_count Tiles; any credentials are accepted.
+    """
+
+    def __init__(self, config: ServerConfig) -> None:
+        """Initialize.
+
+        Args:
+            config: The server config.
+        """
+        self._config = config
+        self._create_client_response = _load_fixture("create_client_response.json")
+        self._tile_details_response = _load_fixture("tile_details_response.json")
+        self._tile_index = {
+            get_tile_uuid(index): index for index in range(config.tile_count)
+        }
+        self._tile_states_response = self._build_tile_states_response()
+
+    def _build_tile_states_response(self) -> dict[str, Any]:
+        """Build the response listing every Tile's state.
+
+        Returns:
+            An API response payload.
+        """
+        response = _load_fixture("tile_states_response.json")
+        template = response["result"][0]
+        response["result"] = []
+        for tile_uuid in self._tile_index:
+            state = copy.deepcopy(template)
+            state["tile_id"] = tile_uuid
+            response["result"].append(state)
+        return response
+
+    async def _async_simulate(self) -> None:
+        """Simulate a request's latency (and possible failure).
+
+        Raises:
+            HTTPServiceUnavailable: Raised for a simulated failure.
+        """
+        if self._config.latency:
+            await asyncio.sleep(self._config.latency * (0.5 + random.random()))
+        if random.random() < self._config.error_rate:
+            raise web.HTTPServiceUnavailable()
+
+    async def async_create_client(self, request: web.Request) -> web.Response:
+        """Handle a client creation request.
+
+        Args:
+            request: An aiohttp request.
+
+        Returns:
+            An aiohttp response.
+        """
+        await self._async_simulate()
+        response = copy.deepcopy(self._create_client_response)
+        response["result"]["client_uuid"] = request.match_info["client_uuid"]
+        return web.json_response(response)
+
+    async def async_create_session(self, request: web.Request) -> web.Response:
+        """Handle a session creation request.
+
+        Args:
+            request: An aiohttp request.
+
+        Returns:
+            An aiohttp response.
+
+        Raises:
+            HTTPBadRequest: Raised when no email address is given.
+        """
+        await self._async_simulate()
+        data = await request.post()
+        if not isinstance(email := data.get("email"), str):
+            raise web.HTTPBadRequest()
+
+        now = int(time() * 1000)
+        return web.json_response(
+            {
+                "version": 1,
+                "revision": 1,
+                "result_code": 0,
+                "result": {
+                    "client_uuid": request.match_info["client_uuid"],
+                    "user": {
+                        "user_uuid": f"user-{email}",
+                        "email": email,
+                        "status": "ACTIVATED",
+                    },
+                    "session_start_timestamp": now,
+                    "session_expiration_timestamp": now + SESSION_LIFETIME_MS,
+                    "changes": "EXISTING_ACCOUNT",
+                },
+            }
+        )
+
+    async def async_get_tile_states(self, request: web.Request) -> web.Response:
+        """Handle a request for every Tile's state.
+
+        Args:
+            request: An aiohttp request.
+
+        Returns:
+            An aiohttp response.
+        """
+        await self._async_simulate()
+        return web.json_response(self._tile_states_response)
+
+    async def async_get_tile(self, request: web.Request) -> web.Response:
+        """Handle a request for a Tile's details.
+
+        Args:
+            request: An aiohttp request.
+
+        Returns:
+            An aiohttp response.
+
+        Raises:
+            HTTPNotFound: Raised for an unknown Tile.
+        """
+        await self._async_simulate()
+        tile_uuid = request.match_info["tile_uuid"]
+        if (index := self._tile_index.get(tile_uuid)) is None:
+            raise web.HTTPNotFound()
+
+        response = copy.deepcopy(self._tile_details_response)
+        result = response["result"]
+        result["tile_uuid"] = tile_uuid
+        result["name"] = f"Tile {index}"
+        last_tile_state = result["last_tile_state"]
+        last_tile_state["tile_uuid"] = tile_uuid
+        last_tile_state["timestamp"] = int(time() * 1000)
+        last_tile_state["latitude"] = CENTER_LATITUDE + random.uniform(-0.1, 0.1)
+        last_tile_state["longitude"] = CENTER_LONGITUDE + random.uniform(-0.1, 0.1)
+        if self._config.payload_padding:
+            result["padding"] = "x" * self._config.payload_padding
+        return web.json_response(response)
+
+    async def async_get_history(self, request: web.Request) -> web.Response:
+        """Handle a request for a Tile's location history.
+
+        Args:
+            request: An aiohttp request.
+
+        Returns:
+            An aiohttp response.
+
+        Raises:
+            HTTPNotFound: Raised for an unknown Tile.
+        """
+        await self._async_simulate()
+        if request.match_info["tile_uuid"] not in self._tile_index:
+            raise web.HTTPNotFound()
+
+        start_ms = int(request.query["start_ts"])
+        end_ms = int(request.query["end_ts"])
+        count = self._config.history_updates
+        step = max((end_ms - start_ms) // max(count, 1), 1)
+        latitude = CENTER_LATITUDE
+        longitude = CENTER_LONGITUDE
+        updates = []
+        for timestamp in range(start_ms, end_ms + 1, step)[:count]:
+            latitude += random.uniform(-0.0005, 0.0005)
+            longitude += random.uniform(-0.0005, 0.0005)
+            updates.append(
+                {
+                    "altitude": 0.4076319168123,
+                    "horizontal_accuracy": 13.496111,
+                    "latitude": latitude,
+                    "location_timestamp": timestamp,
+                    "longitude": longitude,
+                }
+            )
+
+        response = _load_fixture("tile_history_response.json")
+        response["result"]["location_updates"] = updates
+        return web.json_response(response)
+
+    def build_app(self) -> web.Application:
+        """Build the aiohttp application.
+
+        Returns:
+            An aiohttp application.
+        """
+        app = web.Application()
+        app.add_routes(
+            [
+                web.put("/api/v1/clients/{client_uuid}", self.async_create_client),
+                web.post(
+                    "/api/v1/clients/{client_uuid}/sessions",
+                    self.async_create_session,
+                ),
+                web.get("/api/v1/tiles/tile_states", self.async_get_tile_states),
+                web.get(
+                    "/api/v1/tiles/location/history/{tile_uuid}",
+                    self.async_get_history,
+                ),
+                web.get("/api/v1/tiles/{tile_uuid}", self.async_get_tile),
+            ]
+        )
+        return app
+
+
+def run_server(config: ServerConfig, host: str = "127.0.0.1", port: int = 8080) -> None:
+    """Run the simulated Tile API until interrupted (blocking).
+
+    Args:
+        config: The server config.
+        host: The host to listen on.
+        port: The port to listen on.
+    """
+    web.run_app(
+        SimulatedTileAPI(config).build_app(),
+        host=host,
+        port=port,
+        access_log=None,
+        print=None,
+    )
+
+
+def main() -> None:
+    """Run the server."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tiles", type=int, default=10, help="Tiles per account")
+    parser.add_argument("--latency", type=float, default=0.0, help="mean latency (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="failure rate")
+    parser.add_argument("--padding", type=int, default=0, help="bytes of filler")
+    parser.add_argument("--history-updates", type=int, default=100)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    run_server(
+        ServerConfig(
+            tile_count=args.tiles,
+            latency=args.latency / 1000,
+            error_rate=args.error_rate,
+            payload_padding=args.padding,
+            history_updates=args.history_updates,
+        ),
+        host=args.host,
+        port=args.port,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Compare the memory footprint of regular and compact Tile objects.
+
+Run with:
+
+    python -m benchmarks.tile_memory --count 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+from unittest.mock import AsyncMock
+
+from pytile.tile import Tile
+
+FIXTURE_PATH = (
+    Path(__file__).parent.parent / "tests" / "fixtures" / "tile_details_response.json"
+)
+
+
+def _build_tiles(payload: str, count: int, **kwargs: Any) -> list[Tile]:
+    """Build a number of Tiles, each from its own freshly decoded payload.
+
+    Args:
+        payload: A raw Tile details payload.
+        count: The number of Tiles to build.
+        **kwargs: Additional kwargs to pass to the Tile constructor.
+
+    Returns:
+        A list of Tiles.
+    """
+    async_request = AsyncMock()
+    tiles = []
+    for idx in range(count):
+        data = json.loads(payload)
+        data["result"]["tile_uuid"] = f"{idx:016x}"
+        tiles.append(Tile(async_request, data, **kwargs))
+    return tiles
+
+
+def _measure(payload: str, count: int, **kwargs: Any) -> tuple[int, float]:
+    """Measure the memory retained by a number of Tiles and the time to serialize them.
+
+    Args:
+        payload: A raw Tile details payload.
+        count: The number of Tiles to build.
+        **kwargs: Additional kwargs to pass to the Tile constructor.
+
+    Returns:
+        The number of bytes retained and the number of seconds taken by as_dict().
+    """
+    gc.collect()
+    tracemalloc.start()
+    tiles = _build_tiles(payload, count, **kwargs)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = perf_counter()
+    for tile in tiles:
+        tile.as_dict()
+    return retained, perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10000, help="number of Tiles")
+    args = parser.parse_args()
+
+    payload = FIXTURE_PATH.read_text(encoding="utf-8")
+
+    print(f"{'layout':<24}{'bytes/Tile':>12}{'as_dict() µs/Tile':>20}")
+    for label, kwargs in (
+        ("regular", {}),
+        ("compact", {"compact": True}),
+        (
+            "compact + 2 extra fields",
+            {
+                "compact": True,
+                "extra_fields": ("metadata.battery_state", "product"),
+            },
+        ),
+    ):
+        retained, elapsed = _measure(payload, args.count, **kwargs)
+        print(
+            f"{label:<24}{retained / args.count:>12.0f}"
+            f"{elapsed / args.count * 1e6:>20.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""Define geospatial analytics over location history."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from .geo import EARTH_RADIUS_METERS, haversine
+from .history import HistoryColumns
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover
+    HAS_NUMPY = False
+
+DEFAULT_MAX_TRIP_GAP = timedelta(minutes=30)
+DEFAULT_STAY_POINT_DURATION = timedelta(minutes=10)
+DEFAULT_STAY_POINT_RADIUS = 100.0
+
+# While growing a stay point, distances to the following updates are computed in
+# chunks that start small (most stays are short) and double up to a maximum size:
+STAY_POINT_MAX_CHUNK_SIZE = 4096
+STAY_POINT_MIN_CHUNK_SIZE = 32
+
+
+@dataclass(frozen=True)
+class StayPoint:
+    """Define a period during which a Tile stayed in one place."""
+
+    latitude: float
+    longitude: float
+    arrival: datetime
+    departure: datetime
+    point_count: int
+
+    @property
+    def duration(self) -> timedelta:
+        """Return how long the Tile stayed.
+
+        Returns:
+            The duration.
+        """
+        return self.departure - self.arrival
+
+
+def _ms_to_datetime(timestamp: int) -> datetime:
+    """Return a timestamp in milliseconds as a naive UTC datetime.
+
+    Args:
+        timestamp: The number of milliseconds since the epoch.
+
+    Returns:
+        A datetime.
+    """
+    return datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc).replace(
+        tzinfo=None
+    )
+
+
+def _haversine_vectorized(lat1: Any, lon1: Any, lat2: Any, lon2: Any) -> Any:
+    """Return the great-circle distances between two sets of points.
+
+    Args:
+        lat1: A NumPy array (or scalar) of latitudes.
+        lon1: A NumPy array (or scalar) of longitudes.
+        lat2: A NumPy array of latitudes.
+        lon2: A NumPy array of longitudes.
+
+    Returns:
+        A NumPy array of distances in meters.
+    """
+    lat1 = np.radians(lat1)
+    lat2 = np.radians(lat2)
+    d_lon = np.radians(lon2 - lon1)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin(d_lon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def segment_distances(columns: HistoryColumns) -> Any:
+    """Return the distances between consecutive location updates.
+
+    Args:
+        columns: Location updates.
+
+    Returns:
+        A NumPy array (or array.array, without NumPy) of len(columns) - 1 distances in
+        meters (NaN where a location is missing).
+    """
+    latitudes = columns.latitudes
+    longitudes = columns.longitudes
+
+    if HAS_NUMPY:
+        return _haversine_vectorized(
+            latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:]
+        )
+    return array(
+        "d",
+        (
+            haversine(*segment)
+            for segment in zip(
+                latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:]
+            )
+        ),
+    )
+
+
+def segment_speeds(columns: HistoryColumns) -> Any:
+    """Return the speeds between consecutive location updates.
+
+    Args:
+        columns: Location updates.
+
+    Returns:
+        A NumPy array (or array.array, without NumPy) of len(columns) - 1 speeds in
+        meters per second (NaN where the speed can't be determined).
+    """
+    distances = segment_distances(columns)
+    timestamps = columns.timestamps
+
+    if HAS_NUMPY:
+        seconds = np.diff(timestamps) / 1000
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(seconds > 0, distances / seconds, np.nan)
+    return array(
+        "d",
+        (
+            distance / ((end - start) / 1000) if end > start else math.nan
+            for distance, start, end in zip(distances, timestamps[:-1], timestamps[1:])
+        ),
+    )
+
+
+def total_distance(columns: HistoryColumns) -> float:
+    """Return the total distance traveled (ignoring missing locations).
+
+    Args:
+        columns: Location updates.
+
+    Returns:
+        The distance in meters.
+    """
+    distances = segment_distances(columns)
+    if HAS_NUMPY:
+        return float(np.nansum(distances))
+    return math.fsum(distance for distance in distances if not math.isnan(distance))
+
+
+def split_trips(
+    columns: HistoryColumns,
+    *,
+    max_time_gap: timedelta = DEFAULT_MAX_TRIP_GAP,
+    max_distance_gap: float | None = None,
+    min_points: int = 2,
+) -> list[HistoryColumns]:
+    """Split location updates into trips wherever there's a gap between them.
+
+    Args:
+        columns: Location updates.
+        max_time_gap: The longest time between two updates of the same trip.
+        max_distance_gap: The longest distance (in meters) between two updates of the
+            same trip (if any).
+        min_points: The minimum number of location updates in a trip.
+
+    Returns:
+        A list of trips (each of which shares memory with the input).
+    """
+    max_gap_ms = max_time_gap.total_seconds() * 1000
+    timestamps = columns.timestamps
+
+    if HAS_NUMPY:
+        breaks = np.diff(timestamps) > max_gap_ms
+        if max_distance_gap is not None:
+            breaks |= segment_distances(columns) > max_distance_gap
+        boundaries = (np.flatnonzero(breaks) + 1).tolist()
+    else:
+        breaks = [
+            end - start > max_gap_ms
+            for start, end in zip(timestamps[:-1], timestamps[1:])
+        ]
+        if max_distance_gap is not None:
+            breaks = [
+                gap or distance > max_distance_gap
+                for gap, distance in zip(breaks, segment_distances(columns))
+            ]
+        boundaries = [idx + 1 for idx, gap in enumerate(breaks) if gap]
+
+    edges = [0, *boundaries, len(columns)]
+    return [
+        columns.slice_index(start, stop)
+        for start, stop in zip(edges[:-1], edges[1:])
+        if stop - start >= min_points
+    ]
+
+
+def _get_stay_end(latitudes: Any, longitudes: Any, start: int, radius: float) -> int:
+    """Return the index of the first update that is too far from a starting update.
+
+    Args:
+        latitudes: Latitudes.
+        longitudes: Longitudes.
+        start: The index of the starting update.
+        radius: The maximum distance (in meters) from the starting update.
+
+    Returns:
+        The index (len(latitudes) if every later update is within the radius).
+    """
+    count = len(latitudes)
+    lat, lon = latitudes[start], longitudes[start]
+
+    if HAS_NUMPY:
+        chunk_start = start + 1
+        chunk_size = STAY_POINT_MIN_CHUNK_SIZE
+        while chunk_start < count:
+            chunk_end = min(chunk_start + chunk_size, count)
+            distances = _haversine_vectorized(
+                lat,
+                lon,
+                latitudes[chunk_start:chunk_end],
+                longitudes[chunk_start:chunk_end],
+            )
+            # NaN (i.e., a missing location) doesn't end a stay:
+            if (outside := np.flatnonzero(distances > radius)).size:
+                return chunk_start + int(outside[0])
+            chunk_start = chunk_end
+            chunk_size = min(chunk_size * 2, STAY_POINT_MAX_CHUNK_SIZE)
+        return count
+
+    for end in range(start + 1, count):
+        if haversine(lat, lon, latitudes[end], longitudes[end]) > radius:
+            return end
+    return count
+
+
+def _get_centroids(
+    latitudes: Any, longitudes: Any, spans: list[tuple[int, int]]
+) -> list[tuple[float, float]]:
+    """Return the mean location of each of a number of runs of location updates.
+
+    Args:
+        latitudes: Latitudes.
+        longitudes: Longitudes.
+        spans: A list of (start, stop) index ranges.
+
+    Returns:
+        A list of (latitude, longitude) tuples (ignoring missing locations).
+    """
+    if HAS_NUMPY:
+        # Compute every mean at once from running totals:
+        valid = ~np.isnan(latitudes + longitudes)
+        totals = [
+            np.concatenate(([0], np.cumsum(column)))
+            for column in (
+                valid,
+                np.where(valid, latitudes, 0),
+                np.where(valid, longitudes, 0),
+            )
+        ]
+        starts = np.array([start for start, _ in spans], dtype=np.intp)
+        stops = np.array([stop for _, stop in spans], dtype=np.intp)
+        counts, latitude_sums, longitude_sums = (
+            total[stops] - total[starts] for total in totals
+        )
+        return list(
+            zip(
+                (latitude_sums / counts).tolist(),
+                (longitude_sums / counts).tolist(),
+            )
+        )
+
+    centroids = []
+    for start, stop in spans:
+        points = [
+            (lat, lon)
+            for lat, lon in zip(latitudes[start:stop], longitudes[start:stop])
+            if not math.isnan(lat + lon)
+        ]
+        centroids.append(
+            (
+                math.fsum(lat for lat, _ in points) / len(points),
+                math.fsum(lon for _, lon in points) / len(points),
+            )
+        )
+    return centroids
+
+
+def find_stay_points(
+    columns: HistoryColumns,
+    *,
+    radius: float = DEFAULT_STAY_POINT_RADIUS,
+    min_duration: timedelta = DEFAULT_STAY_POINT_DURATION,
+) -> list[StayPoint]:
+    """Find the places where a Tile stayed for a while.
+
+    A stay point is a run of location updates that are all within radius of the
+    first one and span at least min_duration.
+
+    Args:
+        columns: Location updates.
+        radius: The maximum distance (in meters) from where the stay started.
+        min_duration: The minimum duration of a stay.
+
+    Returns:
+        A list of stay points, in time order.
+    """
+    latitudes = columns.latitudes
+    longitudes = columns.longitudes
+    timestamps = columns.timestamps
+    min_duration_ms = min_duration.total_seconds() * 1000
+
+    # A stay can only start at an update whose successor is within the radius, which
+    # skips over periods of movement without visiting every update:
+    distances = segment_distances(columns)
+    if HAS_NUMPY:
+        candidates = np.flatnonzero(~(distances > radius)).tolist()
+    else:
+        candidates = [
+            idx for idx, distance in enumerate(distances) if not distance > radius
+        ]
+
+    spans = []
+    next_start = 0
+    for start in candidates:
+        if start < next_start or math.isnan(latitudes[start] + longitudes[start]):
+            continue
+
+        end = _get_stay_end(latitudes, longitudes, start, radius)
+        if timestamps[end - 1] - timestamps[start] >= min_duration_ms:
+            spans.append((start, end))
+            next_start = end
+
+    return [
+        StayPoint(
+            latitude=latitude,
+            longitude=longitude,
+            arrival=_ms_to_datetime(int(timestamps[start])),
+            departure=_ms_to_datetime(int(timestamps[end - 1])),
+            point_count=end - start,
+        )
+        for (start, end), (latitude, longitude) in zip(
+            spans, _get_centroids(latitudes, longitudes, spans)
+        )
+    ]
@@ -3,16 +3,42 @@
 from __future__ import annotations
 
 import asyncio
-from time import time
+import logging
+import random
+from collections.abc import Callable, Iterable
+from contextlib import suppress
+from dataclasses import dataclass
+from functools import partial
+from time import perf_counter, time
 from typing import Any, cast
 from uuid import uuid4
+from weakref import WeakMethod
 
 from aiohttp import ClientSession
-from aiohttp.client_exceptions import ClientError
+from aiohttp.client_exceptions import ClientError, ClientResponseError
+from yarl import URL
 
+from .cache import ResponseCache
+from .concurrency import DEFAULT_MAX_CONCURRENCY, AdaptiveConcurrencyLimiter
 from .const import LOGGER
-from .errors import InvalidAuthError, RequestError
-from .tile import Tile
+from .decoding import JSONDecoder, get_json_decoder
+from .errors import InvalidAuthError, RequestError, SessionExpiredError, TileError
+from .events import TileEventListener
+from .history_store import HistoryStore
+from .metrics import (
+    SESSION_BACKGROUND_RENEWAL,
+    SESSION_INLINE_RENEWAL,
+    SESSION_LOGIN,
+    SKIP_REASON_ERROR,
+    SKIP_REASON_NO_DETAILS,
+    Metrics,
+)
+from .rate_limit import RateLimiter
+from .retry import CircuitBreaker, RetryPolicy, is_transient_error
+from .session import SessionState, SessionStore
+from .tile import Tile, TileUpdateResult, TileUpdateStatus
+from .trace import RequestHook, RequestTimings, RequestTrace
+from .util import get_endpoint_template
 
 API_URL_SCAFFOLD = "https://production.tile-api.com/api/v1"
 
@@ -23,6 +49,157 @@ DEFAULT_LOCALE = "en-US"
 DEFAULT_TIMEOUT = 10
 DEFAULT_USER_AGENT = "Tile/4774 CFNetwork/1312 Darwin/21.0.0"
 
+InFlightRequestKey = tuple[str, tuple[tuple[str, Any], ...]]
+
+HTTP_STATUS_TOO_MANY_REQUESTS = 429
+HTTP_STATUS_SERVER_ERROR = 500
+
+
+def _is_overload_error(err: BaseException) -> bool:
+    """Return whether an error indicates that the Tile API is overloaded.
+
+    Args:
+        err: An exception raised while making a request.
+
+    Returns:
+        Whether the API should be sent fewer concurrent requests.
+    """
+    if isinstance(err, asyncio.TimeoutError):
+        return True
+    if isinstance(err, ClientResponseError):
+        return (
+            err.status == HTTP_STATUS_TOO_MANY_REQUESTS
+            or err.status >= HTTP_STATUS_SERVER_ERROR
+        )
+    return False
+
+
+def _is_label_error(err: BaseException) -> bool:
+    """Return whether an error indicates that a Tile is a Tile Label.
+
+    Tile Labels return an HTTP 412 because they don't have additional details.
+
+    Args:
+        err: An exception raised while requesting a Tile's details.
+
+    Returns:
+        Whether the Tile is a Tile Label.
+    """
+    return isinstance(err, RequestError) and "412" in str(err)
+
+
+async def _async_update_tile(tile: Tile) -> TileUpdateResult:
+    """Update a Tile in place and report the outcome.
+
+    Args:
+        tile: A Tile.
+
+    Returns:
+        The outcome.
+    """
+    old_values = (tile.as_dict(), tile.extra)
+    try:
+        await tile.async_update()
+    except (TileError, asyncio.TimeoutError) as err:
+        if _is_label_error(err):
+            return TileUpdateResult(tile, TileUpdateStatus.LABEL)
+        return TileUpdateResult(tile, TileUpdateStatus.ERROR, err)
+
+    if (tile.as_dict(), tile.extra) == old_values:
+        return TileUpdateResult(tile, TileUpdateStatus.UNCHANGED)
+    return TileUpdateResult(tile, TileUpdateStatus.UPDATED)
+
+
+def _call_weak_method(method: WeakMethod[Callable[..., None]], *args: Any) -> None:
+    """Call a weakly referenced method (if its object still exists).
+
+    Args:
+        method: A weak reference to a bound method.
+        *args: The arguments to call the method with.
+    """
+    if (bound_method := method()) is not None:
+        bound_method(*args)
+
+
+def _get_state_fingerprint(state: dict[str, Any]) -> tuple[Any, ...]:
+    """Return the values of a Tile state that indicate whether its details changed.
+
+    Args:
+        state: A single Tile's entry from the Tile states list.
+
+    Returns:
+        A hashable fingerprint of the state.
+    """
+    location = state.get("location") or {}
+    mark_as_lost = state.get("mark_as_lost") or {}
+    return (
+        location.get("location_timestamp"),
+        mark_as_lost.get("is_lost"),
+        mark_as_lost.get("timestamp"),
+    )
+
+
+@dataclass(frozen=True, kw_only=True)
+class APIOptions:  # pylint: disable=too-many-instance-attributes
+    """Define the tuning options of an API object.
+
+    A single APIOptions object may be shared by several API objects (e.g., to share a
+    rate limiter or a response cache between accounts).
+
+    Attributes:
+        api_url: The base URL of the Tile API (e.g., to point at a test server).
+        circuit_breaker: An optional circuit breaker to fail fast while the Tile API is
+            down.
+        compact_tiles: Whether Tiles should drop their raw payloads after parsing them
+            (to save memory).
+        concurrency_limiter: An optional concurrency limiter to share with other API
+            objects (overrides max_concurrency).
+        history_store: An optional local store of location history for Tiles to
+            answer history requests from.
+        json_decoder: An optional function to decode response bodies with (defaults
+            to the fastest one available).
+        max_concurrency: The maximum number of simultaneous requests.
+        metrics: Optional metrics to record into (e.g., DEFAULT_METRICS).
+        payload_log_sample_rate: The fraction of response payloads to include in debug
+            logs (when debug logging is enabled).
+        rate_limiter: An optional rate limiter (which may be shared with other API
+            objects).
+        request_hooks: Callables that receive a RequestTrace after every request
+            (including the ones made to log in).
+        response_cache: An optional cache for GET responses.
+        retry_policy: An optional policy for retrying failed requests.
+        session_renewal_margin: An optional number of seconds before the session
+            expires at which to renew it in the background (by default, sessions are
+            renewed inline once they expire).
+        session_store: An optional store to resume a saved session from (and to save
+            new sessions to), so that no login is needed while it remains valid.
+        tile_extra_fields: Dotted paths of additional Tile payload fields to keep
+            (available via Tile.extra).
+    """
+
+    api_url: str = API_URL_SCAFFOLD
+    circuit_breaker: CircuitBreaker | None = None
+    compact_tiles: bool = False
+    concurrency_limiter: AdaptiveConcurrencyLimiter | None = None
+    history_store: HistoryStore | None = None
+    json_decoder: JSONDecoder | None = None
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    metrics: Metrics | None = None
+    payload_log_sample_rate: float = 1.0
+    rate_limiter: RateLimiter | None = None
+    request_hooks: Iterable[RequestHook] = ()
+    response_cache: ResponseCache | None = None
+    retry_policy: RetryPolicy | None = None
+    session_renewal_margin: float | None = None
+    session_store: SessionStore | None = None
+    tile_extra_fields: Iterable[str] = ()
+
+    def __post_init__(self) -> None:
+        """Normalize the options."""
+        object.__setattr__(self, "api_url", self.api_url.rstrip("/"))
+        object.__setattr__(self, "request_hooks", tuple(self.request_hooks))
+        object.__setattr__(self, "tile_extra_fields", tuple(self.tile_extra_fields))
+
 
 class API:
     """Define the API management object."""
@@ -35,6 +212,7 @@ class API:
         *,
         client_uuid: str | None = None,
         locale: str = DEFAULT_LOCALE,
+        options: APIOptions | None = None,
     ) -> None:
         """Initialize.
 
@@ -44,24 +222,216 @@ class API:
             session: An optional aiohttp ClientSession.
             client_uuid: An optional UUID to identify this API object.
             locale: An optional locale.
+            options: Optional tuning options.
         """
+        self._options = options = options or APIOptions()
         self._client_established: bool = False
+        self._concurrency_limiter = (
+            options.concurrency_limiter
+            or AdaptiveConcurrencyLimiter(
+                initial_limit=options.max_concurrency,
+                max_limit=options.max_concurrency,
+            )
+        )
         self._email: str = email
+        self._json_decoder = options.json_decoder or get_json_decoder()
+        self._in_flight_requests: dict[
+            InFlightRequestKey, asyncio.Task[dict[str, Any]]
+        ] = {}
         self._locale: str = locale
         self._password: str = password
+        self._request_hooks: list[RequestHook] = list(options.request_hooks)
         self._session: ClientSession = session
         self._session_expiry: int | None = None
+        self._session_lock = asyncio.Lock()
+        self._session_renewal_handle: asyncio.TimerHandle | None = None
+        self._session_renewal_task: asyncio.Task[None] | None = None
+        self._tile_event_listeners: list[TileEventListener] = []
+        self._tile_fingerprints: dict[str, tuple[Any, ...]] = {}
+        self._tiles: dict[str, Tile] = {}
         self.client_uuid: str = client_uuid if client_uuid else str(uuid4())
         self.user_uuid: str | None = None
 
     async def _async_request(
-        self, method: str, endpoint: str, **kwargs: dict[str, Any]
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        use_cache: bool = True,
+        **kwargs: dict[str, Any],
     ) -> dict[str, Any]:
         """Make an API request.
 
         Args:
             method: An HTTP method.
             endpoint: A relative API endpoint.
+            use_cache: Whether a cached response may be returned (GET requests only);
+                when False, the cache is refreshed with the new response.
+            **kwargs: Additional kwargs to send with the request.
+
+        Returns:
+            An API response payload.
+        """
+        await self._async_ensure_session()
+
+        if method.lower() != "get":
+            return await self._async_send(method, endpoint, **kwargs)
+
+        params = kwargs.get("params")
+        if self._options.response_cache is not None:
+            if not use_cache:
+                self._options.response_cache.invalidate(endpoint)
+            elif (
+                data := self._options.response_cache.get(method, endpoint, params)
+            ) is not None:
+                if self._request_hooks or self._options.metrics is not None:
+                    self._record_request(
+                        RequestTrace(
+                            method=method,
+                            endpoint=get_endpoint_template(endpoint),
+                            status=None,
+                            duration=0.0,
+                            cache_hit=True,
+                        )
+                    )
+                return data
+
+        # Identical GET requests that are already in flight share a single response:
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        if (task := self._in_flight_requests.get(key)) is None:
+            task = asyncio.create_task(self._async_get(endpoint, **kwargs))
+            task.add_done_callback(partial(self._finish_in_flight_request, key))
+            self._in_flight_requests[key] = task
+
+        # Shield the shared request so that a cancelled caller doesn't cancel it for
+        # everyone else:
+        return await asyncio.shield(task)
+
+    async def _async_get(
+        self, endpoint: str, **kwargs: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Send a GET request to the API and cache the response (if appropriate).
+
+        Args:
+            endpoint: A relative API endpoint.
+            **kwargs: Additional kwargs to send with the request.
+
+        Returns:
+            An API response payload.
+        """
+        data = await self._async_send("get", endpoint, **kwargs)
+        if self._options.response_cache is not None:
+            self._options.response_cache.set(
+                "get", endpoint, kwargs.get("params"), data
+            )
+        return data
+
+    def _finish_in_flight_request(
+        self, key: InFlightRequestKey, task: asyncio.Task[dict[str, Any]]
+    ) -> None:
+        """Stop tracking a completed in-flight request.
+
+        Args:
+            key: The key of the in-flight request.
+            task: The completed request task.
+        """
+        self._in_flight_requests.pop(key, None)
+        if not task.cancelled():
+            # Mark any exception as retrieved, in case every caller was cancelled:
+            task.exception()
+
+    def _record_request(self, trace: RequestTrace) -> None:
+        """Record a request trace in the metrics and pass it to every hook.
+
+        Args:
+            trace: A request trace.
+        """
+        if self._options.metrics is not None:
+            self._options.metrics.record_request(trace)
+
+        for hook in self._request_hooks:
+            try:
+                hook(trace)
+            except (TileError, asyncio.TimeoutError):
+                LOGGER.exception("Error in request hook %s", hook)
+
+    async def _async_send(
+        self, method: str, endpoint: str, **kwargs: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Send a request to the API (and trace it, if there are metrics or hooks).
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            **kwargs: Additional kwargs to send with the request.
+
+        Returns:
+            An API response payload.
+        """
+        if not self._request_hooks and self._options.metrics is None:
+            return await self._async_send_with_retries(method, endpoint, None, **kwargs)
+
+        timings = RequestTimings()
+        error: BaseException | None = None
+        start = perf_counter()
+        try:
+            return await self._async_send_with_retries(
+                method, endpoint, timings, **kwargs
+            )
+        except BaseException as err:
+            error = err
+            raise
+        finally:
+            self._record_request(
+                RequestTrace(
+                    method=method,
+                    endpoint=get_endpoint_template(endpoint),
+                    status=timings.status,
+                    duration=perf_counter() - start,
+                    queued=timings.queued,
+                    wire=timings.wire,
+                    decoding=timings.decoding,
+                    response_bytes=timings.response_bytes,
+                    retries=timings.retries,
+                    error=error,
+                )
+            )
+
+    async def _async_before_attempt(
+        self, endpoint: str, timings: RequestTimings | None
+    ) -> None:
+        """Check the circuit breaker and wait for the rate limiter before an attempt.
+
+        Args:
+            endpoint: A relative API endpoint.
+            timings: Timings to record the time spent waiting into (if any).
+        """
+        if self._options.circuit_breaker:
+            self._options.circuit_breaker.before_request(endpoint)
+
+        if not (rate_limiter := self._options.rate_limiter):
+            return
+
+        if timings is None:
+            await rate_limiter.async_acquire(endpoint)
+        else:
+            queue_start = perf_counter()
+            await rate_limiter.async_acquire(endpoint)
+            timings.queued += perf_counter() - queue_start
+
+    async def _async_send_with_retries(
+        self,
+        method: str,
+        endpoint: str,
+        timings: RequestTimings | None,
+        **kwargs: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Send a request to the API, retrying failed attempts per the retry policy.
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            timings: Timings to record the request's progress into (if any).
             **kwargs: Additional kwargs to send with the request.
 
         Returns:
@@ -70,10 +440,8 @@ class API:
         Raises:
             InvalidAuthError: Raised upon invalid credentials.
             RequestError: Raised upon an underlying HTTP error.
+            TimeoutError: Raised when the request times out.
         """
-        if self._session_expiry and self._session_expiry <= int(time() * 1000):
-            await self.async_init()
-
         kwargs.setdefault("headers", {})
         kwargs["headers"]["User-Agent"] = DEFAULT_USER_AGENT
         kwargs["headers"]["tile_api_version"] = DEFAULT_API_VERSION
@@ -81,86 +449,488 @@ class API:
         kwargs["headers"]["tile_app_version"] = DEFAULT_APP_VERSION
         kwargs["headers"]["tile_client_uuid"] = self.client_uuid
 
+        attempt = 1
+        while True:
+            await self._async_before_attempt(endpoint, timings)
+
+            try:
+                data = await self._async_send_once(method, endpoint, timings, **kwargs)
+            except (ClientError, asyncio.TimeoutError) as err:
+                if self._options.circuit_breaker:
+                    if is_transient_error(err):
+                        self._options.circuit_breaker.record_failure()
+                    else:
+                        self._options.circuit_breaker.record_success()
+
+                if (
+                    self._options.retry_policy
+                    and (
+                        delay := self._options.retry_policy.get_retry_delay(
+                            method, err, attempt
+                        )
+                    )
+                    is not None
+                ):
+                    LOGGER.debug(
+                        "Retrying /%s in %.2f seconds (attempt %s failed): %s",
+                        endpoint,
+                        delay,
+                        attempt,
+                        err,
+                    )
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    if timings is not None:
+                        timings.retries += 1
+                    continue
+
+                if isinstance(err, asyncio.TimeoutError):
+                    raise
+                if "401" in str(err):
+                    raise InvalidAuthError("Invalid credentials") from err
+                raise RequestError(
+                    f"Error requesting data from {endpoint}: {err}"
+                ) from err
+
+            if self._options.circuit_breaker:
+                self._options.circuit_breaker.record_success()
+
+            # Formatting large payloads is expensive, so only do it when it'll be seen:
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                self._log_response(endpoint, data)
+
+            return data
+
+    def _log_response(self, endpoint: str, data: dict[str, Any]) -> None:
+        """Log a response (including a sample of the payloads) at the debug level.
+
+        Args:
+            endpoint: A relative API endpoint.
+            data: An API response payload.
+        """
+        if random.random() < self._options.payload_log_sample_rate:
+            LOGGER.debug("Data received from /%s: %s", endpoint, data)
+        else:
+            LOGGER.debug("Data received from /%s", endpoint)
+
+    async def _async_send_once(
+        self,
+        method: str,
+        endpoint: str,
+        timings: RequestTimings | None,
+        **kwargs: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Make a single attempt at sending a request to the API.
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            timings: Timings to record the attempt's progress into (if any).
+            **kwargs: Additional kwargs to send with the request.
+
+        Returns:
+            An API response payload.
+
+        Raises:
+            ClientError: Raised upon an underlying HTTP error.
+            TimeoutError: Raised when the request times out.
+        """
+        overloaded = False
+        queue_start = perf_counter() if timings is not None else 0.0
+        await self._concurrency_limiter.async_acquire()
+        wire_start = perf_counter() if timings is not None else 0.0
+        if timings is not None:
+            timings.queued += wire_start - queue_start
+
         try:
             async with self._session.request(
-                method, f"{API_URL_SCAFFOLD}/{endpoint}", **kwargs
+                method, f"{self._options.api_url}/{endpoint}", **kwargs
             ) as resp:
+                if timings is not None:
+                    timings.status = resp.status
                 resp.raise_for_status()
-                data = await resp.json()
-        except ClientError as err:
-            if "401" in str(err):
-                raise InvalidAuthError("Invalid credentials") from err
-            raise RequestError(f"Error requesting data from {endpoint}: {err}") from err
+                body = await resp.read()
+        except (ClientError, asyncio.TimeoutError) as err:
+            overloaded = _is_overload_error(err)
+            raise
+        finally:
+            if timings is not None:
+                timings.wire += perf_counter() - wire_start
+            self._concurrency_limiter.release(overloaded=overloaded)
+
+        if timings is not None:
+            timings.response_bytes += len(body)
+        if not body.strip():
+            return cast(dict[str, Any], None)
+        if timings is None:
+            return cast(dict[str, Any], self._json_decoder(body))
+
+        decoding_start = perf_counter()
+        data = self._json_decoder(body)
+        timings.decoding += perf_counter() - decoding_start
+        return cast(dict[str, Any], data)
 
-        LOGGER.debug("Data received from /%s: %s", endpoint, data)
+    async def _async_create_session(self, mode: str = SESSION_LOGIN) -> None:
+        """Create a Tile session (the caller must hold the session lock).
 
-        return cast(dict[str, Any], data)
+        Args:
+            mode: Why the session is created (for metrics): SESSION_LOGIN,
+                SESSION_INLINE_RENEWAL, or SESSION_BACKGROUND_RENEWAL.
+        """
+        try:
+            if not self._client_established:
+                await self._async_send(
+                    "put",
+                    f"clients/{self.client_uuid}",
+                    data={
+                        "app_id": DEFAULT_APP_ID,
+                        "app_version": DEFAULT_APP_VERSION,
+                        "locale": self._locale,
+                    },
+                )
+                self._client_established = True
+
+            resp = await self._async_send(
+                "post",
+                f"clients/{self.client_uuid}/sessions",
+                data={"email": self._email, "password": self._password},
+            )
+        except Exception:
+            if self._options.metrics is not None:
+                self._options.metrics.record_session(mode, success=False)
+            raise
+
+        if self._options.metrics is not None:
+            self._options.metrics.record_session(mode, success=True)
+
+        if not self.user_uuid:
+            self.user_uuid = resp["result"]["user"]["user_uuid"]
+        self._session_expiry = resp["result"]["session_expiration_timestamp"]
+        self._schedule_session_renewal()
+
+        if self._options.session_store:
+            try:
+                await self._options.session_store.async_save(
+                    self._email, self.export_session_state()
+                )
+            except OSError as err:
+                LOGGER.warning("Unable to save the Tile session state: %s", err)
+
+    async def _async_ensure_session(self) -> None:
+        """Wait for any in-progress session renewal and renew an expired session.
+
+        Only one login runs at a time; requests that arrive while one is underway wait
+        for it to finish instead of starting their own.
+        """
+        if not self._session_lock.locked() and not self._session_expires_within(0):
+            return
+
+        async with self._session_lock:
+            if self._session_expires_within(0):
+                await self._async_create_session(SESSION_INLINE_RENEWAL)
+
+    async def _async_renew_session(self, expiry: int) -> None:
+        """Renew the Tile session in the background before it expires.
+
+        Args:
+            expiry: The expiration timestamp of the session to renew.
+        """
+        try:
+            async with self._session_lock:
+                # Skip the renewal if the session was renewed inline in the meantime
+                # (or if the aiohttp session has been closed since it was scheduled):
+                if self._session_expiry == expiry and not self._session.closed:
+                    await self._async_create_session(SESSION_BACKGROUND_RENEWAL)
+        except (TileError, asyncio.TimeoutError) as err:
+            # If this fails, the session will be renewed inline once it expires:
+            LOGGER.warning("Unable to renew the Tile session in advance: %s", err)
+
+    def _schedule_session_renewal(self) -> None:
+        """Schedule a background renewal shortly before the session expires."""
+        if self._session_renewal_handle:
+            self._session_renewal_handle.cancel()
+            self._session_renewal_handle = None
+
+        if not self._session_expiry or (
+            (margin := self._options.session_renewal_margin) is None
+        ):
+            return
+
+        if (delay := self._session_expiry / 1000 - margin - time()) <= 0:
+            # The session is already too close to expiring; it will be renewed inline
+            # once it expires:
+            return
+
+        # The loop only holds a weak reference to this object, so that an API object
+        # that is dropped without being closed can still be garbage-collected:
+        self._session_renewal_handle = asyncio.get_running_loop().call_later(
+            delay,
+            _call_weak_method,
+            WeakMethod(self._start_session_renewal),
+            self._session_expiry,
+        )
+
+    def _session_expires_within(self, seconds: float) -> bool:
+        """Return whether the current session expires within a number of seconds.
+
+        Args:
+            seconds: The number of seconds.
+
+        Returns:
+            Whether the session expires within that time.
+        """
+        if not self._session_expiry:
+            return False
+        return self._session_expiry <= (time() + seconds) * 1000
+
+    def _start_session_renewal(self, expiry: int) -> None:
+        """Start a background session renewal.
+
+        Args:
+            expiry: The expiration timestamp of the session to renew.
+        """
+        self._session_renewal_handle = None
+        if self._session.closed:
+            # The aiohttp session was closed without closing this object first:
+            return
+        self._session_renewal_task = asyncio.create_task(
+            self._async_renew_session(expiry)
+        )
+
+    async def _async_get_tile(self, tile_uuid: str, *, reuse: bool) -> Tile:
+        """Get the latest details for a Tile.
+
+        Args:
+            tile_uuid: The UUID of the Tile.
+            reuse: Whether to update an existing Tile object in place (if one exists).
+
+        Returns:
+            A Tile object.
+        """
+        if reuse and (tile := self._tiles.get(tile_uuid)) is not None:
+            await tile.async_update()
+            return tile
+
+        data = await self._async_request("get", f"tiles/{tile_uuid}")
+        return Tile(
+            self._async_request,
+            data,
+            shared_event_listeners=self._tile_event_listeners,
+            compact=self._options.compact_tiles,
+            extra_fields=self._options.tile_extra_fields,
+            history_store=self._options.history_store,
+        )
 
-    async def async_get_tiles(self) -> dict[str, Tile]:
+    async def async_get_tiles(self, *, incremental: bool = False) -> dict[str, Tile]:
         """Get all active Tiles from the user's account.
 
+        In incremental mode, the cheap Tile states list is compared against the
+        previous refresh and details are only requested for Tiles whose location
+        timestamp or lost status has changed; all other Tiles are returned as the same
+        objects as last time.
+
+        Args:
+            incremental: Whether to only request details for Tiles that have changed.
+
         Returns:
             A dictionary of Tile UUIDs to Tile objects.
         """
         states = await self._async_request("get", "tiles/tile_states")
 
-        details_tasks = {
-            tile_uuid: self._async_request("get", f"tiles/{tile_uuid}")
-            for tile_uuid in [tile["tile_id"] for tile in states["result"]]
-        }
+        data = {}
+        details_tasks = {}
+        fingerprints = {}
+        for state in states["result"]:
+            tile_uuid = state["tile_id"]
+            fingerprints[tile_uuid] = fingerprint = _get_state_fingerprint(state)
+
+            if incremental and self._tile_fingerprints.get(tile_uuid) == fingerprint:
+                # Nothing has changed since the last refresh (Tile Labels, which have
+                # no details, are skipped here, too):
+                if (tile := self._tiles.get(tile_uuid)) is not None:
+                    data[tile_uuid] = tile
+                continue
+
+            details_tasks[tile_uuid] = self._async_get_tile(
+                tile_uuid, reuse=incremental
+            )
 
         results = await asyncio.gather(*details_tasks.values(), return_exceptions=True)
 
-        data = {}
+        refreshed = 0
         for tile_uuid, result in zip(details_tasks, results):
-            if isinstance(result, RequestError) and "412" in str(result):
-                # Tile Labels will return an HTTP 412 because they don't have
-                # additional details; we can safely ignore these errors and still
-                # track the Tile (without additional details):
+            if isinstance(result, BaseException) and _is_label_error(result):
+                # Tile Labels don't have additional details; we can safely ignore
+                # these errors and still track the Tile (without additional details):
+                if self._options.metrics is not None:
+                    self._options.metrics.tiles_skipped.inc(
+                        reason=SKIP_REASON_NO_DETAILS
+                    )
                 continue
             if isinstance(result, BaseException):
                 LOGGER.error("Error requesting details for %s: %s", tile_uuid, result)
+                # Make sure that the next incremental refresh tries again:
+                fingerprints.pop(tile_uuid)
+                if self._options.metrics is not None:
+                    self._options.metrics.tiles_skipped.inc(reason=SKIP_REASON_ERROR)
                 continue
-            data[tile_uuid] = Tile(self._async_request, result)
+            data[tile_uuid] = result
+            refreshed += 1
+
+        if self._options.metrics is not None:
+            self._options.metrics.tiles_refreshed.observe(refreshed)
+
+        self._tile_fingerprints = fingerprints
+        self._tiles = data
 
         return data
 
-    async def async_init(self) -> None:
-        """Create a Tile session."""
-        # Invalidate the existing session expiry datetime (if it exists) so that the
-        # next few requests don't fail:
-        self._session_expiry = None
-
-        if not self._client_established:
-            await self._async_request(
-                "put",
-                f"clients/{self.client_uuid}",
-                data={
-                    "app_id": DEFAULT_APP_ID,
-                    "app_version": DEFAULT_APP_VERSION,
-                    "locale": self._locale,
-                },
+    async def async_update_tiles(
+        self,
+        tiles: Iterable[Tile],
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> dict[str, TileUpdateResult]:
+        """Update many Tiles in place.
+
+        Unlike async_get_tiles, a failure doesn't stop (or disappear from) the batch:
+        every Tile gets a result, in the order the Tiles were given.
+
+        Args:
+            tiles: The Tiles to update.
+            max_concurrency: The maximum number of Tiles to update at once.
+
+        Returns:
+            A dictionary of Tile UUIDs to update results.
+
+        Raises:
+            ValueError: Raised when max_concurrency is less than one.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least one")
+
+        unique_tiles = {tile.uuid: tile for tile in tiles}
+        pending = iter(unique_tiles.items())
+        results: dict[str, TileUpdateResult] = {}
+
+        async def async_update_pending_tiles() -> None:
+            """Update Tiles until there are none left."""
+            for tile_uuid, tile in pending:
+                results[tile_uuid] = await _async_update_tile(tile)
+
+        await asyncio.gather(
+            *(
+                async_update_pending_tiles()
+                for _ in range(min(max_concurrency, len(unique_tiles)))
             )
-            self._client_established = True
+        )
+        return {tile_uuid: results[tile_uuid] for tile_uuid in unique_tiles}
+
+    def add_tile_event_listener(
+        self, listener: TileEventListener
+    ) -> Callable[[], None]:
+        """Add a listener for change events from every Tile this object returns.
+
+        Args:
+            listener: A callable that receives TileEvent objects.
 
-        resp = await self._async_request(
-            "post",
-            f"clients/{self.client_uuid}/sessions",
-            data={"email": self._email, "password": self._password},
+        Returns:
+            A callable that removes the listener.
+        """
+        self._tile_event_listeners.append(listener)
+
+        def remove() -> None:
+            """Remove the listener."""
+            self._tile_event_listeners.remove(listener)
+
+        return remove
+
+    def add_request_hook(self, hook: RequestHook) -> Callable[[], None]:
+        """Add a hook that receives a RequestTrace after every request.
+
+        Args:
+            hook: A callable that receives RequestTrace objects.
+
+        Returns:
+            A callable that removes the hook.
+        """
+        self._request_hooks.append(hook)
+
+        def remove() -> None:
+            """Remove the hook."""
+            self._request_hooks.remove(hook)
+
+        return remove
+
+    def export_session_state(self) -> SessionState:
+        """Export the state needed to resume this session without logging in.
+
+        Returns:
+            The session state.
+
+        Raises:
+            SessionExpiredError: Raised when there is no active session.
+        """
+        if not self._session_expiry:
+            raise SessionExpiredError("There is no active session to export")
+
+        cookies = self._session.cookie_jar.filter_cookies(URL(self._options.api_url))
+        return {
+            "client_established": self._client_established,
+            "client_uuid": self.client_uuid,
+            "cookies": {name: morsel.value for name, morsel in cookies.items()},
+            "session_expiry": self._session_expiry,
+            "user_uuid": self.user_uuid,
+        }
+
+    async def async_close(self) -> None:
+        """Stop any scheduled background work (e.g., session renewal)."""
+        if self._session_renewal_handle:
+            self._session_renewal_handle.cancel()
+            self._session_renewal_handle = None
+
+        if self._session_renewal_task:
+            self._session_renewal_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._session_renewal_task
+            self._session_renewal_task = None
+
+    async def async_import_session_state(self, state: SessionState) -> bool:
+        """Resume a previously exported session (if it hasn't expired).
+
+        Args:
+            state: The session state.
+
+        Returns:
+            Whether the session was resumed.
+        """
+        if state["session_expiry"] <= time() * 1000:
+            return False
+
+        self._client_established = state["client_established"]
+        self._session.cookie_jar.update_cookies(
+            state["cookies"], URL(self._options.api_url)
         )
+        self._session_expiry = state["session_expiry"]
+        self.client_uuid = state["client_uuid"]
+        self.user_uuid = state["user_uuid"]
+        self._schedule_session_renewal()
+        return True
 
-        if not self.user_uuid:
-            self.user_uuid = resp["result"]["user"]["user_uuid"]
-        self._session_expiry = resp["result"]["session_expiration_timestamp"]
+    async def async_init(self) -> None:
+        """Create a Tile session."""
+        async with self._session_lock:
+            await self._async_create_session()
 
 
-async def async_login(
+async def async_login(  # pylint: disable=too-many-arguments
     email: str,
     password: str,
     session: ClientSession,
     *,
     client_uuid: str | None = None,
     locale: str = DEFAULT_LOCALE,
+    options: APIOptions | None = None,
 ) -> API:
     """Return an authenticated client.
 
@@ -170,10 +940,27 @@ async def async_login(
         session: An optional aiohttp ClientSession.
         client_uuid: An optional UUID to identify this API object.
         locale: An optional locale.
+        options: Optional tuning options.
 
     Returns:
         An authenticated API object.
     """
-    api: API = API(email, password, session, client_uuid=client_uuid, locale=locale)
+    api: API = API(
+        email,
+        password,
+        session,
+        client_uuid=client_uuid,
+        locale=locale,
+        options=options,
+    )
+
+    if (
+        options
+        and (session_store := options.session_store)
+        and (state := await session_store.async_load(email))
+        and await api.async_import_session_state(state)
+    ):
+        return api
+
     await api.async_init()
     return api
@@ -0,0 +1,164 @@
+"""Define a cache for API responses."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Mapping
+from copy import deepcopy
+from time import monotonic
+from typing import Any
+
+from .util import get_endpoint_template
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_TTL = 30.0
+
+CacheKey = tuple[str, str, tuple[tuple[str, Any], ...]]
+
+
+class ResponseCache:
+    """Define a TTL/LRU cache for GET responses.
+
+    Responses are copied on the way in and out, so callers may modify what they get
+    without affecting other readers.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = DEFAULT_TTL,
+        endpoint_ttls: Mapping[str, float] | None = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            ttl: The default number of seconds to keep a response.
+            endpoint_ttls: Per-endpoint TTLs, keyed by endpoint template (e.g.,
+                "tiles/{uuid}"); a TTL of 0 disables caching for that endpoint.
+            max_size: The maximum number of responses to keep.
+        """
+        self._endpoint_keys: dict[str, set[CacheKey]] = {}
+        self._endpoint_ttls: dict[str, float] = dict(endpoint_ttls or {})
+        self._entries: OrderedDict[CacheKey, tuple[float, dict[str, Any]]] = (
+            OrderedDict()
+        )
+        self._max_size = max_size
+        self._ttl = ttl
+        self.evictions = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached responses.
+
+        Returns:
+            The number of cached responses.
+        """
+        return len(self._entries)
+
+    @staticmethod
+    def _get_key(
+        method: str, endpoint: str, params: Mapping[str, Any] | None
+    ) -> CacheKey:
+        """Return the cache key for a request.
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            params: The request's query parameters.
+
+        Returns:
+            A cache key.
+        """
+        return (method.lower(), endpoint, tuple(sorted((params or {}).items())))
+
+    def _remove(self, key: CacheKey) -> None:
+        """Remove a cached response.
+
+        Args:
+            key: The cache key of the response.
+        """
+        del self._entries[key]
+        endpoint_keys = self._endpoint_keys[key[1]]
+        endpoint_keys.discard(key)
+        if not endpoint_keys:
+            del self._endpoint_keys[key[1]]
+
+    def get(
+        self, method: str, endpoint: str, params: Mapping[str, Any] | None = None
+    ) -> dict[str, Any] | None:
+        """Return a cached response (if it exists and hasn't expired).
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            params: The request's query parameters.
+
+        Returns:
+            An API response payload (or None on a cache miss).
+        """
+        key = self._get_key(method, endpoint, params)
+
+        if (entry := self._entries.get(key)) is None:
+            self.misses += 1
+            return None
+
+        expires_at, data = entry
+        if expires_at <= monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return deepcopy(data)
+
+    def set(
+        self,
+        method: str,
+        endpoint: str,
+        params: Mapping[str, Any] | None,
+        data: dict[str, Any],
+    ) -> None:
+        """Cache a response.
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            params: The request's query parameters.
+            data: An API response payload.
+        """
+        ttl = self._endpoint_ttls.get(get_endpoint_template(endpoint), self._ttl)
+        if ttl <= 0:
+            return
+
+        key = self._get_key(method, endpoint, params)
+        self._entries[key] = (monotonic() + ttl, deepcopy(data))
+        self._entries.move_to_end(key)
+        self._endpoint_keys.setdefault(endpoint, set()).add(key)
+
+        while len(self._entries) > self._max_size:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, endpoint: str | None = None) -> int:
+        """Remove cached responses.
+
+        Args:
+            endpoint: A relative API endpoint to remove responses for (if not
+                provided, all responses are removed).
+
+        Returns:
+            The number of removed responses.
+        """
+        if endpoint is None:
+            count = len(self._entries)
+            self._endpoint_keys.clear()
+            self._entries.clear()
+            return count
+
+        keys = self._endpoint_keys.pop(endpoint, set())
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
@@ -0,0 +1,123 @@
+"""Define an adaptive limiter for concurrent API requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+
+DEFAULT_INITIAL_CONCURRENCY = 8
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_MIN_CONCURRENCY = 1
+
+# When the API signals that it's overloaded, the limit is multiplied by this factor:
+BACKOFF_FACTOR = 0.5
+
+
+class AdaptiveConcurrencyLimiter:
+    """Define a limiter that adapts the number of concurrent requests.
+
+    The limit follows an additive-increase/multiplicative-decrease scheme: every
+    successful request grows the limit by roughly one slot per "window" of completed
+    requests, while every sign of overload (HTTP 429, HTTP 5xx, timeouts) cuts it.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = DEFAULT_INITIAL_CONCURRENCY,
+        max_limit: int = DEFAULT_MAX_CONCURRENCY,
+        min_limit: int = DEFAULT_MIN_CONCURRENCY,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            initial_limit: The number of concurrent requests to start with.
+            max_limit: The maximum number of concurrent requests.
+            min_limit: The minimum number of concurrent requests.
+
+        Raises:
+            ValueError: Raised upon invalid limits.
+        """
+        if min_limit < 1 or max_limit < min_limit:
+            raise ValueError(
+                f"Invalid concurrency limits (min: {min_limit}, max: {max_limit})"
+            )
+
+        self._in_flight = 0
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._max_limit = max_limit
+        self._min_limit = min_limit
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of requests currently holding a slot.
+
+        Returns:
+            The in-flight request count.
+        """
+        return self._in_flight
+
+    @property
+    def limit(self) -> int:
+        """Return the current concurrency limit.
+
+        Returns:
+            The limit.
+        """
+        return int(self._limit)
+
+    @property
+    def max_limit(self) -> int:
+        """Return the maximum concurrency limit.
+
+        Returns:
+            The maximum limit.
+        """
+        return self._max_limit
+
+    def _wake_waiters(self) -> None:
+        """Hand free slots to waiting requests (in FIFO order)."""
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    async def async_acquire(self) -> None:
+        """Wait for a request slot.
+
+        Raises:
+            CancelledError: Raised when the waiting request is cancelled.
+        """
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            return
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # We were handed a slot at the same time we were cancelled; give it
+                # back so that it isn't leaked:
+                self._in_flight -= 1
+                self._wake_waiters()
+            raise
+
+    def release(self, *, overloaded: bool = False) -> None:
+        """Release a request slot and adapt the limit to the request's outcome.
+
+        Args:
+            overloaded: Whether the request indicated that the API is overloaded.
+        """
+        self._in_flight -= 1
+
+        if overloaded:
+            self._limit = max(self._limit * BACKOFF_FACTOR, float(self._min_limit))
+        else:
+            self._limit = min(self._limit + 1 / self._limit, float(self._max_limit))
+
+        self._wake_waiters()
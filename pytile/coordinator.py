@@ -0,0 +1,197 @@
+"""Define a coordinator that polls Tiles at adaptive intervals."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+from collections.abc import AsyncGenerator
+from datetime import datetime, timedelta, timezone
+from itertools import count
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from .const import LOGGER
+from .errors import TileError
+
+if TYPE_CHECKING:
+    from .api import API
+    from .tile import Tile
+
+DEFAULT_BASE_INTERVAL = 300.0
+DEFAULT_MAX_INTERVAL = 3600.0
+DEFAULT_MIN_INTERVAL = 30.0
+DEFAULT_TILE_LIST_INTERVAL = 3600.0
+
+# Tiles that haven't reported a location for this long are polled as rarely as
+# possible:
+STALE_LOCATION_AGE = timedelta(days=1)
+
+# The Tile list itself is tracked in the schedule under this key:
+TILE_LIST_KEY = ""
+
+
+class TileCoordinator:  # pylint: disable=too-few-public-methods
+    """Define a coordinator that polls each Tile at its own adaptive interval.
+
+    Lost and moving Tiles are polled every min_interval seconds. A stationary Tile's
+    interval starts at base_interval and doubles with every poll that finds it in the
+    same place (up to max_interval); dead Tiles and Tiles that haven't reported a
+    location in a day are polled every max_interval seconds. The Tile list is
+    re-fetched every tile_list_interval seconds to pick up added and removed Tiles.
+    """
+
+    def __init__(
+        self,
+        api: API,
+        *,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        base_interval: float = DEFAULT_BASE_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        tile_list_interval: float = DEFAULT_TILE_LIST_INTERVAL,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            api: An authenticated API object.
+            min_interval: The polling interval (in seconds) of lost and moving Tiles.
+            base_interval: The initial polling interval (in seconds) of stationary
+                Tiles.
+            max_interval: The polling interval (in seconds) of dead and stale Tiles.
+            tile_list_interval: The number of seconds between re-fetches of the Tile
+                list.
+        """
+        self._api = api
+        self._base_interval = base_interval
+        self._intervals: dict[str, float] = {}
+        self._max_interval = max_interval
+        self._min_interval = min_interval
+        self._schedule: list[tuple[float, int, str]] = []
+        self._sequence = count()
+        self._tile_list_interval = tile_list_interval
+        self.tiles: dict[str, Tile] = {}
+
+    def _get_interval(self, tile: Tile, *, moved: bool) -> float:
+        """Return the number of seconds until a Tile should be polled again.
+
+        Args:
+            tile: A Tile.
+            moved: Whether the Tile moved since it was last polled.
+
+        Returns:
+            The polling interval.
+        """
+        if tile.dead:
+            return self._max_interval
+        if tile.lost or moved:
+            return self._min_interval
+        if (
+            tile.last_timestamp is None
+            or datetime.now(timezone.utc).replace(tzinfo=None) - tile.last_timestamp
+            > STALE_LOCATION_AGE
+        ):
+            return self._max_interval
+        if (interval := self._intervals.get(tile.uuid)) is None:
+            return self._base_interval
+        return min(max(interval * 2, self._base_interval), self._max_interval)
+
+    def _schedule_key(self, key: str, interval: float) -> None:
+        """Schedule a Tile (or the Tile list) to be polled.
+
+        Args:
+            key: A Tile UUID (or TILE_LIST_KEY).
+            interval: The number of seconds from now to poll at.
+        """
+        heapq.heappush(
+            self._schedule, (monotonic() + interval, next(self._sequence), key)
+        )
+
+    async def _async_poll_tile(self, tile: Tile) -> bool:
+        """Poll a Tile and schedule its next poll.
+
+        Args:
+            tile: A Tile.
+
+        Returns:
+            Whether the Tile was updated.
+        """
+        position = (tile.latitude, tile.longitude)
+
+        try:
+            await tile.async_update()
+        except (TileError, asyncio.TimeoutError) as err:
+            LOGGER.error("Error requesting details for %s: %r", tile.uuid, err)
+            if (interval := self._intervals.get(tile.uuid)) is not None:
+                self._schedule_key(tile.uuid, interval)
+            return False
+
+        # The Tile may have been removed from the Tile list while it was polled:
+        if tile.uuid not in self._intervals:
+            return False
+
+        moved = position != (tile.latitude, tile.longitude)
+        self._intervals[tile.uuid] = interval = self._get_interval(tile, moved=moved)
+        self._schedule_key(tile.uuid, interval)
+        return True
+
+    async def _async_refresh_tile_list(self) -> list[Tile]:
+        """Re-fetch the Tile list and schedule any new Tiles.
+
+        Returns:
+            The Tiles that weren't tracked before.
+        """
+        try:
+            tiles = await self._api.async_get_tiles(incremental=True)
+        except TileError as err:
+            LOGGER.error("Error requesting the Tile list: %s", err)
+            tiles = self.tiles
+
+        new_tiles = [tile for tile in tiles.values() if tile.uuid not in self.tiles]
+        for tile in new_tiles:
+            self._intervals[tile.uuid] = interval = self._get_interval(
+                tile, moved=False
+            )
+            self._schedule_key(tile.uuid, interval)
+
+        for tile_uuid in set(self.tiles) - set(tiles):
+            self._intervals.pop(tile_uuid)
+
+        self.tiles = tiles
+        self._schedule_key(TILE_LIST_KEY, self._tile_list_interval)
+        return new_tiles
+
+    async def async_updates(self) -> AsyncGenerator[Tile]:
+        """Poll Tiles forever, yielding each Tile after it has been polled.
+
+        Tiles that come due at the same time are polled concurrently (subject to the
+        API object's concurrency limit).
+
+        Yields:
+            Updated Tiles.
+        """
+        self._schedule = []
+        self.tiles = {}
+
+        for tile in await self._async_refresh_tile_list():
+            yield tile
+
+        while True:
+            due_at = self._schedule[0][0]
+            if (delay := due_at - monotonic()) > 0:
+                await asyncio.sleep(delay)
+
+            now = monotonic()
+            due_tiles = []
+            while self._schedule and self._schedule[0][0] <= now:
+                _, _, key = heapq.heappop(self._schedule)
+                if key == TILE_LIST_KEY:
+                    for new_tile in await self._async_refresh_tile_list():
+                        yield new_tile
+                elif key in self.tiles:
+                    due_tiles.append(self.tiles[key])
+
+            results = await asyncio.gather(
+                *(self._async_poll_tile(tile) for tile in due_tiles)
+            )
+            for tile, updated in zip(due_tiles, results):
+                if updated:
+                    yield tile
@@ -0,0 +1,70 @@
+"""Define JSON decoders for API responses."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+JSONDecoder = Callable[[bytes], Any]
+
+
+def _get_msgspec_decoder() -> JSONDecoder | None:
+    """Return a msgspec-based JSON decoder (if msgspec is installed).
+
+    Returns:
+        A JSON decoder (if available).
+    """
+    try:
+        import msgspec  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+
+    decoder = msgspec.json.Decoder()
+
+    def decode(data: bytes) -> Any:
+        """Decode a JSON document.
+
+        Args:
+            data: A JSON document.
+
+        Returns:
+            The decoded document.
+
+        Raises:
+            ValueError: Raised when the document is invalid.
+        """
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as err:
+            raise ValueError(str(err)) from err
+
+    return decode
+
+
+def _get_orjson_decoder() -> JSONDecoder | None:
+    """Return an orjson-based JSON decoder (if orjson is installed).
+
+    Returns:
+        A JSON decoder (if available).
+    """
+    try:
+        from orjson import loads  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return loads
+
+
+def get_json_decoder() -> JSONDecoder:
+    """Return the fastest available JSON decoder.
+
+    orjson is preferred, followed by msgspec; if neither is installed, the standard
+    library's json module is used. All of them raise ValueError on invalid input.
+
+    Returns:
+        A JSON decoder.
+    """
+    for get_decoder in (_get_orjson_decoder, _get_msgspec_decoder):
+        if (decoder := get_decoder()) is not None:
+            return decoder
+    return json.loads
@@ -23,3 +23,9 @@ class SessionExpiredError(TileError):
     """Define an error for when a Tile app session expires."""
 
     pass
+
+
+class CircuitOpenError(RequestError):
+    """Define an error for when requests are short-circuited by a circuit breaker."""
+
+    pass
@@ -0,0 +1,169 @@
+"""Define change events computed from successive Tile snapshots."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .geo import haversine
+
+if TYPE_CHECKING:
+    from .tile import Tile
+
+DEFAULT_MOVE_THRESHOLD = 10.0
+
+
+class TileEventType(str, Enum):
+    """Define the types of Tile change events."""
+
+    DEAD = "dead"
+    FIRMWARE_CHANGED = "firmware_changed"
+    FOUND = "found"
+    LOST = "lost"
+    MOVED = "moved"
+    REVIVED = "revived"
+    RING_STATE_CHANGED = "ring_state_changed"
+    VOIP_STATE_CHANGED = "voip_state_changed"
+
+
+@dataclass(frozen=True)
+class TileEvent:
+    """Define a change to a Tile between two updates."""
+
+    tile_uuid: str
+    event_type: TileEventType
+    old_value: Any
+    new_value: Any
+
+
+TileEventListener = Callable[[TileEvent], None]
+
+
+class TileSnapshot(NamedTuple):
+    """Define the Tile values that change events are computed from."""
+
+    latitude: float | None
+    longitude: float | None
+    lost: bool
+    dead: bool
+    firmware_version: str
+    ring_state: str | None
+    voip_state: str | None
+
+
+def add_event_listener(tile: Tile, listener: TileEventListener) -> Callable[[], None]:
+    """Add a listener for change events computed on every update of a Tile.
+
+    Args:
+        tile: A Tile.
+        listener: A callable that receives TileEvent objects.
+
+    Returns:
+        A callable that removes the listener.
+    """
+    tile.event_listeners.append(listener)
+
+    def remove() -> None:
+        """Remove the listener."""
+        tile.event_listeners.remove(listener)
+
+    return remove
+
+
+def get_tile_snapshot(tile: Tile) -> TileSnapshot:
+    """Return a snapshot of a Tile's current values.
+
+    Args:
+        tile: A Tile.
+
+    Returns:
+        A snapshot.
+    """
+    return TileSnapshot(
+        tile.latitude,
+        tile.longitude,
+        tile.lost,
+        tile.dead,
+        tile.firmware_version,
+        tile.ring_state,
+        tile.voip_state,
+    )
+
+
+def _has_moved(old: TileSnapshot, new: TileSnapshot, move_threshold: float) -> bool:
+    """Return whether a Tile moved between two snapshots.
+
+    Args:
+        old: The snapshot before the update.
+        new: The snapshot after the update.
+        move_threshold: The distance (in meters) a Tile has to move to be reported.
+
+    Returns:
+        Whether the Tile moved.
+    """
+    if old.latitude is None or old.longitude is None:
+        return new.latitude is not None
+    if new.latitude is None or new.longitude is None:
+        return True
+    return (
+        haversine(old.latitude, old.longitude, new.latitude, new.longitude)
+        >= move_threshold
+    )
+
+
+def compute_tile_events(
+    tile_uuid: str,
+    old: TileSnapshot,
+    new: TileSnapshot,
+    *,
+    move_threshold: float = DEFAULT_MOVE_THRESHOLD,
+) -> list[TileEvent]:
+    """Return the change events between two snapshots of a Tile.
+
+    Args:
+        tile_uuid: The UUID of the Tile.
+        old: The snapshot before the update.
+        new: The snapshot after the update.
+        move_threshold: The distance (in meters) a Tile has to move to be reported.
+
+    Returns:
+        A list of change events.
+    """
+    if old == new:
+        return []
+
+    events = []
+
+    if _has_moved(old, new, move_threshold):
+        events.append(
+            TileEvent(
+                tile_uuid,
+                TileEventType.MOVED,
+                (old.latitude, old.longitude),
+                (new.latitude, new.longitude),
+            )
+        )
+
+    if old.lost != new.lost:
+        event_type = TileEventType.LOST if new.lost else TileEventType.FOUND
+        events.append(TileEvent(tile_uuid, event_type, old.lost, new.lost))
+
+    if old.dead != new.dead:
+        event_type = TileEventType.DEAD if new.dead else TileEventType.REVIVED
+        events.append(TileEvent(tile_uuid, event_type, old.dead, new.dead))
+
+    for event_type, old_value, new_value in (
+        (
+            TileEventType.FIRMWARE_CHANGED,
+            old.firmware_version,
+            new.firmware_version,
+        ),
+        (TileEventType.RING_STATE_CHANGED, old.ring_state, new.ring_state),
+        (TileEventType.VOIP_STATE_CHANGED, old.voip_state, new.voip_state),
+    ):
+        if old_value != new_value:
+            events.append(TileEvent(tile_uuid, event_type, old_value, new_value))
+
+    return events
@@ -0,0 +1,419 @@
+"""Define streaming exporters of Tiles and location history (to NDJSON or CSV)."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import AsyncIterable, Awaitable, Callable, Iterable, Sequence
+from enum import Enum
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Protocol
+
+from .history import (
+    HISTORY_ACCURACY_KEY,
+    HISTORY_ALTITUDE_KEY,
+    HISTORY_LATITUDE_KEY,
+    HISTORY_LONGITUDE_KEY,
+    HISTORY_TIMESTAMP_KEY,
+    get_update_timestamp,
+)
+
+if TYPE_CHECKING:
+    from .tile import Tile
+
+# The number of rows to encode (and write to the sink) at once:
+DEFAULT_CHUNK_SIZE = 1000
+
+# The fields of Tile.as_dict, in the same order:
+TILE_FIELDS = (
+    "accuracy",
+    "altitude",
+    "archetype",
+    "dead",
+    "firmware_version",
+    "hardware_version",
+    "kind",
+    "last_timestamp",
+    "latitude",
+    "longitude",
+    "lost",
+    "lost_timestamp",
+    "name",
+    "ring_state",
+    "uuid",
+    "visible",
+    "voip_state",
+)
+TILE_DATETIME_FIELDS = frozenset({"last_timestamp", "lost_timestamp"})
+
+HISTORY_FIELDS = (
+    HISTORY_TIMESTAMP_KEY,
+    HISTORY_LATITUDE_KEY,
+    HISTORY_LONGITUDE_KEY,
+    HISTORY_ALTITUDE_KEY,
+    HISTORY_ACCURACY_KEY,
+)
+HISTORY_TILE_UUID_FIELD = "tile_uuid"
+
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+class ExportFormat(str, Enum):
+    """Define the export formats."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class TextSink(Protocol):  # pylint: disable=too-few-public-methods
+    """Define a file-like object to export to."""
+
+    def write(self, data: str, /) -> object:
+        """Write text.
+
+        Args:
+            data: The text.
+        """
+
+
+class AsyncTextSink(Protocol):  # pylint: disable=too-few-public-methods
+    """Define an asynchronous file-like object to export to."""
+
+    def write(self, data: str, /) -> Awaitable[object]:
+        """Write text.
+
+        Args:
+            data: The text.
+        """
+
+
+class _RowEncoder:
+    """Define an encoder of rows (tuples of field values) in chunks.
+
+    Datetime fields are encoded as ISO 8601 strings; every other value is encoded
+    as-is, so no per-value type checks are needed.
+    """
+
+    def __init__(
+        self,
+        export_format: ExportFormat,
+        fields: Sequence[str],
+        *,
+        datetime_fields: frozenset[str] = frozenset(),
+        header: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            export_format: The export format.
+            fields: The names of the fields (in order).
+            datetime_fields: The names of the fields that hold datetimes.
+            header: Whether to start CSV output with a header row.
+            chunk_size: The number of rows to encode at once.
+
+        Raises:
+            ValueError: Raised when there are no fields or the chunk size isn't
+                positive.
+        """
+        if not fields:
+            raise ValueError("At least one field must be exported")
+        if chunk_size < 1:
+            raise ValueError("The chunk size must be positive")
+
+        self._chunk: list[tuple[Any, ...]] = []
+        self._chunk_size = chunk_size
+        self._datetime_indices = [
+            idx for idx, field in enumerate(fields) if field in datetime_fields
+        ]
+        self._export_format = ExportFormat(export_format)
+        self._fields = tuple(fields)
+        self._header = header and self._export_format is ExportFormat.CSV
+        self._buffer = io.StringIO()
+        self._csv_writer = csv.writer(self._buffer)
+        self.count = 0
+
+    def _encode_chunk(self) -> str:
+        """Encode the current chunk (and the header, if it's still pending).
+
+        Returns:
+            The encoded text.
+        """
+        rows = self._chunk
+        self._chunk = []
+        self.count += len(rows)
+
+        if self._datetime_indices:
+            for row_idx, row in enumerate(rows):
+                values = list(row)
+                for idx in self._datetime_indices:
+                    if (value := values[idx]) is not None:
+                        values[idx] = value.isoformat()
+                rows[row_idx] = tuple(values)
+
+        if self._export_format is ExportFormat.NDJSON:
+            fields = self._fields
+            encode = _JSON_ENCODER.encode
+            return "".join(f"{encode(dict(zip(fields, row)))}\n" for row in rows)
+
+        if self._header:
+            self._csv_writer.writerow(self._fields)
+            self._header = False
+        self._csv_writer.writerows(rows)
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return text
+
+    def flush(self) -> str:
+        """Encode the remaining rows.
+
+        Returns:
+            The encoded text (which includes the CSV header if no rows were pushed).
+        """
+        if not self._chunk and not self._header:
+            return ""
+        return self._encode_chunk()
+
+    def push(self, row: tuple[Any, ...]) -> str:
+        """Add a row.
+
+        Args:
+            row: The field values.
+
+        Returns:
+            The encoded text once a chunk is full (otherwise, an empty string).
+        """
+        self._chunk.append(row)
+        if len(self._chunk) < self._chunk_size:
+            return ""
+        return self._encode_chunk()
+
+
+def _get_tile_row_getter(fields: Sequence[str]) -> Callable[[Tile], tuple[Any, ...]]:
+    """Return a function that returns a Tile's values of a set of fields.
+
+    Args:
+        fields: The names of the fields.
+
+    Returns:
+        A function that returns a tuple of field values.
+
+    Raises:
+        ValueError: Raised when a field is unknown.
+    """
+    if unknown := set(fields) - set(TILE_FIELDS):
+        raise ValueError(f"Unknown Tile fields: {', '.join(sorted(unknown))}")
+    if len(fields) == 1:
+        field = fields[0]
+        return lambda tile: (getattr(tile, field),)
+    return attrgetter(*fields)
+
+
+def _get_history_row_getter(
+    fields: Sequence[str], tile_uuid: str | None
+) -> Callable[[dict[str, Any]], tuple[Any, ...]]:
+    """Return a function that returns a location update's values of a set of fields.
+
+    Args:
+        fields: The keys of the fields (missing ones are exported as empty values).
+        tile_uuid: An optional Tile UUID to prepend to every row.
+
+    Returns:
+        A function that returns a tuple of field values.
+    """
+    prefix = () if tile_uuid is None else (tile_uuid,)
+    keys = tuple(fields)
+
+    if HISTORY_TIMESTAMP_KEY not in keys:
+        return lambda update: (*prefix, *(update.get(key) for key in keys))
+
+    # Some location updates only carry a generic timestamp:
+    timestamp_idx = keys.index(HISTORY_TIMESTAMP_KEY)
+
+    def get_row(update: dict[str, Any]) -> tuple[Any, ...]:
+        """Return a location update's values.
+
+        Args:
+            update: A location update.
+
+        Returns:
+            A tuple of field values.
+        """
+        values = [update.get(key) for key in keys]
+        values[timestamp_idx] = get_update_timestamp(update)
+        return (*prefix, *values)
+
+    return get_row
+
+
+def _get_history_columns(fields: Sequence[str], tile_uuid: str | None) -> list[str]:
+    """Return the column names of a history export.
+
+    Args:
+        fields: The keys of the fields.
+        tile_uuid: An optional Tile UUID to prepend to every row.
+
+    Returns:
+        The column names.
+    """
+    if tile_uuid is None:
+        return list(fields)
+    return [HISTORY_TILE_UUID_FIELD, *fields]
+
+
+def export_tiles(  # pylint: disable=too-many-arguments
+    tiles: Iterable[Tile],
+    sink: TextSink,
+    *,
+    export_format: ExportFormat = ExportFormat.NDJSON,
+    fields: Sequence[str] = TILE_FIELDS,
+    header: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Export Tiles to a file-like object.
+
+    Args:
+        tiles: The Tiles.
+        sink: A file-like object (opened with newline="" for CSV).
+        export_format: The export format.
+        fields: The fields to export (a subset of TILE_FIELDS).
+        header: Whether to start CSV output with a header row.
+        chunk_size: The number of rows to encode and write at once.
+
+    Returns:
+        The number of exported Tiles.
+    """
+    encoder = _RowEncoder(
+        export_format,
+        fields,
+        datetime_fields=TILE_DATETIME_FIELDS,
+        header=header,
+        chunk_size=chunk_size,
+    )
+    get_row = _get_tile_row_getter(fields)
+    for tile in tiles:
+        if text := encoder.push(get_row(tile)):
+            sink.write(text)
+    if text := encoder.flush():
+        sink.write(text)
+    return encoder.count
+
+
+async def async_export_tiles(  # pylint: disable=too-many-arguments
+    tiles: Iterable[Tile],
+    sink: AsyncTextSink,
+    *,
+    export_format: ExportFormat = ExportFormat.NDJSON,
+    fields: Sequence[str] = TILE_FIELDS,
+    header: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Export Tiles to an asynchronous file-like object.
+
+    Args:
+        tiles: The Tiles.
+        sink: An asynchronous file-like object (e.g., from aiofiles).
+        export_format: The export format.
+        fields: The fields to export (a subset of TILE_FIELDS).
+        header: Whether to start CSV output with a header row.
+        chunk_size: The number of rows to encode and write at once.
+
+    Returns:
+        The number of exported Tiles.
+    """
+    encoder = _RowEncoder(
+        export_format,
+        fields,
+        datetime_fields=TILE_DATETIME_FIELDS,
+        header=header,
+        chunk_size=chunk_size,
+    )
+    get_row = _get_tile_row_getter(fields)
+    for tile in tiles:
+        if text := encoder.push(get_row(tile)):
+            await sink.write(text)
+    if text := encoder.flush():
+        await sink.write(text)
+    return encoder.count
+
+
+def export_history(  # pylint: disable=too-many-arguments
+    updates: Iterable[dict[str, Any]],
+    sink: TextSink,
+    *,
+    export_format: ExportFormat = ExportFormat.NDJSON,
+    fields: Sequence[str] = HISTORY_FIELDS,
+    tile_uuid: str | None = None,
+    header: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Export location updates to a file-like object.
+
+    Args:
+        updates: Location updates.
+        sink: A file-like object (opened with newline="" for CSV).
+        export_format: The export format.
+        fields: The location update keys to export.
+        tile_uuid: An optional Tile UUID to add to every row (as tile_uuid), so that
+            the histories of several Tiles can be exported to the same sink.
+        header: Whether to start CSV output with a header row.
+        chunk_size: The number of rows to encode and write at once.
+
+    Returns:
+        The number of exported location updates.
+    """
+    encoder = _RowEncoder(
+        export_format,
+        _get_history_columns(fields, tile_uuid),
+        header=header,
+        chunk_size=chunk_size,
+    )
+    get_row = _get_history_row_getter(fields, tile_uuid)
+    for update in updates:
+        if text := encoder.push(get_row(update)):
+            sink.write(text)
+    if text := encoder.flush():
+        sink.write(text)
+    return encoder.count
+
+
+async def async_export_history(  # pylint: disable=too-many-arguments
+    updates: AsyncIterable[dict[str, Any]],
+    sink: AsyncTextSink,
+    *,
+    export_format: ExportFormat = ExportFormat.NDJSON,
+    fields: Sequence[str] = HISTORY_FIELDS,
+    tile_uuid: str | None = None,
+    header: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Export an asynchronous stream of location updates (e.g., a Tile's history).
+
+    Args:
+        updates: Location updates.
+        sink: An asynchronous file-like object (e.g., from aiofiles).
+        export_format: The export format.
+        fields: The location update keys to export.
+        tile_uuid: An optional Tile UUID to add to every row (as tile_uuid), so that
+            the histories of several Tiles can be exported to the same sink.
+        header: Whether to start CSV output with a header row.
+        chunk_size: The number of rows to encode and write at once.
+
+    Returns:
+        The number of exported location updates.
+    """
+    encoder = _RowEncoder(
+        export_format,
+        _get_history_columns(fields, tile_uuid),
+        header=header,
+        chunk_size=chunk_size,
+    )
+    get_row = _get_history_row_getter(fields, tile_uuid)
+    async for update in updates:
+        if text := encoder.push(get_row(update)):
+            await sink.write(text)
+    if text := encoder.flush():
+        await sink.write(text)
+    return encoder.count
@@ -0,0 +1,48 @@
+"""Define geographic helpers."""
+
+from __future__ import annotations
+
+from math import asin, cos, radians, sin, sqrt
+
+EARTH_RADIUS_METERS = 6371008.8
+
+
+def get_grid_cell(
+    latitude: float, longitude: float, cell_size: float
+) -> tuple[int, int]:
+    """Return the cell of a grid of cell_size-degree cells that contains a point.
+
+    Rows count up from the south pole and columns count up from the antimeridian;
+    points outside of [-90, 90] and [-180, 180) fall in cells beyond the edges.
+
+    Args:
+        latitude: A latitude.
+        longitude: A longitude.
+        cell_size: The size (in degrees) of a grid cell.
+
+    Returns:
+        A (row, column) cell.
+    """
+    return int((latitude + 90) // cell_size), int((longitude + 180) // cell_size)
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance between two points.
+
+    Args:
+        lat1: The latitude of the first point.
+        lon1: The longitude of the first point.
+        lat2: The latitude of the second point.
+        lon2: The longitude of the second point.
+
+    Returns:
+        The distance in meters.
+    """
+    d_lat = radians(lat2 - lat1)
+    d_lon = radians(lon2 - lon1)
+    a = (
+        sin(d_lat / 2) ** 2
+        + cos(radians(lat1)) * cos(radians(lat2)) * sin(d_lon / 2) ** 2
+    )
+    # Clamp rounding errors (while letting NaN through):
+    return 2 * EARTH_RADIUS_METERS * asin(sqrt(1.0 if a > 1.0 else a))
@@ -0,0 +1,331 @@
+"""Define geofences and an engine that evaluates Tile positions against them."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from enum import Enum
+
+from .geo import EARTH_RADIUS_METERS, get_grid_cell, haversine
+from .tile import Tile
+
+DEFAULT_CELL_SIZE = 0.05
+DEFAULT_MAX_HYSTERESIS = 100.0
+
+METERS_PER_DEGREE = math.radians(1) * EARTH_RADIUS_METERS
+
+BoundingBox = tuple[float, float, float, float]
+
+
+class GeofenceEventType(str, Enum):
+    """Define the types of geofence events."""
+
+    ENTER = "enter"
+    EXIT = "exit"
+
+
+@dataclass(frozen=True)
+class GeofenceEvent:
+    """Define a Tile entering or exiting a geofence."""
+
+    tile_uuid: str
+    fence_id: str
+    event_type: GeofenceEventType
+    latitude: float
+    longitude: float
+
+
+@dataclass(frozen=True)
+class CircleFence:
+    """Define a circular geofence."""
+
+    fence_id: str
+    latitude: float
+    longitude: float
+    radius: float
+
+    @property
+    def bbox(self) -> BoundingBox:
+        """Return the fence's bounding box.
+
+        Returns:
+            A (south, west, north, east) tuple.
+        """
+        latitude_delta = self.radius / METERS_PER_DEGREE
+        longitude_delta = latitude_delta / max(
+            math.cos(math.radians(self.latitude)), 1e-6
+        )
+        return (
+            self.latitude - latitude_delta,
+            self.longitude - longitude_delta,
+            self.latitude + latitude_delta,
+            self.longitude + longitude_delta,
+        )
+
+    def signed_distance(self, latitude: float, longitude: float) -> float:
+        """Return the distance from a point to the fence's boundary.
+
+        Args:
+            latitude: The latitude of the point.
+            longitude: The longitude of the point.
+
+        Returns:
+            The distance in meters (negative inside the fence).
+        """
+        return (
+            haversine(self.latitude, self.longitude, latitude, longitude) - self.radius
+        )
+
+
+@dataclass(frozen=True)
+class PolygonFence:
+    """Define a polygonal geofence.
+
+    Vertices are (latitude, longitude) tuples; the polygon is closed automatically.
+    """
+
+    fence_id: str
+    vertices: Sequence[tuple[float, float]]
+    _bbox: BoundingBox = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Validate the polygon and pre-compute its bounding box.
+
+        Raises:
+            ValueError: Raised when the polygon has fewer than three vertices.
+        """
+        if len(self.vertices) < 3:
+            raise ValueError("A polygon needs at least three vertices")
+
+        object.__setattr__(self, "vertices", tuple(self.vertices))
+        latitudes = [latitude for latitude, _ in self.vertices]
+        longitudes = [longitude for _, longitude in self.vertices]
+        object.__setattr__(
+            self,
+            "_bbox",
+            (min(latitudes), min(longitudes), max(latitudes), max(longitudes)),
+        )
+
+    @property
+    def bbox(self) -> BoundingBox:
+        """Return the fence's bounding box.
+
+        Returns:
+            A (south, west, north, east) tuple.
+        """
+        return self._bbox
+
+    def signed_distance(self, latitude: float, longitude: float) -> float:
+        """Return the distance from a point to the fence's boundary.
+
+        Distances are computed on a local flat projection around the point, which is
+        accurate for fences up to a few hundred kilometers across.
+
+        Args:
+            latitude: The latitude of the point.
+            longitude: The longitude of the point.
+
+        Returns:
+            The distance in meters (negative inside the fence).
+        """
+        x_scale = METERS_PER_DEGREE * math.cos(math.radians(latitude))
+        points = [
+            (
+                (vertex_longitude - longitude) * x_scale,
+                (vertex_latitude - latitude) * METERS_PER_DEGREE,
+            )
+            for vertex_latitude, vertex_longitude in self.vertices
+        ]
+
+        inside = False
+        distance = math.inf
+        for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+            # Ray casting (from the point, which is at the origin, along +x):
+            if (y1 > 0) != (y2 > 0) and x1 - y1 * (x2 - x1) / (y2 - y1) > 0:
+                inside = not inside
+
+            # The distance from the origin to the edge:
+            dx = x2 - x1
+            dy = y2 - y1
+            if length_squared := dx * dx + dy * dy:
+                t = min(1.0, max(0.0, -(x1 * dx + y1 * dy) / length_squared))
+            else:
+                t = 0.0
+            distance = min(distance, math.hypot(x1 + t * dx, y1 + t * dy))
+
+        return -distance if inside else distance
+
+
+Geofence = CircleFence | PolygonFence
+
+
+class GeofenceEngine:
+    """Define an engine that tracks which Tiles are within which geofences.
+
+    Fences are indexed in a grid of cell_size-degree cells, so each Tile position is
+    only checked against nearby fences (and the fences it is currently within).
+
+    To keep noisy positions near a fence's boundary from causing repeated enter/exit
+    events, a Tile only exits a fence once its position is farther outside than the
+    position's accuracy (capped at max_hysteresis meters).
+
+    Fences may not cross the antimeridian.
+    """
+
+    def __init__(
+        self,
+        *,
+        cell_size: float = DEFAULT_CELL_SIZE,
+        max_hysteresis: float = DEFAULT_MAX_HYSTERESIS,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            cell_size: The size (in degrees) of a grid cell.
+            max_hysteresis: The maximum distance (in meters) a Tile has to be outside a
+                fence before it exits.
+
+        Raises:
+            ValueError: Raised when the cell size is invalid.
+        """
+        if not 0 < cell_size <= 180:
+            raise ValueError("The cell size must be between 0 and 180 degrees")
+
+        self._cell_size = cell_size
+        self._cells: dict[tuple[int, int], set[str]] = {}
+        self._fence_cells: dict[str, list[tuple[int, int]]] = {}
+        self._fences: dict[str, Geofence] = {}
+        self._max_hysteresis = max_hysteresis
+        self._memberships: dict[str, set[str]] = {}
+
+    @property
+    def fences(self) -> dict[str, Geofence]:
+        """Return the geofences.
+
+        Returns:
+            A dictionary of fence IDs to fences.
+        """
+        return dict(self._fences)
+
+    def _unindex_fence(self, fence_id: str) -> bool:
+        """Remove a geofence from the grid.
+
+        Args:
+            fence_id: The ID of the fence.
+
+        Returns:
+            Whether the fence existed.
+        """
+        if self._fences.pop(fence_id, None) is None:
+            return False
+
+        for cell in self._fence_cells.pop(fence_id):
+            self._cells[cell].discard(fence_id)
+            if not self._cells[cell]:
+                del self._cells[cell]
+        return True
+
+    def add_fence(self, fence: Geofence) -> None:
+        """Add a geofence (replacing any existing fence with the same ID).
+
+        Tiles within a replaced fence stay within it until the next evaluation.
+
+        Args:
+            fence: A geofence.
+        """
+        self._unindex_fence(fence.fence_id)
+
+        south, west, north, east = fence.bbox
+        south_row, west_column = get_grid_cell(south, west, self._cell_size)
+        north_row, east_column = get_grid_cell(north, east, self._cell_size)
+
+        cells = [
+            (row, column)
+            for row in range(south_row, north_row + 1)
+            for column in range(west_column, east_column + 1)
+        ]
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(fence.fence_id)
+        self._fence_cells[fence.fence_id] = cells
+        self._fences[fence.fence_id] = fence
+
+    def evaluate(self, tiles: Iterable[Tile]) -> list[GeofenceEvent]:
+        """Evaluate Tile positions against the geofences.
+
+        Tiles without a known location keep their current memberships. For each Tile,
+        exit events come before enter events.
+
+        Args:
+            tiles: Tiles (e.g., the result of API.async_get_tiles).
+
+        Returns:
+            A list of enter/exit events.
+        """
+        events: list[GeofenceEvent] = []
+        for tile in tiles:
+            if (latitude := tile.latitude) is None or (
+                longitude := tile.longitude
+            ) is None:
+                continue
+
+            hysteresis = min(tile.accuracy or 0.0, self._max_hysteresis)
+            memberships = self._memberships.get(tile.uuid, set())
+            candidates = self._cells.get(
+                get_grid_cell(latitude, longitude, self._cell_size), set()
+            )
+
+            exits = []
+            enters = []
+            for fence_id in sorted(candidates | memberships):
+                distance = self._fences[fence_id].signed_distance(latitude, longitude)
+                if fence_id in memberships:
+                    if distance > hysteresis:
+                        exits.append(fence_id)
+                elif distance <= 0:
+                    enters.append(fence_id)
+
+            # Exits come first, so that a Tile is never reported as being within two
+            # fences it only moved between:
+            memberships.difference_update(exits)
+            memberships.update(enters)
+            events.extend(
+                GeofenceEvent(tile.uuid, fence_id, event_type, latitude, longitude)
+                for event_type, fence_ids in (
+                    (GeofenceEventType.EXIT, exits),
+                    (GeofenceEventType.ENTER, enters),
+                )
+                for fence_id in fence_ids
+            )
+
+            if memberships:
+                self._memberships[tile.uuid] = memberships
+            else:
+                self._memberships.pop(tile.uuid, None)
+
+        return events
+
+    def get_fences_for_tile(self, tile_uuid: str) -> set[str]:
+        """Return the IDs of the geofences a Tile is currently within.
+
+        Args:
+            tile_uuid: The UUID of a Tile.
+
+        Returns:
+            A set of fence IDs.
+        """
+        return set(self._memberships.get(tile_uuid, ()))
+
+    def remove_fence(self, fence_id: str) -> None:
+        """Remove a geofence (without emitting exit events).
+
+        Args:
+            fence_id: The ID of the fence.
+        """
+        if not self._unindex_fence(fence_id):
+            return
+
+        for tile_uuid, memberships in list(self._memberships.items()):
+            memberships.discard(fence_id)
+            if not memberships:
+                del self._memberships[tile_uuid]
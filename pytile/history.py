@@ -0,0 +1,479 @@
+"""Define helpers to retrieve a Tile's location history."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover
+    HAS_NUMPY = False
+
+if TYPE_CHECKING:
+    from .tile import Tile
+
+DEFAULT_HISTORY_CONCURRENCY = 4
+DEFAULT_HISTORY_WINDOW = timedelta(days=7)
+
+# Keys of a single entry in a history response's location_updates:
+HISTORY_ACCURACY_KEY = "horizontal_accuracy"
+HISTORY_ALTITUDE_KEY = "altitude"
+HISTORY_LATITUDE_KEY = "latitude"
+HISTORY_LONGITUDE_KEY = "longitude"
+HISTORY_TIMESTAMP_KEY = "location_timestamp"
+
+# Some location updates only carry a generic timestamp:
+HISTORY_FALLBACK_TIMESTAMP_KEY = "timestamp"
+
+
+def datetime_to_ms(value: datetime) -> int:
+    """Return a datetime as a UNIX timestamp in milliseconds.
+
+    Args:
+        value: A datetime.
+
+    Returns:
+        The number of milliseconds since the epoch.
+    """
+    return round(value.timestamp() * 1000)
+
+
+def get_update_timestamp(update: dict[str, Any]) -> int:
+    """Return the timestamp (in milliseconds) of a location update.
+
+    Args:
+        update: A single entry from a history response's location_updates.
+
+    Returns:
+        The number of milliseconds since the epoch.
+    """
+    if (timestamp := update.get(HISTORY_TIMESTAMP_KEY)) is None:
+        timestamp = update[HISTORY_FALLBACK_TIMESTAMP_KEY]
+    return int(timestamp)
+
+
+def split_time_range(
+    start_ms: int, end_ms: int, window_ms: int
+) -> list[tuple[int, int]]:
+    """Split an inclusive time range into consecutive, non-overlapping windows.
+
+    Args:
+        start_ms: The start of the range (in milliseconds since the epoch).
+        end_ms: The end of the range (in milliseconds since the epoch).
+        window_ms: The maximum length of a window (in milliseconds).
+
+    Returns:
+        A list of inclusive (start, end) windows.
+
+    Raises:
+        ValueError: Raised when the window length isn't positive.
+    """
+    if window_ms <= 0:
+        raise ValueError("The window length must be positive")
+
+    windows = []
+    while start_ms <= end_ms:
+        window_end = min(start_ms + window_ms - 1, end_ms)
+        windows.append((start_ms, window_end))
+        start_ms = window_end + 1
+    return windows
+
+
+async def async_get_history_window(
+    async_request: Callable[..., Awaitable[dict[str, Any]]],
+    tile_uuid: str,
+    start_ms: int,
+    end_ms: int,
+) -> list[dict[str, Any]]:
+    """Get every location update in a single window, in time order.
+
+    If the API reports that a response doesn't contain the complete history (i.e.,
+    complete_history is "N"), the remainder of the window is requested until it does.
+
+    Args:
+        async_request: The request method from the Client object.
+        tile_uuid: The UUID of the Tile.
+        start_ms: The start of the window (in milliseconds since the epoch).
+        end_ms: The end of the window (in milliseconds since the epoch).
+
+    Returns:
+        A list of location updates.
+    """
+    updates: list[dict[str, Any]] = []
+
+    while True:
+        data = await async_request(
+            "get",
+            f"tiles/location/history/{tile_uuid}",
+            params={
+                "aggregation": "False",
+                "end_ts": end_ms,
+                "start_ts": start_ms,
+            },
+        )
+        result = data["result"]
+        batch = result.get("location_updates") or []
+        updates.extend(
+            update
+            for update in batch
+            if start_ms <= get_update_timestamp(update) <= end_ms
+        )
+
+        if result.get("complete_history") != "N" or not batch:
+            break
+
+        # Stop if the API doesn't make progress (to avoid requesting forever):
+        last_ms = max(get_update_timestamp(update) for update in batch)
+        if not start_ms <= last_ms < end_ms:
+            break
+        start_ms = last_ms + 1
+
+    updates.sort(key=get_update_timestamp)
+    return updates
+
+
+async def async_iter_history(  # pylint: disable=too-many-arguments
+    async_request: Callable[..., Awaitable[dict[str, Any]]],
+    tile_uuid: str,
+    start_datetime: datetime,
+    end_datetime: datetime,
+    *,
+    window: timedelta = DEFAULT_HISTORY_WINDOW,
+    max_concurrency: int = DEFAULT_HISTORY_CONCURRENCY,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield a Tile's location updates in time order.
+
+    The time range is split into windows, up to max_concurrency of which are
+    requested at once; updates are yielded as soon as every earlier window has been
+    yielded, so only a few windows' worth of updates are held in memory.
+
+    Args:
+        async_request: The request method from the Client object.
+        tile_uuid: The UUID of the Tile.
+        start_datetime: The start of the time range.
+        end_datetime: The end of the time range.
+        window: The length of a single window.
+        max_concurrency: The maximum number of windows to request at once.
+
+    Yields:
+        Location updates.
+
+    Raises:
+        ValueError: Raised when max_concurrency is less than one.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least one")
+
+    windows = iter(
+        split_time_range(
+            datetime_to_ms(start_datetime),
+            datetime_to_ms(end_datetime),
+            round(window.total_seconds() * 1000),
+        )
+    )
+    pending: deque[asyncio.Task[list[dict[str, Any]]]] = deque()
+
+    def schedule_next_window() -> None:
+        """Start requesting the next window (if there is one)."""
+        if (next_window := next(windows, None)) is not None:
+            pending.append(
+                asyncio.create_task(
+                    async_get_history_window(async_request, tile_uuid, *next_window)
+                )
+            )
+
+    try:
+        for _ in range(max_concurrency):
+            schedule_next_window()
+
+        while pending:
+            updates = await pending.popleft()
+            schedule_next_window()
+            for update in updates:
+                yield update
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def async_iter_tile_history(
+    tile: Tile,
+    start_datetime: datetime,
+    end_datetime: datetime,
+    *,
+    window: timedelta = DEFAULT_HISTORY_WINDOW,
+    max_concurrency: int = DEFAULT_HISTORY_CONCURRENCY,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield a Tile's location updates in time order (see async_iter_history).
+
+    Args:
+        tile: A Tile.
+        start_datetime: The start of the time range.
+        end_datetime: The end of the time range.
+        window: The length of a single window.
+        max_concurrency: The maximum number of windows to request at once.
+
+    Yields:
+        Location updates.
+    """
+    async for update in async_iter_history(
+        tile._async_request,  # pylint: disable=protected-access
+        tile.uuid,
+        start_datetime,
+        end_datetime,
+        window=window,
+        max_concurrency=max_concurrency,
+    ):
+        yield update
+
+
+class HistoryColumns:
+    """Define location updates stored as contiguous columns.
+
+    Timestamps (in milliseconds since the epoch) are stored as 64-bit integers and
+    everything else as 64-bit floats (NaN where a value is missing). Columns are
+    returned as NumPy arrays when NumPy is installed and as memoryviews otherwise;
+    either way, they (and slices made with slice_time) share memory with the
+    original columns rather than copying them.
+    """
+
+    __slots__ = (
+        "_accuracies",
+        "_altitudes",
+        "_latitudes",
+        "_longitudes",
+        "_start",
+        "_stop",
+        "_timestamps",
+    )
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        timestamps: array[int],
+        latitudes: array[float],
+        longitudes: array[float],
+        accuracies: array[float],
+        altitudes: array[float],
+        *,
+        start: int = 0,
+        stop: int | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            timestamps: Timestamps (in milliseconds since the epoch), in time order.
+            latitudes: Latitudes.
+            longitudes: Longitudes.
+            accuracies: Horizontal accuracies (in meters).
+            altitudes: Altitudes.
+            start: The index of the first location update to include.
+            stop: The index after the last location update to include.
+        """
+        self._accuracies = accuracies
+        self._altitudes = altitudes
+        self._latitudes = latitudes
+        self._longitudes = longitudes
+        self._start = start
+        self._stop = len(timestamps) if stop is None else stop
+        self._timestamps = timestamps
+
+    def __len__(self) -> int:
+        """Return the number of location updates.
+
+        Returns:
+            The number of location updates.
+        """
+        return self._stop - self._start
+
+    @classmethod
+    def from_updates(cls, updates: Iterable[dict[str, Any]]) -> HistoryColumns:
+        """Create columns from location updates.
+
+        Args:
+            updates: Location updates (in time order).
+
+        Returns:
+            A HistoryColumns object.
+        """
+        columns = cls(array("q"), array("d"), array("d"), array("d"), array("d"))
+        for update in updates:
+            columns._append(update)
+        columns._stop = len(columns._timestamps)
+        return columns
+
+    @classmethod
+    async def async_from_updates(
+        cls, updates: AsyncIterable[dict[str, Any]]
+    ) -> HistoryColumns:
+        """Create columns from a stream of location updates.
+
+        Args:
+            updates: Location updates (in time order).
+
+        Returns:
+            A HistoryColumns object.
+        """
+        columns = cls(array("q"), array("d"), array("d"), array("d"), array("d"))
+        async for update in updates:
+            columns._append(update)
+        columns._stop = len(columns._timestamps)
+        return columns
+
+    @property
+    def accuracies(self) -> Any:
+        """Return the horizontal accuracies.
+
+        Returns:
+            A NumPy array (or memoryview) of floats.
+        """
+        return self._get_column(self._accuracies, "d")
+
+    @property
+    def altitudes(self) -> Any:
+        """Return the altitudes.
+
+        Returns:
+            A NumPy array (or memoryview) of floats.
+        """
+        return self._get_column(self._altitudes, "d")
+
+    @property
+    def latitudes(self) -> Any:
+        """Return the latitudes.
+
+        Returns:
+            A NumPy array (or memoryview) of floats.
+        """
+        return self._get_column(self._latitudes, "d")
+
+    @property
+    def longitudes(self) -> Any:
+        """Return the longitudes.
+
+        Returns:
+            A NumPy array (or memoryview) of floats.
+        """
+        return self._get_column(self._longitudes, "d")
+
+    @property
+    def timestamps(self) -> Any:
+        """Return the timestamps (in milliseconds since the epoch).
+
+        Returns:
+            A NumPy array (or memoryview) of integers.
+        """
+        return self._get_column(self._timestamps, "q")
+
+    def _append(self, update: dict[str, Any]) -> None:
+        """Append a location update to the columns.
+
+        Args:
+            update: A location update.
+        """
+        self._timestamps.append(get_update_timestamp(update))
+        for column, key in (
+            (self._accuracies, HISTORY_ACCURACY_KEY),
+            (self._altitudes, HISTORY_ALTITUDE_KEY),
+            (self._latitudes, HISTORY_LATITUDE_KEY),
+            (self._longitudes, HISTORY_LONGITUDE_KEY),
+        ):
+            value = update.get(key)
+            column.append(math.nan if value is None else value)
+
+    def _get_column(self, column: array[Any], typecode: str) -> Any:
+        """Return a view of this object's range of a column.
+
+        Args:
+            column: A full column.
+            typecode: The array typecode of the column.
+
+        Returns:
+            A NumPy array (or memoryview).
+        """
+        if HAS_NUMPY:
+            return np.frombuffer(column, dtype=np.dtype(typecode))[
+                self._start : self._stop
+            ]
+        return memoryview(column)[self._start : self._stop]
+
+    def slice_index(self, start: int, stop: int) -> HistoryColumns:
+        """Return a range of location updates by position (without copying them).
+
+        Args:
+            start: The index of the first location update to include.
+            stop: The index after the last location update to include.
+
+        Returns:
+            A HistoryColumns object that shares memory with this one.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        return HistoryColumns(
+            self._timestamps,
+            self._latitudes,
+            self._longitudes,
+            self._accuracies,
+            self._altitudes,
+            start=self._start + start,
+            stop=self._start + max(start, stop),
+        )
+
+    def slice_time(
+        self, start_datetime: datetime, end_datetime: datetime
+    ) -> HistoryColumns:
+        """Return the location updates within a time range (without copying them).
+
+        Args:
+            start_datetime: The start of the time range (inclusive).
+            end_datetime: The end of the time range (inclusive).
+
+        Returns:
+            A HistoryColumns object that shares memory with this one.
+        """
+        start = bisect_left(
+            self._timestamps, datetime_to_ms(start_datetime), self._start, self._stop
+        )
+        stop = bisect_right(
+            self._timestamps, datetime_to_ms(end_datetime), start, self._stop
+        )
+        return self.slice_index(start - self._start, stop - self._start)
+
+
+async def async_get_tile_history_columns(
+    tile: Tile,
+    start_datetime: datetime,
+    end_datetime: datetime,
+    *,
+    window: timedelta = DEFAULT_HISTORY_WINDOW,
+    max_concurrency: int = DEFAULT_HISTORY_CONCURRENCY,
+) -> HistoryColumns:
+    """Get a Tile's location updates as contiguous columns.
+
+    Args:
+        tile: A Tile.
+        start_datetime: The start of the time range.
+        end_datetime: The end of the time range.
+        window: The length of a single window.
+        max_concurrency: The maximum number of windows to request at once.
+
+    Returns:
+        A HistoryColumns object.
+    """
+    return await HistoryColumns.async_from_updates(
+        async_iter_tile_history(
+            tile,
+            start_datetime,
+            end_datetime,
+            window=window,
+            max_concurrency=max_concurrency,
+        )
+    )
@@ -0,0 +1,315 @@
+"""Define a local, persistent store of Tile location history."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from itertools import chain
+from time import time
+from typing import Any
+
+from .history import (
+    DEFAULT_HISTORY_CONCURRENCY,
+    DEFAULT_HISTORY_WINDOW,
+    async_get_history_window,
+    datetime_to_ms,
+    get_update_timestamp,
+    split_time_range,
+)
+
+# Location updates can reach the Tile cloud some time after they happened, so the
+# most recent history isn't considered final (and will be fetched again) until this
+# much time has passed:
+DEFAULT_SETTLE_TIME = timedelta(hours=1)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS coverage (
+    tile_uuid TEXT NOT NULL,
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL,
+    PRIMARY KEY (tile_uuid, start_ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS location_updates (
+    tile_uuid TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (tile_uuid, timestamp)
+) WITHOUT ROWID;
+"""
+
+
+class HistoryStore:
+    """Define a SQLite-backed store of Tile location history.
+
+    The store records which time ranges of each Tile's history it holds, so that only
+    the gaps have to be requested from the Tile API; range queries are then answered
+    locally.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        settle_time: timedelta = DEFAULT_SETTLE_TIME,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            path: The path of the SQLite database (or ":memory:").
+            settle_time: How long to wait before treating history as final.
+        """
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._path = path
+        self._settle_time_ms = round(settle_time.total_seconds() * 1000)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return the database connection, opening it if necessary (blocking).
+
+        Returns:
+            A SQLite connection.
+        """
+        if self._connection is None:
+            self._connection = sqlite3.connect(self._path, check_same_thread=False)
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def _add(
+        self,
+        tile_uuid: str,
+        start_ms: int,
+        end_ms: int,
+        updates: list[dict[str, Any]],
+    ) -> None:
+        """Save the location updates of a fully-retrieved time range (blocking).
+
+        Args:
+            tile_uuid: The UUID of the Tile.
+            start_ms: The start of the time range (in milliseconds since the epoch).
+            end_ms: The end of the time range (in milliseconds since the epoch).
+            updates: Every location update within the time range.
+        """
+        with self._lock, self._get_connection() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO location_updates VALUES (?, ?, ?)",
+                [
+                    (tile_uuid, get_update_timestamp(update), json.dumps(update))
+                    for update in updates
+                ],
+            )
+
+            # Merge the new range with any overlapping or adjacent ones:
+            ranges = connection.execute(
+                "SELECT start_ts, end_ts FROM coverage "
+                "WHERE tile_uuid = ? AND end_ts >= ? AND start_ts <= ?",
+                (tile_uuid, start_ms - 1, end_ms + 1),
+            ).fetchall()
+            connection.executemany(
+                "DELETE FROM coverage WHERE tile_uuid = ? AND start_ts = ?",
+                [(tile_uuid, range_start) for range_start, _ in ranges],
+            )
+            connection.execute(
+                "INSERT INTO coverage VALUES (?, ?, ?)",
+                (
+                    tile_uuid,
+                    min([start_ms, *(range_start for range_start, _ in ranges)]),
+                    max([end_ms, *(range_end for _, range_end in ranges)]),
+                ),
+            )
+
+    def _get_gap_windows(
+        self, tile_uuid: str, start_ms: int, end_ms: int, window_ms: int
+    ) -> list[tuple[int, int]]:
+        """Return the windows to request to fill the gaps in a time range (blocking).
+
+        Args:
+            tile_uuid: The UUID of the Tile.
+            start_ms: The start of the time range (in milliseconds since the epoch).
+            end_ms: The end of the time range (in milliseconds since the epoch).
+            window_ms: The maximum length of a window (in milliseconds).
+
+        Returns:
+            A list of inclusive (start, end) windows.
+        """
+        return [
+            gap_window
+            for gap_start, gap_end in self._get_gaps(tile_uuid, start_ms, end_ms)
+            for gap_window in split_time_range(gap_start, gap_end, window_ms)
+        ]
+
+    def _get_gaps(
+        self, tile_uuid: str, start_ms: int, end_ms: int
+    ) -> list[tuple[int, int]]:
+        """Return the parts of a time range that aren't in the store (blocking).
+
+        Args:
+            tile_uuid: The UUID of the Tile.
+            start_ms: The start of the time range (in milliseconds since the epoch).
+            end_ms: The end of the time range (in milliseconds since the epoch).
+
+        Returns:
+            A list of inclusive (start, end) time ranges.
+        """
+        with self._lock:
+            ranges = (
+                self._get_connection()
+                .execute(
+                    "SELECT start_ts, end_ts FROM coverage "
+                    "WHERE tile_uuid = ? AND end_ts >= ? AND start_ts <= ? "
+                    "ORDER BY start_ts",
+                    (tile_uuid, start_ms, end_ms),
+                )
+                .fetchall()
+            )
+
+        gaps = []
+        cursor = start_ms
+        for range_start, range_end in ranges:
+            if range_start > cursor:
+                gaps.append((cursor, range_start - 1))
+            cursor = max(cursor, range_end + 1)
+        if cursor <= end_ms:
+            gaps.append((cursor, end_ms))
+        return gaps
+
+    def _query(
+        self, tile_uuid: str, start_ms: int, end_ms: int
+    ) -> list[dict[str, Any]]:
+        """Return the stored location updates within a time range (blocking).
+
+        Args:
+            tile_uuid: The UUID of the Tile.
+            start_ms: The start of the time range (in milliseconds since the epoch).
+            end_ms: The end of the time range (in milliseconds since the epoch).
+
+        Returns:
+            A list of location updates, in time order.
+        """
+        with self._lock:
+            rows = (
+                self._get_connection()
+                .execute(
+                    "SELECT data FROM location_updates "
+                    "WHERE tile_uuid = ? AND timestamp BETWEEN ? AND ? "
+                    "ORDER BY timestamp",
+                    (tile_uuid, start_ms, end_ms),
+                )
+                .fetchall()
+            )
+        return [json.loads(data) for (data,) in rows]
+
+    async def async_get_history(  # pylint: disable=too-many-arguments
+        self,
+        async_request: Callable[..., Awaitable[dict[str, Any]]],
+        tile_uuid: str,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        *,
+        window: timedelta = DEFAULT_HISTORY_WINDOW,
+        max_concurrency: int = DEFAULT_HISTORY_CONCURRENCY,
+    ) -> list[dict[str, Any]]:
+        """Get a Tile's location updates, only requesting what isn't stored yet.
+
+        Gaps in the store are requested in windows; each window is saved as soon as
+        it has been retrieved (so progress isn't lost if a later request fails).
+        History more recent than the settle time is returned but not saved.
+
+        Args:
+            async_request: The request method from the Client object.
+            tile_uuid: The UUID of the Tile.
+            start_datetime: The start of the time range.
+            end_datetime: The end of the time range.
+            window: The length of a single request's time range.
+            max_concurrency: The maximum number of windows to request at once.
+
+        Returns:
+            A list of location updates, in time order.
+        """
+        start_ms = datetime_to_ms(start_datetime)
+        end_ms = datetime_to_ms(end_datetime)
+        settled_ms = round(time() * 1000) - self._settle_time_ms
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def async_fetch_window(
+            window_start: int, window_end: int
+        ) -> list[dict[str, Any]]:
+            """Request a single window and save its settled part.
+
+            Args:
+                window_start: The start of the window.
+                window_end: The end of the window.
+
+            Returns:
+                The location updates that weren't saved.
+            """
+            async with semaphore:
+                updates = await async_get_history_window(
+                    async_request, tile_uuid, window_start, window_end
+                )
+
+            if window_start > settled_ms:
+                return updates
+
+            settled_updates = [
+                update
+                for update in updates
+                if get_update_timestamp(update) <= settled_ms
+            ]
+            await asyncio.to_thread(
+                self._add,
+                tile_uuid,
+                window_start,
+                min(window_end, settled_ms),
+                settled_updates,
+            )
+            return updates[len(settled_updates) :]
+
+        gap_windows = await asyncio.to_thread(
+            self._get_gap_windows,
+            tile_uuid,
+            start_ms,
+            end_ms,
+            round(window.total_seconds() * 1000),
+        )
+        unsettled_updates = await asyncio.gather(
+            *(async_fetch_window(*gap_window) for gap_window in gap_windows)
+        )
+
+        updates = await asyncio.to_thread(
+            self._query, tile_uuid, start_ms, min(end_ms, settled_ms)
+        )
+        updates.extend(chain.from_iterable(unsettled_updates))
+        return updates
+
+    async def async_query(
+        self, tile_uuid: str, start_datetime: datetime, end_datetime: datetime
+    ) -> list[dict[str, Any]]:
+        """Return the stored location updates within a time range.
+
+        Args:
+            tile_uuid: The UUID of the Tile.
+            start_datetime: The start of the time range.
+            end_datetime: The end of the time range.
+
+        Returns:
+            A list of location updates, in time order.
+        """
+        return await asyncio.to_thread(
+            self._query,
+            tile_uuid,
+            datetime_to_ms(start_datetime),
+            datetime_to_ms(end_datetime),
+        )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,408 @@
+"""Define process-wide metrics for pytile clients (in Prometheus text format)."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Sequence
+
+from .trace import DEFAULT_LATENCY_BUCKETS, RequestTrace
+
+DEFAULT_POLL_SIZE_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 10000)
+
+OUTCOME_CACHE_HIT = "cache_hit"
+OUTCOME_CLIENT_ERROR = "client_error"
+OUTCOME_ERROR = "error"
+OUTCOME_FAILURE = "failure"
+OUTCOME_SERVER_ERROR = "server_error"
+OUTCOME_SUCCESS = "success"
+OUTCOME_TIMEOUT = "timeout"
+
+SESSION_INLINE_RENEWAL = "inline"
+SESSION_BACKGROUND_RENEWAL = "background"
+SESSION_LOGIN = "login"
+
+SKIP_REASON_ERROR = "error"
+SKIP_REASON_NO_DETAILS = "no_details"
+
+LabelValues = tuple[str, ...]
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape a label value for the Prometheus text format.
+
+    Args:
+        value: A label value.
+
+    Returns:
+        The escaped value.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_number(value: float) -> str:
+    """Format a sample value for the Prometheus text format.
+
+    Args:
+        value: A sample value.
+
+    Returns:
+        The formatted value.
+    """
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):  # pylint: disable=too-few-public-methods
+    """Define a metric with labels."""
+
+    metric_type = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str]
+    ) -> None:
+        """Initialize.
+
+        Args:
+            name: The name of the metric.
+            documentation: The help text of the metric.
+            labelnames: The names of the metric's labels.
+        """
+        self._lock = threading.Lock()
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.name = name
+
+    def _format_labels(
+        self, values: LabelValues, extra: tuple[tuple[str, str], ...] = ()
+    ) -> str:
+        """Format a set of labels.
+
+        Args:
+            values: The label values (in the order of labelnames).
+            extra: Additional (name, value) labels.
+
+        Returns:
+            The formatted labels (an empty string if there are none).
+        """
+        if not (pairs := (*zip(self.labelnames, values), *extra)):
+            return ""
+        return (
+            "{"
+            + ",".join(
+                f'{name}="{_escape_label_value(value)}"' for name, value in pairs
+            )
+            + "}"
+        )
+
+    def _get_label_values(self, labels: dict[str, str]) -> LabelValues:
+        """Return label values in the order of labelnames.
+
+        Args:
+            labels: A dictionary of label names to values.
+
+        Returns:
+            A tuple of label values.
+
+        Raises:
+            ValueError: Raised when the labels don't match the metric's.
+        """
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects the labels {self.labelnames}")
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError as err:
+            raise ValueError(
+                f"{self.name} expects the labels {self.labelnames}"
+            ) from err
+
+    def render(self) -> list[str]:
+        """Render the metric in the Prometheus text format.
+
+        Returns:
+            A list of lines.
+        """
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+            *self._render_samples(),
+        ]
+
+    @abstractmethod
+    def _render_samples(self) -> list[str]:
+        """Render the metric's samples.
+
+        Returns:
+            A list of lines.
+        """
+
+
+class Counter(_Metric):
+    """Define a counter."""
+
+    metric_type = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        """Initialize.
+
+        Args:
+            name: The name of the metric.
+            documentation: The help text of the metric.
+            labelnames: The names of the metric's labels.
+        """
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def get(self, **labels: str) -> float:
+        """Return the value of the counter for a set of labels.
+
+        Args:
+            **labels: The label values.
+
+        Returns:
+            The value.
+        """
+        return self._values.get(self._get_label_values(labels), 0)
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increment the counter.
+
+        Args:
+            amount: The amount to increment by.
+            **labels: The label values.
+        """
+        key = self._get_label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _render_samples(self) -> list[str]:
+        """Render the counter's samples.
+
+        Returns:
+            A list of lines.
+        """
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{self._format_labels(key)} {_format_number(value)}"
+            for key, value in values
+        ]
+
+
+class Histogram(_Metric):
+    """Define a histogram."""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            name: The name of the metric.
+            documentation: The help text of the metric.
+            labelnames: The names of the metric's labels.
+            buckets: The upper bounds of the buckets.
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # For each set of labels, the per-bucket counts (plus an overflow bucket) and
+        # the sum of the observed values:
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def get_count(self, **labels: str) -> int:
+        """Return the number of observations for a set of labels.
+
+        Args:
+            **labels: The label values.
+
+        Returns:
+            The number of observations.
+        """
+        return sum(self._counts.get(self._get_label_values(labels), ()))
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Add an observation.
+
+        Args:
+            value: The observed value.
+            **labels: The label values.
+        """
+        key = self._get_label_values(labels)
+        with self._lock:
+            if (counts := self._counts.get(key)) is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            counts[bisect_left(self.buckets, value)] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def _render_samples(self) -> list[str]:
+        """Render the histogram's samples.
+
+        Returns:
+            A list of lines.
+        """
+        with self._lock:
+            values = sorted(
+                (key, list(counts), self._sums[key])
+                for key, counts in self._counts.items()
+            )
+
+        lines = []
+        for key, counts, total in values:
+            cumulative = 0
+            for upper, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                labels = self._format_labels(key, (("le", _format_number(upper)),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = self._format_labels(key)
+            lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Metrics:
+    """Define the metrics of pytile clients.
+
+    API objects only record metrics when they're given a Metrics object (e.g.,
+    DEFAULT_METRICS, which render_prometheus renders by default).
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.requests = Counter(
+            "pytile_requests_total",
+            "Tile API requests, by endpoint and outcome.",
+            ("method", "endpoint", "outcome"),
+        )
+        self.request_duration = Histogram(
+            "pytile_request_duration_seconds",
+            "Tile API request latency (excluding cache hits).",
+            ("method", "endpoint"),
+        )
+        self.request_retries = Counter(
+            "pytile_request_retries_total",
+            "Retried Tile API request attempts.",
+            ("method", "endpoint"),
+        )
+        self.response_bytes = Counter(
+            "pytile_response_bytes_total",
+            "Tile API response payload bytes.",
+            ("method", "endpoint"),
+        )
+        self.logins = Counter(
+            "pytile_logins_total", "Tile API logins, by outcome.", ("outcome",)
+        )
+        self.session_renewals = Counter(
+            "pytile_session_renewals_total",
+            "Tile API session renewals, by mode and outcome.",
+            ("mode", "outcome"),
+        )
+        self.tiles_refreshed = Histogram(
+            "pytile_tiles_refreshed",
+            "Tiles whose details were refreshed per call to async_get_tiles.",
+            buckets=DEFAULT_POLL_SIZE_BUCKETS,
+        )
+        self.tiles_skipped = Counter(
+            "pytile_tiles_skipped_total",
+            "Tiles left out of async_get_tiles results, by reason.",
+            ("reason",),
+        )
+
+    def collect(self) -> list[Counter | Histogram]:
+        """Return every metric.
+
+        Returns:
+            A list of metrics.
+        """
+        return [
+            self.requests,
+            self.request_duration,
+            self.request_retries,
+            self.response_bytes,
+            self.logins,
+            self.session_renewals,
+            self.tiles_refreshed,
+            self.tiles_skipped,
+        ]
+
+    def record_request(self, trace: RequestTrace) -> None:
+        """Record a request.
+
+        Args:
+            trace: A request trace.
+        """
+        method = trace.method.upper()
+        if trace.cache_hit:
+            outcome = OUTCOME_CACHE_HIT
+        elif trace.error is None:
+            outcome = OUTCOME_SUCCESS
+        elif isinstance(trace.error, asyncio.TimeoutError):
+            outcome = OUTCOME_TIMEOUT
+        elif trace.status is not None and trace.status >= 500:
+            outcome = OUTCOME_SERVER_ERROR
+        elif trace.status is not None and trace.status >= 400:
+            outcome = OUTCOME_CLIENT_ERROR
+        else:
+            outcome = OUTCOME_ERROR
+
+        self.requests.inc(method=method, endpoint=trace.endpoint, outcome=outcome)
+        if trace.cache_hit:
+            return
+
+        self.request_duration.observe(
+            trace.duration, method=method, endpoint=trace.endpoint
+        )
+        if trace.retries:
+            self.request_retries.inc(
+                trace.retries, method=method, endpoint=trace.endpoint
+            )
+        if trace.response_bytes:
+            self.response_bytes.inc(
+                trace.response_bytes, method=method, endpoint=trace.endpoint
+            )
+
+    def record_session(self, mode: str, *, success: bool) -> None:
+        """Record a login or session renewal.
+
+        Args:
+            mode: SESSION_LOGIN, SESSION_INLINE_RENEWAL, or SESSION_BACKGROUND_RENEWAL.
+            success: Whether a session was created.
+        """
+        outcome = OUTCOME_SUCCESS if success else OUTCOME_FAILURE
+        if mode == SESSION_LOGIN:
+            self.logins.inc(outcome=outcome)
+        else:
+            self.session_renewals.inc(mode=mode, outcome=outcome)
+
+
+DEFAULT_METRICS = Metrics()
+
+
+def render_prometheus(metrics: Metrics = DEFAULT_METRICS) -> str:
+    """Render metrics in the Prometheus text exposition format.
+
+    Args:
+        metrics: The metrics to render.
+
+    Returns:
+        The metrics (e.g., to serve from an existing /metrics endpoint).
+    """
+    return (
+        "\n".join(line for metric in metrics.collect() for line in metric.render())
+        + "\n"
+    )
@@ -0,0 +1,250 @@
+"""Define a pool that manages many Tile accounts."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import math
+from contextlib import suppress
+from dataclasses import replace
+from time import monotonic
+from typing import Any
+
+from aiohttp import ClientSession, TCPConnector
+
+from .api import API, APIOptions, async_login
+from .concurrency import DEFAULT_MAX_CONCURRENCY, AdaptiveConcurrencyLimiter
+from .const import LOGGER
+from .errors import TileError
+from .tile import Tile
+
+DEFAULT_CONNECTION_LIMIT = 100
+DEFAULT_DNS_CACHE_TTL = 300
+DEFAULT_POLL_INTERVAL = 300.0
+
+# Each new account's refreshes are offset by this fraction of the polling interval
+# (modulo 1) from the previous account's; since the golden ratio is "maximally
+# irrational", the offsets stay evenly spread no matter how many accounts there are:
+GOLDEN_RATIO_FRACTION = 0.6180339887498949
+
+
+class AccountPool:
+    """Define a pool of Tile accounts that share one connection pool.
+
+    Every account gets its own API object and aiohttp ClientSession (so that session
+    cookies stay separate), but all of them share a single TCP connector and a single
+    concurrency budget. Refreshes are staggered across the polling interval instead of
+    all happening at once.
+    """
+
+    def __init__(
+        self,
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        connection_limit: int = DEFAULT_CONNECTION_LIMIT,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            poll_interval: The number of seconds between refreshes of an account.
+            max_concurrency: The maximum number of simultaneous requests across all
+                accounts.
+            connection_limit: The maximum number of open connections.
+        """
+        self._account_count = 0
+        self._accounts: dict[str, tuple[API, ClientSession]] = {}
+        self._accounts_changed = asyncio.Event()
+        self._concurrency_limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=max_concurrency, max_limit=max_concurrency
+        )
+        self._connection_limit = connection_limit
+        self._connector: TCPConnector | None = None
+        self._phases: dict[str, float] = {}
+        self._poll_interval = poll_interval
+        self._refresh_tasks: dict[str, asyncio.Task[None]] = {}
+        self._schedule: list[tuple[float, str]] = []
+        self._tiles: dict[str, dict[str, Tile]] = {}
+        self._started_at: float | None = None
+
+    @property
+    def accounts(self) -> dict[str, API]:
+        """Return the API objects in the pool.
+
+        Returns:
+            A dictionary of account email addresses to API objects.
+        """
+        return {email: api for email, (api, _) in self._accounts.items()}
+
+    @property
+    def tiles(self) -> dict[str, Tile]:
+        """Return the most recently refreshed Tiles across all accounts.
+
+        Returns:
+            A dictionary of Tile UUIDs to Tile objects.
+        """
+        return {
+            tile_uuid: tile
+            for tiles in self._tiles.values()
+            for tile_uuid, tile in tiles.items()
+        }
+
+    def _schedule_account(self, email: str, *, not_before: float) -> None:
+        """Schedule an account's next refresh.
+
+        Args:
+            email: The email address of the account.
+            not_before: The earliest (monotonic) time at which the refresh may happen.
+        """
+        if self._started_at is None:
+            return
+
+        cycle_start = self._started_at + self._phases[email] * self._poll_interval
+        cycles = max(0, math.ceil((not_before - cycle_start) / self._poll_interval))
+        heapq.heappush(
+            self._schedule, (cycle_start + cycles * self._poll_interval, email)
+        )
+
+    async def _async_refresh_account(self, email: str) -> None:
+        """Refresh an account's Tiles.
+
+        Args:
+            email: The email address of the account.
+        """
+        api, _ = self._accounts[email]
+        try:
+            self._tiles[email] = await api.async_get_tiles(incremental=True)
+        except (TileError, asyncio.TimeoutError) as err:
+            LOGGER.error("Error refreshing Tiles for %s: %r", email, err)
+
+    async def async_add_account(
+        self,
+        email: str,
+        password: str,
+        *,
+        options: APIOptions | None = None,
+        **kwargs: Any,
+    ) -> API:
+        """Log into an account and add it to the pool.
+
+        Args:
+            email: An email address for a Tile account.
+            password: The account password.
+            options: Optional tuning options (whose concurrency limiter is replaced by
+                the pool's).
+            **kwargs: Additional kwargs to pass to async_login.
+
+        Returns:
+            An authenticated API object.
+        """
+        if self._connector is None:
+            self._connector = TCPConnector(
+                limit=self._connection_limit,
+                limit_per_host=self._connection_limit,
+                ttl_dns_cache=DEFAULT_DNS_CACHE_TTL,
+            )
+
+        session = ClientSession(connector=self._connector, connector_owner=False)
+        try:
+            api = await async_login(
+                email,
+                password,
+                session,
+                options=replace(
+                    options or APIOptions(),
+                    concurrency_limiter=self._concurrency_limiter,
+                ),
+                **kwargs,
+            )
+        except BaseException:
+            await session.close()
+            raise
+
+        if email in self._accounts:
+            await self.async_remove_account(email)
+
+        self._accounts[email] = (api, session)
+        self._phases[email] = (self._account_count * GOLDEN_RATIO_FRACTION) % 1
+        self._account_count += 1
+        self._schedule_account(email, not_before=monotonic())
+        self._accounts_changed.set()
+
+        return api
+
+    async def async_close(self) -> None:
+        """Remove every account from the pool and close the connection pool."""
+        for email in list(self._accounts):
+            await self.async_remove_account(email)
+
+        if self._connector:
+            await self._connector.close()
+            self._connector = None
+
+    async def async_refresh(self) -> dict[str, Tile]:
+        """Refresh every account now.
+
+        Returns:
+            A dictionary of Tile UUIDs to Tile objects across all accounts.
+        """
+        await asyncio.gather(
+            *(self._async_refresh_account(email) for email in self._accounts)
+        )
+        return self.tiles
+
+    async def async_remove_account(self, email: str) -> None:
+        """Remove an account from the pool.
+
+        Args:
+            email: The email address of the account.
+        """
+        if (task := self._refresh_tasks.pop(email, None)) is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+        api, session = self._accounts.pop(email)
+        self._phases.pop(email)
+        self._schedule = [entry for entry in self._schedule if entry[1] != email]
+        heapq.heapify(self._schedule)
+        self._tiles.pop(email, None)
+        await api.async_close()
+        await session.close()
+
+    async def async_run(self) -> None:
+        """Refresh every account once per polling interval until cancelled.
+
+        Each account is refreshed at its own offset within the interval, so that
+        refreshes are spread evenly over time. If an account's previous refresh is
+        still running when its next one is due, that refresh is skipped.
+        """
+        self._started_at = monotonic()
+        self._schedule = []
+        for email in self._accounts:
+            self._schedule_account(email, not_before=self._started_at)
+
+        try:
+            while True:
+                self._accounts_changed.clear()
+
+                timeout = None
+                if self._schedule:
+                    timeout = max(self._schedule[0][0] - monotonic(), 0)
+
+                if timeout != 0:
+                    with suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(self._accounts_changed.wait(), timeout)
+                    continue
+
+                due, email = heapq.heappop(self._schedule)
+                if (task := self._refresh_tasks.get(email)) is None or task.done():
+                    self._refresh_tasks[email] = asyncio.create_task(
+                        self._async_refresh_account(email)
+                    )
+                # Schedule the next cycle (the half-interval margin guards against
+                # floating-point drift):
+                self._schedule_account(email, not_before=due + self._poll_interval / 2)
+        finally:
+            self._started_at = None
+            for task in self._refresh_tasks.values():
+                task.cancel()
+            self._refresh_tasks = {}
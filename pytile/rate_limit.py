@@ -0,0 +1,168 @@
+"""Define a client-side rate limiter for API requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from dataclasses import dataclass
+from time import monotonic
+
+from .util import get_endpoint_template
+
+DEFAULT_RATE = 10.0
+
+ENDPOINT_CLASS_AUTH = "auth"
+ENDPOINT_CLASS_DETAILS = "details"
+ENDPOINT_CLASS_HISTORY = "history"
+ENDPOINT_CLASS_OTHER = "other"
+ENDPOINT_CLASS_STATES = "states"
+
+ENDPOINT_CLASSES = {
+    "clients/{uuid}": ENDPOINT_CLASS_AUTH,
+    "clients/{uuid}/sessions": ENDPOINT_CLASS_AUTH,
+    "tiles/location/history/{uuid}": ENDPOINT_CLASS_HISTORY,
+    "tiles/tile_states": ENDPOINT_CLASS_STATES,
+    "tiles/{uuid}": ENDPOINT_CLASS_DETAILS,
+}
+
+
+def get_endpoint_class(endpoint: str) -> str:
+    """Return the class of a relative API endpoint (e.g., "details").
+
+    Args:
+        endpoint: A relative API endpoint.
+
+    Returns:
+        The endpoint class.
+    """
+    return ENDPOINT_CLASSES.get(get_endpoint_template(endpoint), ENDPOINT_CLASS_OTHER)
+
+
+@dataclass
+class WaitStats:
+    """Define statistics on how long requests waited for the rate limiter."""
+
+    delayed: int = 0
+    max_wait: float = 0.0
+    requests: int = 0
+    total_wait: float = 0.0
+
+    def record(self, wait: float) -> None:
+        """Record a request.
+
+        Args:
+            wait: The number of seconds the request waited.
+        """
+        self.requests += 1
+        if wait > 0:
+            self.delayed += 1
+            self.max_wait = max(self.max_wait, wait)
+            self.total_wait += wait
+
+
+class TokenBucket:  # pylint: disable=too-few-public-methods
+    """Define a token bucket."""
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        """Initialize.
+
+        Args:
+            rate: The number of tokens added per second.
+            capacity: The maximum number of tokens (i.e., the burst size); defaults
+                to one second's worth of tokens.
+        """
+        self._capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._rate = rate
+        self._tokens = self._capacity
+        self._updated_at = monotonic()
+
+    async def async_acquire(self) -> float:
+        """Take a token, waiting for one to become available if necessary.
+
+        Tokens are reserved up front (the balance may go negative), so waiting
+        requests are served in the order they arrived.
+
+        Returns:
+            The number of seconds waited.
+
+        Raises:
+            CancelledError: Raised when the waiting request is cancelled.
+        """
+        now = monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated_at) * self._rate
+        )
+        self._updated_at = now
+        self._tokens -= 1
+
+        if self._tokens >= 0:
+            return 0.0
+
+        wait = -self._tokens / self._rate
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            # Give the reserved token back:
+            self._tokens += 1
+            raise
+        return wait
+
+
+class RateLimiter:  # pylint: disable=too-few-public-methods
+    """Define a rate limiter with a separate budget per endpoint class.
+
+    A single instance can be shared by many API objects to limit their aggregate
+    request rate.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        *,
+        burst: float | None = None,
+        endpoint_rates: Mapping[str, float] | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            rate: The default number of requests per second for each endpoint class.
+            burst: The number of requests that may be sent at once (defaults to one
+                second's worth).
+            endpoint_rates: Requests per second for specific endpoint classes ("auth",
+                "states", "details", "history", or "other").
+
+        Raises:
+            ValueError: Raised when a rate isn't positive or the burst is below one.
+        """
+        endpoint_rates = dict(endpoint_rates or {})
+        if rate <= 0 or any(value <= 0 for value in endpoint_rates.values()):
+            raise ValueError("Rates must be positive")
+        if burst is not None and burst < 1:
+            raise ValueError("The burst size must be at least one")
+
+        self._buckets: dict[str, TokenBucket] = {}
+        self._burst = burst
+        self._endpoint_rates = endpoint_rates
+        self._rate = rate
+        self.stats: dict[str, WaitStats] = {}
+
+    async def async_acquire(self, endpoint: str) -> float:
+        """Wait until a request to an endpoint may be sent.
+
+        Args:
+            endpoint: A relative API endpoint.
+
+        Returns:
+            The number of seconds waited.
+        """
+        endpoint_class = get_endpoint_class(endpoint)
+
+        if (bucket := self._buckets.get(endpoint_class)) is None:
+            bucket = self._buckets[endpoint_class] = TokenBucket(
+                self._endpoint_rates.get(endpoint_class, self._rate), self._burst
+            )
+            self.stats[endpoint_class] = WaitStats()
+
+        wait = await bucket.async_acquire()
+        self.stats[endpoint_class].record(wait)
+        return wait
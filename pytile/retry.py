@@ -0,0 +1,200 @@
+"""Define retry and circuit breaking policies for API requests."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import Collection
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from time import monotonic
+
+from aiohttp.client_exceptions import ClientConnectionError, ClientResponseError
+
+from .errors import CircuitOpenError
+
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_MAX_DELAY = 30.0
+DEFAULT_RECOVERY_TIME = 30.0
+DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+IDEMPOTENT_METHODS = frozenset({"delete", "get", "head", "options", "put"})
+
+CIRCUIT_STATE_CLOSED = "closed"
+CIRCUIT_STATE_HALF_OPEN = "half_open"
+CIRCUIT_STATE_OPEN = "open"
+
+
+def get_retry_after(err: BaseException) -> float | None:
+    """Return the number of seconds a Retry-After header asks to wait (if present).
+
+    Args:
+        err: An exception raised while making a request.
+
+    Returns:
+        The number of seconds to wait (if specified).
+    """
+    if not isinstance(err, ClientResponseError) or not err.headers:
+        return None
+    if (value := err.headers.get("Retry-After")) is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def is_transient_error(
+    err: BaseException, statuses: Collection[int] = DEFAULT_RETRY_STATUSES
+) -> bool:
+    """Return whether an error is likely to go away on its own.
+
+    Args:
+        err: An exception raised while making a request.
+        statuses: The HTTP statuses that are considered transient.
+
+    Returns:
+        Whether the error is transient.
+    """
+    if isinstance(err, ClientResponseError):
+        return err.status in statuses
+    return isinstance(err, (ClientConnectionError, asyncio.TimeoutError))
+
+
+@dataclass(frozen=True, kw_only=True)
+class RetryPolicy:
+    """Define a policy for retrying failed requests.
+
+    Attributes:
+        base_delay: The delay (in seconds) that exponential backoff starts from.
+        max_attempts: The maximum number of attempts (including the first one).
+        max_delay: The maximum delay (in seconds) between attempts; if the API asks
+            for a longer delay via Retry-After, the request isn't retried.
+        methods: The HTTP methods that may be retried.
+        statuses: The HTTP statuses that may be retried.
+    """
+
+    base_delay: float = DEFAULT_BASE_DELAY
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    max_delay: float = DEFAULT_MAX_DELAY
+    methods: Collection[str] = IDEMPOTENT_METHODS
+    statuses: Collection[int] = DEFAULT_RETRY_STATUSES
+
+    def __post_init__(self) -> None:
+        """Normalize the retryable methods and statuses."""
+        object.__setattr__(
+            self, "methods", frozenset(method.lower() for method in self.methods)
+        )
+        object.__setattr__(self, "statuses", frozenset(self.statuses))
+
+    def get_retry_delay(
+        self, method: str, err: BaseException, attempt: int
+    ) -> float | None:
+        """Return how long to wait before retrying a failed request.
+
+        Delays grow exponentially with "full jitter" (a random delay between zero and
+        the exponential backoff), unless the API asks for a specific delay.
+
+        Args:
+            method: The HTTP method of the request.
+            err: The exception raised by the failed attempt.
+            attempt: The number of the failed attempt (starting at 1).
+
+        Returns:
+            The delay in seconds (or None if the request shouldn't be retried).
+        """
+        if (
+            attempt >= self.max_attempts
+            or method.lower() not in self.methods
+            or not is_transient_error(err, self.statuses)
+        ):
+            return None
+
+        if (retry_after := get_retry_after(err)) is not None:
+            return retry_after if retry_after <= self.max_delay else None
+
+        return random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+
+
+class CircuitBreaker:
+    """Define a circuit breaker that fails fast while the API is down.
+
+    After a number of consecutive transient failures, the circuit "opens" and requests
+    fail immediately. Once the recovery time has passed, the circuit is "half open":
+    requests are let through again, the first success closes the circuit, and the
+    first failure opens it again.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        recovery_time: float = DEFAULT_RECOVERY_TIME,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            failure_threshold: The number of consecutive failures that open the
+                circuit.
+            recovery_time: The number of seconds to wait before letting requests
+                through again.
+        """
+        self._failure_count = 0
+        self._failure_threshold = failure_threshold
+        self._opened_at: float | None = None
+        self._recovery_time = recovery_time
+
+    @property
+    def state(self) -> str:
+        """Return the state of the circuit.
+
+        Returns:
+            The state ("closed", "open", or "half_open").
+        """
+        if self._opened_at is None:
+            return CIRCUIT_STATE_CLOSED
+        if monotonic() - self._opened_at < self._recovery_time:
+            return CIRCUIT_STATE_OPEN
+        return CIRCUIT_STATE_HALF_OPEN
+
+    def before_request(self, endpoint: str) -> None:
+        """Check whether a request may be sent.
+
+        Args:
+            endpoint: A relative API endpoint.
+
+        Raises:
+            CircuitOpenError: Raised when the circuit is open.
+        """
+        if self.state == CIRCUIT_STATE_OPEN:
+            raise CircuitOpenError(
+                f"Not requesting data from {endpoint}: the Tile API appears to be down"
+            )
+
+    def record_failure(self) -> None:
+        """Record a transient failure."""
+        self._failure_count += 1
+        if (
+            self.state == CIRCUIT_STATE_HALF_OPEN
+            or self._failure_count >= self._failure_threshold
+        ):
+            self._opened_at = monotonic()
+
+    def record_success(self) -> None:
+        """Record a request that reached a healthy API."""
+        self._failure_count = 0
+        self._opened_at = None
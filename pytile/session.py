@@ -0,0 +1,153 @@
+"""Define persistable Tile session state."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Protocol, TypedDict, cast
+
+
+class SessionState(TypedDict):
+    """Define the state needed to resume a Tile session without logging in."""
+
+    client_established: bool
+    client_uuid: str
+    cookies: dict[str, str]
+    session_expiry: int
+    user_uuid: str | None
+
+
+class SessionStore(Protocol):
+    """Define the interface of a session state store."""
+
+    async def async_load(self, email: str) -> SessionState | None:
+        """Load the session state for an account.
+
+        Args:
+            email: The email address of the account.
+
+        Returns:
+            The session state (if it exists).
+        """
+
+    async def async_save(self, email: str, state: SessionState) -> None:
+        """Save the session state for an account.
+
+        Args:
+            email: The email address of the account.
+            state: The session state.
+        """
+
+
+class MemorySessionStore:
+    """Define a session state store that lives in memory."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._states: dict[str, SessionState] = {}
+
+    async def async_load(self, email: str) -> SessionState | None:
+        """Load the session state for an account.
+
+        Args:
+            email: The email address of the account.
+
+        Returns:
+            The session state (if it exists).
+        """
+        return self._states.get(email)
+
+    async def async_save(self, email: str, state: SessionState) -> None:
+        """Save the session state for an account.
+
+        Args:
+            email: The email address of the account.
+            state: The session state.
+        """
+        self._states[email] = state
+
+
+class JSONFileSessionStore:
+    """Define a session state store that keeps one JSON file per account."""
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        """Initialize.
+
+        Args:
+            directory: The directory to store session files in.
+        """
+        self._directory = Path(directory)
+
+    def _get_path(self, email: str) -> Path:
+        """Return the path of an account's session file.
+
+        Args:
+            email: The email address of the account.
+
+        Returns:
+            The file path.
+        """
+        digest = hashlib.sha256(email.encode()).hexdigest()
+        return self._directory / f"{digest}.json"
+
+    def _load(self, email: str) -> SessionState | None:
+        """Load the session state for an account (blocking).
+
+        Args:
+            email: The email address of the account.
+
+        Returns:
+            The session state (if it exists).
+        """
+        try:
+            with open(self._get_path(email), encoding="utf-8") as fptr:
+                return cast(SessionState, json.load(fptr))
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, email: str, state: SessionState) -> None:
+        """Save the session state for an account (blocking).
+
+        Args:
+            email: The email address of the account.
+            state: The session state.
+        """
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path = self._get_path(email)
+        # Session files hold credentials, so they are only readable by their owner;
+        # mkstemp creates the file with mode 0600 under a unique name, so concurrent
+        # saves don't clobber each other's temporary files:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self._directory, prefix=f"{path.stem}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fptr:
+                json.dump(state, fptr)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    async def async_load(self, email: str) -> SessionState | None:
+        """Load the session state for an account.
+
+        Args:
+            email: The email address of the account.
+
+        Returns:
+            The session state (if it exists).
+        """
+        return await asyncio.to_thread(self._load, email)
+
+    async def async_save(self, email: str, state: SessionState) -> None:
+        """Save the session state for an account.
+
+        Args:
+            email: The email address of the account.
+            state: The session state.
+        """
+        await asyncio.to_thread(self._save, email, state)
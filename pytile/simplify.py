@@ -0,0 +1,372 @@
+"""Define track simplification and downsampling for location history."""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Sequence,
+)
+from datetime import timedelta
+from enum import Enum
+from typing import Any
+
+from .geo import EARTH_RADIUS_METERS
+from .history import (
+    HISTORY_ACCURACY_KEY,
+    HISTORY_LATITUDE_KEY,
+    HISTORY_LONGITUDE_KEY,
+    get_update_timestamp,
+)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+METERS_PER_DEGREE = math.radians(1) * EARTH_RADIUS_METERS
+
+
+class SimplificationMethod(str, Enum):
+    """Define the track simplification algorithms."""
+
+    DOUGLAS_PEUCKER = "douglas_peucker"
+    VISVALINGAM = "visvalingam"
+
+
+def _project(updates: Sequence[dict[str, Any]]) -> list[tuple[float, float]]:
+    """Project location updates onto a flat plane (in meters) around the first one.
+
+    Args:
+        updates: Location updates.
+
+    Returns:
+        A list of (x, y) tuples.
+    """
+    origin_latitude = updates[0][HISTORY_LATITUDE_KEY]
+    origin_longitude = updates[0][HISTORY_LONGITUDE_KEY]
+    x_scale = METERS_PER_DEGREE * math.cos(math.radians(origin_latitude))
+    return [
+        (
+            (update[HISTORY_LONGITUDE_KEY] - origin_longitude) * x_scale,
+            (update[HISTORY_LATITUDE_KEY] - origin_latitude) * METERS_PER_DEGREE,
+        )
+        for update in updates
+    ]
+
+
+def _get_farthest_point(
+    points: Sequence[tuple[float, float]], start: int, end: int
+) -> tuple[float, int]:
+    """Return the point between two others that is farthest from the line through them.
+
+    Args:
+        points: Projected (x, y) points.
+        start: The index of the first point.
+        end: The index of the last point.
+
+    Returns:
+        A (distance in meters, index) tuple (the distance is -1 if there are no
+        points in between).
+    """
+    x1, y1 = points[start]
+    dx = points[end][0] - x1
+    dy = points[end][1] - y1
+    length = math.hypot(dx, dy)
+
+    max_distance = -1.0
+    max_index = start
+    for index in range(start + 1, end):
+        x, y = points[index]
+        if length:
+            distance = abs(dy * (x - x1) - dx * (y - y1)) / length
+        else:
+            distance = math.hypot(x - x1, y - y1)
+        if distance > max_distance:
+            max_distance = distance
+            max_index = index
+
+    return max_distance, max_index
+
+
+def _douglas_peucker(
+    points: Sequence[tuple[float, float]], tolerance: float
+) -> list[int]:
+    """Return the indices of the points that Douglas-Peucker keeps.
+
+    Args:
+        points: Projected (x, y) points.
+        tolerance: The maximum distance (in meters) from a removed point to the
+            simplified track.
+
+    Returns:
+        A sorted list of indices.
+    """
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        max_distance, max_index = _get_farthest_point(points, start, end)
+        if max_distance > tolerance:
+            keep[max_index] = True
+            stack.append((start, max_index))
+            stack.append((max_index, end))
+
+    return [index for index, kept in enumerate(keep) if kept]
+
+
+def _visvalingam(points: Sequence[tuple[float, float]], tolerance: float) -> list[int]:
+    """Return the indices of the points that Visvalingam-Whyatt keeps.
+
+    Args:
+        points: Projected (x, y) points.
+        tolerance: The distance (in meters) whose square is the minimum effective
+            area (in square meters) of a kept point.
+
+    Returns:
+        A sorted list of indices.
+    """
+    min_area = tolerance * tolerance
+    previous = list(range(-1, len(points) - 1))
+    following = list(range(1, len(points) + 1))
+    removed = [False] * len(points)
+
+    def get_area(index: int) -> float:
+        """Return the area of the triangle a point forms with its neighbors.
+
+        Args:
+            index: The index of the point.
+
+        Returns:
+            The area in square meters.
+        """
+        (x1, y1), (x2, y2), (x3, y3) = (
+            points[previous[index]],
+            points[index],
+            points[following[index]],
+        )
+        return abs((x2 - x1) * (y3 - y1) - (x3 - x1) * (y2 - y1)) / 2
+
+    heap = [(get_area(index), index) for index in range(1, len(points) - 1)]
+    heapq.heapify(heap)
+    areas = {index: area for area, index in heap}
+
+    while heap:
+        area, index = heapq.heappop(heap)
+        if removed[index] or area != areas[index]:
+            # A stale entry (the point was removed or its area changed):
+            continue
+        if area >= min_area:
+            break
+
+        removed[index] = True
+        before, after = previous[index], following[index]
+        following[before] = after
+        previous[after] = before
+
+        for neighbor in (before, after):
+            if 0 < neighbor < len(points) - 1:
+                # A neighbor's effective area never drops below that of the point
+                # that was just removed:
+                areas[neighbor] = max(get_area(neighbor), area)
+                heapq.heappush(heap, (areas[neighbor], neighbor))
+
+    return [index for index, was_removed in enumerate(removed) if not was_removed]
+
+
+SIMPLIFIERS: dict[
+    SimplificationMethod, Callable[[Sequence[tuple[float, float]], float], list[int]]
+] = {
+    SimplificationMethod.DOUGLAS_PEUCKER: _douglas_peucker,
+    SimplificationMethod.VISVALINGAM: _visvalingam,
+}
+
+
+def simplify(
+    updates: Sequence[dict[str, Any]],
+    tolerance: float,
+    *,
+    method: SimplificationMethod = SimplificationMethod.DOUGLAS_PEUCKER,
+) -> list[dict[str, Any]]:
+    """Simplify a track.
+
+    Douglas-Peucker removes updates that are less than tolerance meters from the
+    simplified track; Visvalingam-Whyatt removes updates whose effective area (that
+    of the triangle they form with their neighbors) is less than tolerance squared.
+
+    Args:
+        updates: Location updates (all of which must have a location).
+        tolerance: The simplification tolerance (in meters).
+        method: The simplification algorithm.
+
+    Returns:
+        The location updates that were kept (including the first and last ones).
+    """
+    if len(updates) < 3:
+        return list(updates)
+    indices = SIMPLIFIERS[SimplificationMethod(method)](_project(updates), tolerance)
+    return [updates[index] for index in indices]
+
+
+class TrackReducer:
+    """Define a streaming reducer of location updates.
+
+    Updates are pushed one at a time (in time order); each step is optional:
+
+    1. Updates whose accuracy is worse than max_accuracy (in meters) are dropped.
+    2. Only the first update in each interval-long time bucket is kept.
+    3. The track is simplified (see simplify) up to chunk_size updates at a time;
+       consecutive chunks overlap, so the track stays connected.
+
+    At most a single chunk of updates is held in memory at any time.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_accuracy: float | None = None,
+        interval: timedelta | None = None,
+        tolerance: float | None = None,
+        method: SimplificationMethod = SimplificationMethod.DOUGLAS_PEUCKER,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            max_accuracy: The worst accuracy (in meters) of a kept update.
+            interval: The length of a downsampling time bucket.
+            tolerance: The simplification tolerance (in meters).
+            method: The simplification algorithm.
+            chunk_size: The number of updates to simplify at once.
+
+        Raises:
+            ValueError: Raised when the chunk size is less than three.
+        """
+        if chunk_size < 3:
+            raise ValueError("The chunk size must be at least three")
+
+        self._chunk: list[dict[str, Any]] = []
+        self._chunk_size = chunk_size
+        self._interval_ms = (
+            None if interval is None else round(interval.total_seconds() * 1000)
+        )
+        self._last_bucket: int | None = None
+        self._max_accuracy = max_accuracy
+        self._simplify = SIMPLIFIERS[SimplificationMethod(method)]
+        self._tolerance = tolerance
+
+    def _simplify_chunk(self, tolerance: float) -> list[dict[str, Any]]:
+        """Simplify the current chunk and start the next one.
+
+        The next chunk starts at the second-to-last kept update (so that the tail of
+        this chunk is simplified again along with what follows), unless that would
+        carry over more than half a chunk; then it starts at the last update.
+
+        Args:
+            tolerance: The simplification tolerance (in meters).
+
+        Returns:
+            The updates that are final.
+        """
+        chunk = self._chunk
+        indices = self._simplify(_project(chunk), tolerance)
+        cut = indices[-1]
+        if len(indices) > 2 and len(chunk) - indices[-2] <= self._chunk_size // 2:
+            cut = indices[-2]
+        self._chunk = chunk[cut:]
+        return [chunk[index] for index in indices if index < cut]
+
+    def flush(self) -> list[dict[str, Any]]:
+        """Return the remaining updates at the end of a track.
+
+        Returns:
+            The kept updates.
+        """
+        if self._tolerance is None or len(self._chunk) < 3:
+            kept = self._chunk
+        else:
+            kept = [
+                self._chunk[index]
+                for index in self._simplify(_project(self._chunk), self._tolerance)
+            ]
+        self._chunk = []
+        return kept
+
+    def push(self, update: dict[str, Any]) -> list[dict[str, Any]]:
+        """Add the next location update.
+
+        Args:
+            update: A location update.
+
+        Returns:
+            The updates that are now known to be kept.
+        """
+        # Updates with an unknown accuracy (a missing or null one) are dropped, too:
+        if self._max_accuracy is not None and not (
+            (accuracy := update.get(HISTORY_ACCURACY_KEY)) is not None
+            and accuracy <= self._max_accuracy
+        ):
+            return []
+
+        if self._interval_ms is not None:
+            bucket = get_update_timestamp(update) // self._interval_ms
+            if bucket == self._last_bucket:
+                return []
+            self._last_bucket = bucket
+
+        if (tolerance := self._tolerance) is None:
+            return [update]
+
+        # Updates without a location can't be placed on the track:
+        if (
+            update.get(HISTORY_LATITUDE_KEY) is None
+            or update.get(HISTORY_LONGITUDE_KEY) is None
+        ):
+            return []
+
+        self._chunk.append(update)
+        if len(self._chunk) < self._chunk_size:
+            return []
+        return self._simplify_chunk(tolerance)
+
+
+def reduce_track(
+    updates: Iterable[dict[str, Any]], **kwargs: Any
+) -> Iterator[dict[str, Any]]:
+    """Reduce a stream of location updates.
+
+    Args:
+        updates: Location updates (in time order).
+        **kwargs: Arguments for TrackReducer.
+
+    Yields:
+        The kept updates.
+    """
+    reducer = TrackReducer(**kwargs)
+    for update in updates:
+        yield from reducer.push(update)
+    yield from reducer.flush()
+
+
+async def async_reduce_track(
+    updates: AsyncIterable[dict[str, Any]], **kwargs: Any
+) -> AsyncIterator[dict[str, Any]]:
+    """Reduce an asynchronous stream of location updates (e.g., from a Tile's history).
+
+    Args:
+        updates: Location updates (in time order).
+        **kwargs: Arguments for TrackReducer.
+
+    Yields:
+        The kept updates.
+    """
+    reducer = TrackReducer(**kwargs)
+    async for update in updates:
+        for kept in reducer.push(update):
+            yield kept
+    for kept in reducer.flush():
+        yield kept
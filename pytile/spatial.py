@@ -0,0 +1,380 @@
+"""Define an in-memory spatial index of Tiles."""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections.abc import Iterable, Iterator, Mapping
+
+from .events import TileEvent, TileEventType
+from .geo import EARTH_RADIUS_METERS, get_grid_cell, haversine
+from .tile import Tile
+
+DEFAULT_CELL_SIZE = 0.01
+
+Cell = tuple[int, int]
+
+
+def _get_radius_bbox(
+    latitude: float, longitude: float, radius: float
+) -> tuple[float, float, float, float]:
+    """Return the smallest bounding box that contains a circle.
+
+    The box is padded slightly, so that rounding errors can't exclude a point right
+    on the circle.
+
+    Args:
+        latitude: The latitude of the circle's center.
+        longitude: The longitude of the circle's center.
+        radius: The radius of the circle in meters.
+
+    Returns:
+        A (south, west, north, east) tuple (west and east may extend past the
+        antimeridian).
+    """
+    angular_radius = radius / EARTH_RADIUS_METERS * (1 + 1e-9)
+    latitude_delta = math.degrees(angular_radius)
+    south = latitude - latitude_delta
+    north = latitude + latitude_delta
+    if south <= -90 or north >= 90 or angular_radius >= math.pi / 2:
+        return south, -180.0, north, 180.0
+
+    longitude_delta = math.degrees(
+        math.asin(min(1.0, math.sin(angular_radius) / math.cos(math.radians(latitude))))
+    )
+    return south, longitude - longitude_delta, north, longitude + longitude_delta
+
+
+class TileIndex:
+    """Define a grid-based spatial index of Tiles.
+
+    The world is divided into cells of cell_size degrees; each query only looks at
+    the cells that can contain a match. Tiles without a known location are tracked
+    but never returned by queries.
+
+    Tiles are indexed at the position they had when they were last added or when
+    they last changed (see handle_event). Since moves shorter than a Tile's
+    move_threshold don't produce events, the indexed position can lag behind by up to
+    that distance until the next call to add or update_tiles.
+    """
+
+    def __init__(self, *, cell_size: float = DEFAULT_CELL_SIZE) -> None:
+        """Initialize.
+
+        Args:
+            cell_size: The size (in degrees) of a grid cell.
+
+        Raises:
+            ValueError: Raised when the cell size is invalid.
+        """
+        if not 0 < cell_size <= 180:
+            raise ValueError("The cell size must be between 0 and 180 degrees")
+
+        self._cell_size = cell_size
+        self._cells: dict[Cell, set[str]] = {}
+        self._column_count = math.ceil(360 / cell_size)
+        self._positions: dict[str, tuple[float, float, Cell]] = {}
+        self._row_count = math.ceil(180 / cell_size)
+        self._tiles: dict[str, Tile] = {}
+
+    def __contains__(self, tile_uuid: object) -> bool:
+        """Return whether a Tile is in the index.
+
+        Args:
+            tile_uuid: The UUID of a Tile.
+
+        Returns:
+            Whether the Tile is in the index.
+        """
+        return tile_uuid in self._tiles
+
+    def __len__(self) -> int:
+        """Return the number of Tiles in the index.
+
+        Returns:
+            The number of Tiles.
+        """
+        return len(self._tiles)
+
+    def _get_cell(self, latitude: float, longitude: float) -> Cell:
+        """Return the cell that contains a point.
+
+        Args:
+            latitude: A latitude.
+            longitude: A longitude.
+
+        Returns:
+            A (row, column) cell.
+        """
+        row, column = get_grid_cell(latitude, longitude, self._cell_size)
+        return min(row, self._row_count - 1), column % self._column_count
+
+    def _get_columns(self, west: float, east: float) -> Iterable[int]:
+        """Return the cell columns that cover a range of longitudes.
+
+        Args:
+            west: The western edge of the range (may be less than -180).
+            east: The eastern edge of the range (may be more than 180).
+
+        Returns:
+            Cell columns.
+        """
+        first = get_grid_cell(0, west, self._cell_size)[1]
+        last = get_grid_cell(0, east, self._cell_size)[1]
+        if last - first + 1 >= self._column_count:
+            return range(self._column_count)
+        return (column % self._column_count for column in range(first, last + 1))
+
+    def _get_rows(self, south: float, north: float) -> range:
+        """Return the cell rows that cover a range of latitudes.
+
+        Args:
+            south: The southern edge of the range.
+            north: The northern edge of the range.
+
+        Returns:
+            Cell rows.
+        """
+        return range(
+            self._get_cell(max(south, -90), 0)[0],
+            self._get_cell(min(north, 90), 0)[0] + 1,
+        )
+
+    def _iter_ring_cells(self, row: int, column: int, ring: int) -> Iterator[Cell]:
+        """Yield the cells in a square ring around a cell.
+
+        Args:
+            row: The row of the center cell.
+            column: The column of the center cell.
+            ring: The distance (in cells) of the ring from the center cell.
+
+        Yields:
+            Cells (which repeat if the ring wraps around the antimeridian).
+        """
+        for cell_row in range(
+            max(row - ring, 0), min(row + ring, self._row_count - 1) + 1
+        ):
+            step = 1 if cell_row in (row - ring, row + ring) else 2 * ring or 1
+            for cell_column in range(column - ring, column + ring + 1, step):
+                yield cell_row, cell_column % self._column_count
+
+    def _iter_tile_uuids(
+        self, rows: range, columns: Iterable[int]
+    ) -> Iterator[tuple[str, float, float]]:
+        """Yield the Tiles in a block of cells.
+
+        If the block has more cells than there are non-empty cells, the non-empty
+        cells are filtered instead.
+
+        Args:
+            rows: Cell rows.
+            columns: Cell columns.
+
+        Yields:
+            (Tile UUID, latitude, longitude) tuples.
+        """
+        columns = list(columns)
+        if len(rows) * len(columns) > len(self._cells):
+            column_set = set(columns)
+            cells: Iterable[Cell] = [
+                cell
+                for cell in self._cells
+                if cell[0] in rows and cell[1] in column_set
+            ]
+        else:
+            cells = [(row, column) for row in rows for column in columns]
+
+        for cell in cells:
+            for tile_uuid in self._cells.get(cell, ()):
+                latitude, longitude, _ = self._positions[tile_uuid]
+                yield tile_uuid, latitude, longitude
+
+    def _move(
+        self, tile_uuid: str, latitude: float | None, longitude: float | None
+    ) -> None:
+        """Move a Tile to a new position in the grid.
+
+        Args:
+            tile_uuid: The UUID of the Tile.
+            latitude: The new latitude (if known).
+            longitude: The new longitude (if known).
+        """
+        if (position := self._positions.pop(tile_uuid, None)) is not None:
+            cell = position[2]
+            self._cells[cell].discard(tile_uuid)
+            if not self._cells[cell]:
+                del self._cells[cell]
+
+        if latitude is None or longitude is None:
+            return
+
+        cell = self._get_cell(latitude, longitude)
+        self._cells.setdefault(cell, set()).add(tile_uuid)
+        self._positions[tile_uuid] = (latitude, longitude, cell)
+
+    def add(self, tile: Tile) -> None:
+        """Add a Tile to the index (or re-index it at its current location).
+
+        Args:
+            tile: A Tile.
+        """
+        self._tiles[tile.uuid] = tile
+        self._move(tile.uuid, tile.latitude, tile.longitude)
+
+    def handle_event(self, event: TileEvent) -> None:
+        """Re-index a Tile when it changes.
+
+        Meant to be registered as a Tile event listener. Any change event re-indexes
+        the Tile, so that drift below its move_threshold is picked up as well.
+
+        Args:
+            event: A Tile change event.
+        """
+        if (tile := self._tiles.get(event.tile_uuid)) is None:
+            return
+
+        if event.event_type == TileEventType.MOVED:
+            self._move(tile.uuid, *event.new_value)
+        else:
+            self._move(tile.uuid, tile.latitude, tile.longitude)
+
+    def _get_nearby_distances(
+        self, latitude: float, longitude: float, count: int
+    ) -> list[float]:
+        """Return the distances to at least count Tiles, searching nearby cells first.
+
+        Args:
+            latitude: The latitude of the point.
+            longitude: The longitude of the point.
+            count: The number of Tiles to find.
+
+        Returns:
+            The distances (in meters) to the Tiles that were seen.
+        """
+        # Search rings of cells around the point until enough Tiles have been seen:
+        row, column = self._get_cell(latitude, longitude)
+        distances: list[float] = []
+        searched: set[Cell] = set()
+        ring = 0
+        while len(distances) < count:
+            if len(searched) > len(self._cells) or ring > max(
+                self._row_count, self._column_count
+            ):
+                # It's cheaper to look at every Tile:
+                return [
+                    haversine(latitude, longitude, tile_latitude, tile_longitude)
+                    for tile_latitude, tile_longitude, _ in self._positions.values()
+                ]
+
+            for cell in self._iter_ring_cells(row, column, ring):
+                # Wide rings wrap around the antimeridian onto themselves:
+                if cell in searched:
+                    continue
+                searched.add(cell)
+                for tile_uuid in self._cells.get(cell, ()):
+                    tile_latitude, tile_longitude, _ = self._positions[tile_uuid]
+                    distances.append(
+                        haversine(latitude, longitude, tile_latitude, tile_longitude)
+                    )
+            ring += 1
+
+        return distances
+
+    def nearest(
+        self, latitude: float, longitude: float, count: int = 1
+    ) -> list[tuple[Tile, float]]:
+        """Return the Tiles nearest to a point.
+
+        Args:
+            latitude: The latitude of the point.
+            longitude: The longitude of the point.
+            count: The number of Tiles to return.
+
+        Returns:
+            A list of (Tile, distance in meters) tuples, nearest first.
+        """
+        if count < 1 or not self._positions:
+            return []
+
+        # The Tiles seen so far bound the search radius; anything nearer than the
+        # count-th of them is within that radius:
+        distances = self._get_nearby_distances(latitude, longitude, count)
+        radius = heapq.nsmallest(count, distances)[-1]
+        return self.within_radius(latitude, longitude, radius)[:count]
+
+    def remove(self, tile_uuid: str) -> None:
+        """Remove a Tile from the index.
+
+        Args:
+            tile_uuid: The UUID of the Tile.
+        """
+        self._move(tile_uuid, None, None)
+        self._tiles.pop(tile_uuid, None)
+
+    def update_tiles(self, tiles: Mapping[str, Tile]) -> None:
+        """Make the index match a set of Tiles (e.g., from API.async_get_tiles).
+
+        Args:
+            tiles: A dictionary of Tile UUIDs to Tile objects.
+        """
+        for tile_uuid in set(self._tiles) - set(tiles):
+            self.remove(tile_uuid)
+        for tile in tiles.values():
+            self.add(tile)
+
+    def within_bbox(
+        self, south: float, west: float, north: float, east: float
+    ) -> list[Tile]:
+        """Return the Tiles within a bounding box.
+
+        Args:
+            south: The southern edge of the box.
+            west: The western edge of the box.
+            north: The northern edge of the box.
+            east: The eastern edge of the box (less than west if the box crosses the
+                antimeridian).
+
+        Returns:
+            A list of Tiles.
+        """
+        if east < west:
+            east += 360
+
+        tiles = []
+        for tile_uuid, tile_latitude, tile_longitude in self._iter_tile_uuids(
+            self._get_rows(south, north), self._get_columns(west, east)
+        ):
+            if tile_longitude < west:
+                tile_longitude += 360
+            if south <= tile_latitude <= north and west <= tile_longitude <= east:
+                tiles.append(self._tiles[tile_uuid])
+        return tiles
+
+    def within_radius(
+        self, latitude: float, longitude: float, radius: float
+    ) -> list[tuple[Tile, float]]:
+        """Return the Tiles within a distance of a point.
+
+        Args:
+            latitude: The latitude of the point.
+            longitude: The longitude of the point.
+            radius: The distance in meters.
+
+        Returns:
+            A list of (Tile, distance in meters) tuples, nearest first.
+        """
+        south, west, north, east = _get_radius_bbox(latitude, longitude, radius)
+
+        matches = []
+        for tile_uuid, tile_latitude, tile_longitude in self._iter_tile_uuids(
+            self._get_rows(south, north), self._get_columns(west, east)
+        ):
+            if (
+                distance := haversine(
+                    latitude, longitude, tile_latitude, tile_longitude
+                )
+            ) <= radius:
+                matches.append((self._tiles[tile_uuid], distance))
+
+        matches.sort(key=lambda match: match[1])
+        return matches
@@ -2,33 +2,144 @@
 
 from __future__ import annotations
 
-from collections.abc import Awaitable, Callable
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from enum import Enum
 from typing import Any, cast
 
 from .const import LOGGER
-
-
-class Tile:
-    """Define a Tile."""
-
-    def __init__(
+from .errors import TileError
+from .events import (
+    DEFAULT_MOVE_THRESHOLD,
+    TileEvent,
+    TileEventListener,
+    compute_tile_events,
+    get_tile_snapshot,
+)
+from .history import datetime_to_ms
+from .history_store import HistoryStore
+
+
+def _get_path(data: dict[str, Any], path: str) -> Any:
+    """Return the value at a dotted path in a nested dictionary.
+
+    Args:
+        data: A nested dictionary.
+        path: A dotted path (e.g., "last_tile_state.battery_level").
+
+    Returns:
+        The value (None if any part of the path is missing).
+    """
+    value: Any = data
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+class TileUpdateStatus(str, Enum):
+    """Define the outcomes of updating a Tile."""
+
+    ERROR = "error"
+    LABEL = "label"
+    UNCHANGED = "unchanged"
+    UPDATED = "updated"
+
+
+@dataclass(frozen=True)
+class TileUpdateResult:
+    """Define the outcome of updating a single Tile."""
+
+    tile: Tile
+    status: TileUpdateStatus
+    error: Exception | None = None
+
+
+class Tile:  # pylint: disable=too-many-instance-attributes
+    """Define a Tile.
+
+    The Tile's payload is parsed once (on creation and on every update) into slotted
+    attributes. In compact mode, the raw payload is then dropped; any other fields
+    that are needed can be kept by listing them in extra_fields.
+
+    Attributes:
+        event_listeners: Callables that receive this Tile's change events (see
+            pytile.events.add_event_listener).
+        extra: A dictionary of the dotted paths in extra_fields to their values (None
+            if missing).
+        move_threshold: The distance (in meters) the Tile has to move for a "moved"
+            event to be emitted.
+        raw_data: The raw payload of the last update (None in compact mode).
+    """
+
+    __slots__ = (
+        "_accuracy",
+        "_altitude",
+        "_archetype",
+        "_async_request",
+        "_compact",
+        "_dead",
+        "_extra_fields",
+        "_firmware_version",
+        "_hardware_version",
+        "_history_store",
+        "_kind",
+        "_last_timestamp",
+        "_latitude",
+        "_longitude",
+        "_lost",
+        "_lost_timestamp",
+        "_name",
+        "_ring_state",
+        "_shared_event_listeners",
+        "_uuid",
+        "_visible",
+        "_voip_state",
+        "event_listeners",
+        "extra",
+        "move_threshold",
+        "raw_data",
+    )
+
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         async_request: Callable[..., Awaitable[dict[str, Any]]],
         tile_data: dict[str, Any],
+        *,
+        shared_event_listeners: list[TileEventListener] | None = None,
+        move_threshold: float = DEFAULT_MOVE_THRESHOLD,
+        compact: bool = False,
+        extra_fields: Iterable[str] = (),
+        history_store: HistoryStore | None = None,
     ) -> None:
         """Initialize.
 
         Args:
             async_request: The request method from the Client object.
             tile_data: A dictionary of Tile data.
+            shared_event_listeners: An optional list of event listeners shared with
+                other Tiles (e.g., every Tile from the same API object).
+            move_threshold: The distance (in meters) the Tile has to move for a
+                "moved" event to be emitted.
+            compact: Whether to drop the raw payload after parsing it.
+            extra_fields: Dotted paths (relative to the payload's "result" key, e.g.,
+                "last_tile_state.battery_level") of additional fields to keep.
+            history_store: An optional local store of location history.
         """
         self._async_request = async_request
-        self._tile_data = tile_data
+        self._compact = compact
+        self._extra_fields = tuple(extra_fields)
+        self._history_store = history_store
+        self._shared_event_listeners = shared_event_listeners
+        self.event_listeners: list[TileEventListener] = []
+        self.extra: dict[str, Any] = {}
+        self.move_threshold = move_threshold
+        self.raw_data: dict[str, Any] | None = None
 
-        self._last_timestamp: datetime | None = None
-        self._lost_timestamp: datetime | None = None
-        self._save_timestamps(tile_data)
+        self._parse(tile_data)
 
     def __str__(self) -> str:
         """Return the string representation of the Tile.
@@ -45,9 +156,7 @@ class Tile:
         Returns:
             The accuracy (if it exists).
         """
-        if (last_state := self._tile_data["result"].get("last_tile_state")) is None:
-            return None
-        return cast(float, last_state["h_accuracy"])
+        return self._accuracy
 
     @property
     def altitude(self) -> float | None:
@@ -56,9 +165,7 @@ class Tile:
         Returns:
             The altitude (if it exists).
         """
-        if (last_state := self._tile_data["result"].get("last_tile_state")) is None:
-            return None
-        return cast(float, last_state["altitude"])
+        return self._altitude
 
     @property
     def archetype(self) -> str:
@@ -67,7 +174,7 @@ class Tile:
         Returns:
             The archetype.
         """
-        return cast(str, self._tile_data["result"]["archetype"])
+        return self._archetype
 
     @property
     def dead(self) -> bool:
@@ -76,7 +183,7 @@ class Tile:
         Returns:
             The dead status.
         """
-        return cast(bool, self._tile_data["result"]["is_dead"])
+        return self._dead
 
     @property
     def firmware_version(self) -> str:
@@ -85,7 +192,7 @@ class Tile:
         Returns:
             The firmware version.
         """
-        return cast(str, self._tile_data["result"]["firmware_version"])
+        return self._firmware_version
 
     @property
     def hardware_version(self) -> str:
@@ -94,7 +201,7 @@ class Tile:
         Returns:
             The hardware version.
         """
-        return cast(str, self._tile_data["result"]["hw_version"])
+        return self._hardware_version
 
     @property
     def kind(self) -> str:
@@ -103,7 +210,7 @@ class Tile:
         Returns:
             The type.
         """
-        return cast(str, self._tile_data["result"]["tile_type"])
+        return self._kind
 
     @property
     def last_timestamp(self) -> datetime | None:
@@ -121,9 +228,7 @@ class Tile:
         Returns:
             The latitude (if it exists).
         """
-        if (last_state := self._tile_data["result"].get("last_tile_state")) is None:
-            return None
-        return cast(float, last_state["latitude"])
+        return self._latitude
 
     @property
     def longitude(self) -> float | None:
@@ -132,9 +237,7 @@ class Tile:
         Returns:
             The longitude (if it exists).
         """
-        if (last_state := self._tile_data["result"].get("last_tile_state")) is None:
-            return None
-        return cast(float, last_state["longitude"])
+        return self._longitude
 
     @property
     def lost(self) -> bool:
@@ -146,9 +249,7 @@ class Tile:
         Returns:
             The lost status.
         """
-        if (last_state := self._tile_data["result"].get("last_tile_state")) is None:
-            return True
-        return cast(bool, last_state["is_lost"])
+        return self._lost
 
     @property
     def lost_timestamp(self) -> datetime | None:
@@ -166,7 +267,7 @@ class Tile:
         Returns:
             The name.
         """
-        return cast(str, self._tile_data["result"]["name"])
+        return self._name
 
     @property
     def ring_state(self) -> str | None:
@@ -175,9 +276,7 @@ class Tile:
         Returns:
             The ring state (if it exists).
         """
-        if (last_state := self._tile_data["result"].get("last_tile_state")) is None:
-            return None
-        return cast(str, last_state["ring_state"])
+        return self._ring_state
 
     @property
     def uuid(self) -> str:
@@ -186,7 +285,7 @@ class Tile:
         Returns:
             The UUID.
         """
-        return cast(str, self._tile_data["result"]["tile_uuid"])
+        return self._uuid
 
     @property
     def visible(self) -> bool:
@@ -195,7 +294,7 @@ class Tile:
         Returns:
             The visibility.
         """
-        return cast(bool, self._tile_data["result"]["visible"])
+        return self._visible
 
     @property
     def voip_state(self) -> str | None:
@@ -204,22 +303,60 @@ class Tile:
         Returns:
             The VoIP state (if it exists).
         """
-        if (last_state := self._tile_data["result"].get("last_tile_state")) is None:
-            return None
-        return cast(str, last_state["voip_state"])
+        return self._voip_state
+
+    def _notify_event_listeners(self, events: list[TileEvent]) -> None:
+        """Pass change events to every listener.
+
+        Args:
+            events: A list of change events.
+        """
+        for listener in (*self.event_listeners, *(self._shared_event_listeners or ())):
+            for event in events:
+                try:
+                    listener(event)
+                except (TileError, asyncio.TimeoutError):
+                    LOGGER.exception("Error in Tile event listener %s", listener)
 
-    def _save_timestamps(self, tile_data: dict[str, Any]) -> None:
-        """Save UTC timestamps from a Tile data set.
+    def _parse(self, tile_data: dict[str, Any]) -> None:
+        """Parse a Tile data set into attributes.
 
         Args:
             tile_data: A dictionary of Tile data.
         """
-        if (last_state := tile_data["result"].get("last_tile_state")) is None:
+        result = tile_data["result"]
+
+        self._archetype = cast(str, result["archetype"])
+        self._dead = cast(bool, result["is_dead"])
+        self._firmware_version = cast(str, result["firmware_version"])
+        self._hardware_version = cast(str, result["hw_version"])
+        self._kind = cast(str, result["tile_type"])
+        self._name = cast(str, result["name"])
+        self._uuid = cast(str, result["tile_uuid"])
+        self._visible = cast(bool, result["visible"])
+        self.extra = {path: _get_path(result, path) for path in self._extra_fields}
+        self.raw_data = None if self._compact else tile_data
+
+        if (last_state := result.get("last_tile_state")) is None:
             LOGGER.warning("Missing last_tile_state; can't report location info")
+            self._accuracy = None
+            self._altitude = None
             self._last_timestamp = None
+            self._latitude = None
+            self._longitude = None
+            self._lost = True
             self._lost_timestamp = None
+            self._ring_state = None
+            self._voip_state = None
             return
 
+        self._accuracy = cast(float, last_state["h_accuracy"])
+        self._altitude = cast(float, last_state["altitude"])
+        self._latitude = cast(float, last_state["latitude"])
+        self._longitude = cast(float, last_state["longitude"])
+        self._lost = cast(bool, last_state["is_lost"])
+        self._ring_state = cast(str, last_state["ring_state"])
+        self._voip_state = cast(str, last_state["voip_state"])
         self._last_timestamp = datetime.fromtimestamp(
             last_state["timestamp"] / 1000, tz=timezone.utc
         ).replace(tzinfo=None)
@@ -258,21 +395,45 @@ class Tile:
     ) -> dict[str, Any]:
         """Get the latest measurements from the Tile.
 
+        If the Tile has a history store, only the parts of the time range that aren't
+        stored yet are requested, and the response is assembled from the store.
+
         Returns:
             A dictionary containing the requested history.
         """
+        if self._history_store is not None:
+            updates = await self._history_store.async_get_history(
+                self._async_request, self.uuid, start_datetime, end_datetime
+            )
+            return {"result": {"complete_history": "Y", "location_updates": updates}}
+
         return await self._async_request(
             "get",
             f"tiles/location/history/{self.uuid}",
             params={
                 "aggregation": "False",
-                "end_ts": round(end_datetime.timestamp() * 1000),
-                "start_ts": round(start_datetime.timestamp() * 1000),
+                "end_ts": datetime_to_ms(end_datetime),
+                "start_ts": datetime_to_ms(start_datetime),
             },
         )
 
     async def async_update(self) -> None:
         """Get the latest measurements from the Tile."""
-        data = await self._async_request("get", f"tiles/{self.uuid}")
-        self._save_timestamps(data)
-        self._tile_data = data
+        data = await self._async_request("get", f"tiles/{self.uuid}", use_cache=False)
+
+        # Only compute change events when somebody is listening for them:
+        old_snapshot = None
+        if self.event_listeners or self._shared_event_listeners:
+            old_snapshot = get_tile_snapshot(self)
+
+        self._parse(data)
+
+        if old_snapshot and (
+            events := compute_tile_events(
+                self.uuid,
+                old_snapshot,
+                get_tile_snapshot(self),
+                move_threshold=self.move_threshold,
+            )
+        ):
+            self._notify_event_listeners(events)
@@ -0,0 +1,187 @@
+"""Define request instrumentation hooks and a latency aggregator."""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+
+# The upper bounds (in seconds) of the latency histogram buckets:
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+@dataclass(frozen=True)
+class RequestTrace:  # pylint: disable=too-many-instance-attributes
+    """Define the timings and outcome of a single API request.
+
+    Times are in seconds; duration covers the whole request (including time spent
+    queued, retry delays, and decoding).
+    """
+
+    method: str
+    endpoint: str
+    status: int | None
+    duration: float
+    queued: float = 0.0
+    wire: float = 0.0
+    decoding: float = 0.0
+    response_bytes: int = 0
+    retries: int = 0
+    cache_hit: bool = False
+    error: BaseException | None = None
+
+
+RequestHook = Callable[[RequestTrace], None]
+
+
+class RequestTimings:  # pylint: disable=too-few-public-methods
+    """Define the timings collected while sending a request (across attempts)."""
+
+    __slots__ = ("decoding", "queued", "response_bytes", "retries", "status", "wire")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.decoding = 0.0
+        self.queued = 0.0
+        self.response_bytes = 0
+        self.retries = 0
+        self.status: int | None = None
+        self.wire = 0.0
+
+
+@dataclass
+class EndpointLatency:  # pylint: disable=too-many-instance-attributes
+    """Define the latency statistics of a single endpoint.
+
+    Cache hits are counted, but left out of the latency histogram.
+    """
+
+    buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    bucket_counts: list[int] = field(init=False)
+    cache_hit_count: int = 0
+    count: int = 0
+    error_count: int = 0
+    max_duration: float = 0.0
+    response_bytes: int = 0
+    retry_count: int = 0
+    total_duration: float = 0.0
+
+    def __post_init__(self) -> None:
+        """Set up the histogram (with an overflow bucket)."""
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+
+    @property
+    def mean(self) -> float:
+        """Return the mean latency of the requests that weren't cache hits.
+
+        Returns:
+            The latency in seconds (NaN if there have been no such requests).
+        """
+        if not (count := self.count - self.cache_hit_count):
+            return math.nan
+        return self.total_duration / count
+
+    def observe(self, trace: RequestTrace) -> None:
+        """Add a request to the statistics.
+
+        Args:
+            trace: A request trace.
+        """
+        self.count += 1
+        if trace.cache_hit:
+            self.cache_hit_count += 1
+            return
+
+        if trace.error is not None:
+            self.error_count += 1
+        self.bucket_counts[bisect_left(self.buckets, trace.duration)] += 1
+        self.max_duration = max(self.max_duration, trace.duration)
+        self.response_bytes += trace.response_bytes
+        self.retry_count += trace.retries
+        self.total_duration += trace.duration
+
+    def percentile(self, percentile: float) -> float:
+        """Estimate a latency percentile from the histogram.
+
+        Latencies are assumed to be spread evenly within each bucket; the overflow
+        bucket ends at the slowest latency seen.
+
+        Args:
+            percentile: The percentile (between 0 and 100).
+
+        Returns:
+            The latency in seconds (NaN if there have been no requests).
+        """
+        if not (total := sum(self.bucket_counts)):
+            return math.nan
+
+        rank = percentile / 100 * total
+        cumulative = 0
+        lower = 0.0
+        for idx, bucket_count in enumerate(self.bucket_counts):
+            upper = (
+                self.buckets[idx]
+                if idx < len(self.buckets)
+                else max(self.max_duration, lower)
+            )
+            if bucket_count and cumulative + bucket_count >= rank:
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+            lower = upper
+        return self.max_duration
+
+
+class LatencyAggregator:
+    """Define an in-memory aggregator of per-endpoint latency histograms.
+
+    An aggregator is a request hook itself:
+
+        aggregator = LatencyAggregator()
+        api.add_request_hook(aggregator)
+    """
+
+    def __init__(self, *, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        """Initialize.
+
+        Args:
+            buckets: The upper bounds (in seconds) of the histogram buckets.
+        """
+        self._buckets = tuple(sorted(buckets))
+        self._endpoints: dict[tuple[str, str], EndpointLatency] = {}
+
+    def __call__(self, trace: RequestTrace) -> None:
+        """Add a request to the statistics of its endpoint.
+
+        Args:
+            trace: A request trace.
+        """
+        key = (trace.method.upper(), trace.endpoint)
+        if (stats := self._endpoints.get(key)) is None:
+            stats = self._endpoints[key] = EndpointLatency(self._buckets)
+        stats.observe(trace)
+
+    @property
+    def endpoints(self) -> dict[tuple[str, str], EndpointLatency]:
+        """Return the statistics of every endpoint.
+
+        Returns:
+            A dictionary of (method, endpoint template) tuples to statistics.
+        """
+        return dict(self._endpoints)
+
+    def reset(self) -> None:
+        """Clear all statistics."""
+        self._endpoints.clear()
@@ -0,0 +1,28 @@
+"""Define utility functions."""
+
+from __future__ import annotations
+
+import re
+
+ENDPOINT_TEMPLATES = (
+    (re.compile(r"^clients/[^/]+/sessions$"), "clients/{uuid}/sessions"),
+    (re.compile(r"^clients/[^/]+$"), "clients/{uuid}"),
+    (re.compile(r"^tiles/tile_states$"), "tiles/tile_states"),
+    (re.compile(r"^tiles/location/history/[^/]+$"), "tiles/location/history/{uuid}"),
+    (re.compile(r"^tiles/[^/]+$"), "tiles/{uuid}"),
+)
+
+
+def get_endpoint_template(endpoint: str) -> str:
+    """Return the template of a relative API endpoint (e.g., "tiles/{uuid}").
+
+    Args:
+        endpoint: A relative API endpoint.
+
+    Returns:
+        The endpoint template (or the endpoint itself, if it has no template).
+    """
+    for pattern, template in ENDPOINT_TEMPLATES:
+        if pattern.match(endpoint):
+            return template
+    return endpoint
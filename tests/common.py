@@ -1,6 +1,10 @@
 """Define common test utilities."""
 
+import json
 import os
+from unittest.mock import Mock
+
+from pytile.tile import Tile
 
 TILE_CLIENT_UUID = "2cc56adc-b96a-4293-9b94-eda716e0aa17"
 TILE_EMAIL = "user@email.com"
@@ -22,3 +26,32 @@ def load_fixture(filename: str) -> str:
     path = os.path.join(os.path.dirname(__file__), "fixtures", filename)
     with open(path, encoding="utf-8") as fptr:
         return fptr.read()
+
+
+def build_tile(
+    tile_uuid: str,
+    latitude: float | None,
+    longitude: float | None,
+    *,
+    accuracy: float = 10.0,
+) -> Tile:
+    """Build a Tile at a location from the Tile details fixture.
+
+    Args:
+        tile_uuid: The UUID of the Tile.
+        latitude: The latitude of the Tile (None for no location).
+        longitude: The longitude of the Tile (None for no location).
+        accuracy: The accuracy of the location.
+
+    Returns:
+        A Tile.
+    """
+    data = json.loads(load_fixture("tile_details_response.json"))
+    data["result"]["tile_uuid"] = tile_uuid
+    if latitude is None or longitude is None:
+        data["result"]["last_tile_state"] = None
+    else:
+        data["result"]["last_tile_state"].update(
+            {"h_accuracy": accuracy, "latitude": latitude, "longitude": longitude}
+        )
+    return Tile(Mock(), data)
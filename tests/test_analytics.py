@@ -0,0 +1,139 @@
+"""Define tests for geospatial analytics."""
+
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+from pytile import analytics, history
+from pytile.analytics import (
+    find_stay_points,
+    segment_distances,
+    segment_speeds,
+    split_trips,
+    total_distance,
+)
+from pytile.history import HistoryColumns
+
+MINUTE_MS = 60 * 1000
+START_MS = 1672531200000  # 2023-01-01T00:00:00Z
+
+# The number of degrees of longitude that are ~600 meters apart at this latitude:
+LONGITUDE_STEP = 600 / (111194.93 * math.cos(math.radians(51.5)))
+
+
+def _build_track() -> HistoryColumns:
+    """Build a track: a 30-minute stay, a 20-minute drive, a gap, and another stay.
+
+    Returns:
+        Location updates.
+    """
+    updates = []
+    # Stay at the origin (with a few meters of jitter), one update per minute:
+    for minute in range(30):
+        updates.append((minute, 51.5 + (minute % 2) * 0.00002, 0.0))
+    # Drive east at 10 m/s:
+    for step in range(1, 21):
+        updates.append((29 + step, 51.5, step * LONGITUDE_STEP))
+    # Two hours later, stay at the destination for 15 minutes:
+    for minute in range(16):
+        updates.append((170 + minute, 51.5, 20 * LONGITUDE_STEP))
+
+    return HistoryColumns.from_updates(
+        {
+            "latitude": latitude,
+            "location_timestamp": START_MS + minute * MINUTE_MS,
+            "longitude": longitude,
+        }
+        for minute, latitude, longitude in updates
+    )
+
+
+@pytest.fixture(name="use_numpy", params=[True, False], ids=["numpy", "python"])
+def use_numpy_fixture(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> bool:
+    """Run a test with and without NumPy.
+
+    Args:
+        request: A pytest request fixture.
+        monkeypatch: A pytest monkeypatch fixture.
+
+    Returns:
+        Whether NumPy is used.
+    """
+    if request.param:
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(analytics, "HAS_NUMPY", request.param)
+    monkeypatch.setattr(history, "HAS_NUMPY", request.param)
+    return bool(request.param)
+
+
+def test_distances_and_speeds(use_numpy: bool) -> None:
+    """Test computing distances and speeds between location updates.
+
+    Args:
+        use_numpy: Whether NumPy is used.
+    """
+    track = _build_track()
+    distances = segment_distances(track)
+    assert len(distances) == len(track) - 1
+    assert distances[40] == pytest.approx(600, rel=1e-3)
+
+    speeds = segment_speeds(track)
+    assert speeds[40] == pytest.approx(10, rel=1e-3)
+    # The stay's jitter is a couple of meters per minute:
+    assert speeds[0] < 0.1
+
+    # 20 steps of 600 meters, plus the jitter at the origin:
+    assert total_distance(track) == pytest.approx(12000, rel=1e-2)
+
+    # Missing locations are skipped:
+    sparse = HistoryColumns.from_updates(
+        [
+            {"latitude": 51.5, "location_timestamp": 0, "longitude": 0.0},
+            {"location_timestamp": MINUTE_MS},
+            {"latitude": 51.5, "location_timestamp": MINUTE_MS, "longitude": 0.0},
+        ]
+    )
+    assert math.isnan(segment_distances(sparse)[0])
+    assert math.isnan(segment_speeds(sparse)[1])
+    assert total_distance(sparse) == 0
+
+
+def test_split_trips(use_numpy: bool) -> None:
+    """Test splitting location updates into trips.
+
+    Args:
+        use_numpy: Whether NumPy is used.
+    """
+    track = _build_track()
+    trips = split_trips(track)
+    assert [len(trip) for trip in trips] == [50, 16]
+    assert trips[1].timestamps[0] == START_MS + 170 * MINUTE_MS
+
+    trips = split_trips(track, max_distance_gap=500, min_points=10)
+    assert [len(trip) for trip in trips] == [30, 16]
+
+
+def test_stay_points(use_numpy: bool) -> None:
+    """Test finding stay points.
+
+    Args:
+        use_numpy: Whether NumPy is used.
+    """
+    stay_points = find_stay_points(_build_track())
+    assert len(stay_points) == 2
+
+    origin, destination = stay_points
+    assert origin.latitude == pytest.approx(51.50001)
+    assert origin.longitude == 0
+    assert origin.arrival == datetime(2023, 1, 1, 0, 0)
+    assert origin.duration == timedelta(minutes=29)
+    assert origin.point_count == 30
+    # The drive's last update was already at the destination:
+    assert destination.arrival == datetime(2023, 1, 1, 0, 49)
+    assert destination.departure == datetime(2023, 1, 1, 3, 5)
+    assert destination.point_count == 17
+
+    assert not find_stay_points(_build_track(), min_duration=timedelta(hours=3))
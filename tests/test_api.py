@@ -1,14 +1,21 @@
 """Define tests for the client object."""
 
+import asyncio
+import gc
+import json
+import logging
 import re
+import weakref
 from time import time
 from typing import Any
+from unittest.mock import Mock
 
 import aiohttp
 import pytest
 from aresponses import ResponsesMockServer
 
 from pytile import async_login
+from pytile.api import API, APIOptions
 from pytile.errors import InvalidAuthError, RequestError
 
 from .common import (
@@ -179,3 +186,383 @@ async def test_login_existing(
         assert api.client_uuid == TILE_CLIENT_UUID
 
     aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_custom_json_decoder(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+    caplog: Mock,
+) -> None:
+    """Test that responses are decoded with a custom decoder and sampled in logs.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+        caplog: A mocked logging utility.
+    """
+    caplog.set_level(logging.DEBUG)
+    json_decoder = Mock(side_effect=json.loads)
+
+    async with authenticated_tile_api_server, aiohttp.ClientSession() as session:
+        await async_login(
+            TILE_EMAIL,
+            TILE_PASSWORD,
+            session,
+            client_uuid=TILE_CLIENT_UUID,
+            options=APIOptions(json_decoder=json_decoder, payload_log_sample_rate=0),
+        )
+
+    assert json_decoder.call_count == 2
+    assert isinstance(json_decoder.call_args.args[0], bytes)
+    messages = [
+        record.getMessage()
+        for record in caplog.records
+        if record.getMessage().startswith("Data received")
+    ]
+    assert messages == [
+        f"Data received from /clients/{TILE_CLIENT_UUID}",
+        f"Data received from /clients/{TILE_CLIENT_UUID}/sessions",
+    ]
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_custom_api_url(
+    aresponses: ResponsesMockServer,
+    create_client_response: dict[str, Any],
+    create_session_response: dict[str, Any],
+) -> None:
+    """Test pointing the API object at a different server.
+
+    Args:
+        aresponses: An aresponses server.
+        create_client_response: An API response payload.
+        create_session_response: An API response payload.
+    """
+    aresponses.add(
+        "tile.example.com",
+        f"/v1/clients/{TILE_CLIENT_UUID}",
+        "put",
+        response=aiohttp.web_response.json_response(create_client_response, status=200),
+    )
+    aresponses.add(
+        "tile.example.com",
+        f"/v1/clients/{TILE_CLIENT_UUID}/sessions",
+        "post",
+        response=aiohttp.web_response.json_response(
+            create_session_response, status=200
+        ),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        api = await async_login(
+            TILE_EMAIL,
+            TILE_PASSWORD,
+            session,
+            client_uuid=TILE_CLIENT_UUID,
+            options=APIOptions(api_url="https://tile.example.com/v1/"),
+        )
+        assert api.user_uuid == TILE_USER_UUID
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_backoff(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+) -> None:
+    """Test that the concurrency limit shrinks when the API is overloaded.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+    """
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            aresponses.Response(text="", status=503),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL,
+                TILE_PASSWORD,
+                session,
+                client_uuid=TILE_CLIENT_UUID,
+                options=APIOptions(max_concurrency=4),
+            )
+            limiter = api._concurrency_limiter  # pylint: disable=protected-access
+            assert limiter.limit == 4
+
+            with pytest.raises(RequestError):
+                await api.async_get_tiles()
+            assert limiter.limit == 2
+            assert limiter.in_flight == 0
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_request_coalescing(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+    tile_states_response: dict[str, Any],
+) -> None:
+    """Test that concurrent identical GET requests share a single HTTP request.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+        tile_states_response: An API response payload.
+    """
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_states_response, status=200
+            ),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            aresponses.Response(text="", status=500),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL, TILE_PASSWORD, session, client_uuid=TILE_CLIENT_UUID
+            )
+            results = await asyncio.gather(
+                *(
+                    api._async_request(  # pylint: disable=protected-access
+                        "get", "tiles/tile_states"
+                    )
+                    for _ in range(3)
+                )
+            )
+            assert results == [tile_states_response] * 3
+
+            failures = await asyncio.gather(
+                *(
+                    api._async_request(  # pylint: disable=protected-access
+                        "get", "tiles/tile_states"
+                    )
+                    for _ in range(3)
+                ),
+                return_exceptions=True,
+            )
+            assert all(isinstance(failure, RequestError) for failure in failures)
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_expired_session_single_login(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+    create_session_response: dict[str, Any],
+    tile_details_response: dict[str, Any],
+    tile_states_response: dict[str, Any],
+) -> None:
+    """Test that concurrent requests on an expired session trigger only one login.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+        create_session_response: An API response payload.
+        tile_details_response: An API response payload.
+        tile_states_response: An API response payload.
+    """
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            f"/api/v1/clients/{TILE_CLIENT_UUID}/sessions",
+            "post",
+            response=aiohttp.web_response.json_response(
+                create_session_response, status=200
+            ),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_states_response, status=200
+            ),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            f"/api/v1/tiles/{TILE_TILE_UUID}",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_details_response, status=200
+            ),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL, TILE_PASSWORD, session, client_uuid=TILE_CLIENT_UUID
+            )
+
+            # Simulate an expired session:
+            api._session_expiry = (  # pylint: disable=protected-access
+                int(time() * 1000) - 1000000
+            )
+            await asyncio.gather(
+                api._async_request(  # pylint: disable=protected-access
+                    "get", "tiles/tile_states"
+                ),
+                api._async_request(  # pylint: disable=protected-access
+                    "get", f"tiles/{TILE_TILE_UUID}"
+                ),
+            )
+
+    authenticated_tile_api_server.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_background_session_renewal(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+    caplog: Mock,
+    create_session_response: dict[str, Any],
+) -> None:
+    """Test that the session is renewed in the background before it expires.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+        caplog: A mocked logging utility.
+        create_session_response: An API response payload.
+    """
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            f"/api/v1/clients/{TILE_CLIENT_UUID}/sessions",
+            "post",
+            response=aiohttp.web_response.json_response(
+                create_session_response, status=200
+            ),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            f"/api/v1/clients/{TILE_CLIENT_UUID}/sessions",
+            "post",
+            aresponses.Response(text="", status=500),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            # The session expires in ~1 second, so a renewal should be scheduled in
+            # ~0.1 seconds:
+            api = await async_login(
+                TILE_EMAIL,
+                TILE_PASSWORD,
+                session,
+                client_uuid=TILE_CLIENT_UUID,
+                options=APIOptions(session_renewal_margin=0.9),
+            )
+            await asyncio.sleep(0.3)
+            task = api._session_renewal_task  # pylint: disable=protected-access
+            assert task
+            assert task.done()
+
+            # A failed renewal is logged (the session is renewed inline later):
+            api._start_session_renewal(  # pylint: disable=protected-access
+                create_session_response["result"]["session_expiration_timestamp"]
+            )
+            task = api._session_renewal_task  # pylint: disable=protected-access
+            assert task is not None
+            await task
+            assert any("Unable to renew" in e.message for e in caplog.records)
+
+            # Closing the API object cancels any scheduled renewal:
+            api._session_expiry = (  # pylint: disable=protected-access
+                int(time() * 1000) + 1000000
+            )
+            api._schedule_session_renewal()  # pylint: disable=protected-access
+            await api.async_close()
+            assert not api._session_renewal_handle  # pylint: disable=protected-access
+
+    authenticated_tile_api_server.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_session_renewal_scheduling() -> None:
+    """Test that background renewals are opt-in and don't keep API objects alive."""
+    # pylint: disable=protected-access
+    expiry = int(time() * 1000) + 1000000
+
+    async with aiohttp.ClientSession() as session:
+        api = API(TILE_EMAIL, TILE_PASSWORD, session)
+        assert not api._session_expires_within(0)
+
+        # By default, sessions are only renewed inline:
+        api._session_expiry = expiry
+        api._schedule_session_renewal()
+        assert not api._session_renewal_handle
+
+        api = API(
+            TILE_EMAIL,
+            TILE_PASSWORD,
+            session,
+            options=APIOptions(session_renewal_margin=60),
+        )
+        api._session_expiry = expiry
+        api._schedule_session_renewal()
+        first_handle = api._session_renewal_handle
+        assert first_handle
+
+        # Rescheduling replaces the pending renewal:
+        api._schedule_session_renewal()
+        handle = api._session_renewal_handle
+        assert handle
+        assert first_handle.cancelled()
+
+        # An API object that is dropped without being closed can still be collected
+        # (and its pending renewal does nothing):
+        api_ref = weakref.ref(api)
+        del api
+        gc.collect()
+        assert api_ref() is None
+        handle._run()
+        handle.cancel()
+
+
+@pytest.mark.asyncio
+async def test_session_renewal_after_close(
+    authenticated_tile_api_server: ResponsesMockServer,
+) -> None:
+    """Test that no renewal is attempted once the aiohttp session is closed.
+
+    Args:
+        authenticated_tile_api_server: A mock Tile API server connection.
+    """
+    async with authenticated_tile_api_server:
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL,
+                TILE_PASSWORD,
+                session,
+                client_uuid=TILE_CLIENT_UUID,
+                options=APIOptions(session_renewal_margin=0.9),
+            )
+        # The session is closed before the renewal comes due:
+        await asyncio.sleep(0.3)
+        assert not api._session_renewal_task  # pylint: disable=protected-access
+
+        # Renewals that come due (or start) after the session was closed are skipped:
+        expiry = api._session_expiry  # pylint: disable=protected-access
+        assert expiry is not None
+        api._start_session_renewal(expiry)  # pylint: disable=protected-access
+        assert not api._session_renewal_task  # pylint: disable=protected-access
+        await api._async_renew_session(expiry)  # pylint: disable=protected-access
+
+    authenticated_tile_api_server.assert_plan_strictly_followed()
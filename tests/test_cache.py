@@ -0,0 +1,126 @@
+"""Define tests for the response cache."""
+
+from typing import Any
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pytile import async_login
+from pytile.api import APIOptions
+from pytile.cache import ResponseCache
+
+from .common import TILE_CLIENT_UUID, TILE_EMAIL, TILE_PASSWORD, TILE_TILE_UUID
+
+
+def test_endpoint_ttls(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that per-endpoint TTLs are respected.
+
+    Args:
+        monkeypatch: A pytest monkeypatch fixture.
+    """
+    now = 100.0
+    monkeypatch.setattr("pytile.cache.monotonic", lambda: now)
+
+    cache = ResponseCache(ttl=10, endpoint_ttls={"tiles/tile_states": 0})
+    cache.set("get", "tiles/tile_states", None, {"result": []})
+    cache.set("get", f"tiles/{TILE_TILE_UUID}", None, {"result": {}})
+    assert len(cache) == 1
+    assert cache.get("get", "tiles/tile_states") is None
+    assert cache.get("GET", f"tiles/{TILE_TILE_UUID}") == {"result": {}}
+
+    now = 110.0
+    assert cache.get("get", f"tiles/{TILE_TILE_UUID}") is None
+    assert len(cache) == 0
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def test_invalidate_and_evict() -> None:
+    """Test invalidation and LRU eviction."""
+    cache = ResponseCache(max_size=2)
+    cache.set("get", "tiles/a", None, {"result": "a"})
+    cache.set("get", "tiles/b", {"x": 1}, {"result": "b1"})
+    cache.set("get", "tiles/b", {"x": 2}, {"result": "b2"})
+    assert cache.evictions == 1
+    assert cache.get("get", "tiles/a") is None
+
+    assert cache.invalidate("tiles/b") == 2
+    assert cache.invalidate("tiles/b") == 0
+    cache.set("get", "tiles/a", None, {"result": "a"})
+    assert cache.invalidate() == 1
+    assert len(cache) == 0
+
+
+def test_copies() -> None:
+    """Test that modifying a response doesn't modify the cache."""
+    cache = ResponseCache()
+    data = {"result": {"name": "Wallet"}}
+    cache.set("get", "tiles/a", None, data)
+    data["result"]["name"] = "Keys"
+
+    cached = cache.get("get", "tiles/a")
+    assert cached == {"result": {"name": "Wallet"}}
+    assert cached is not None
+    cached["result"]["name"] = "Keys"
+    assert cache.get("get", "tiles/a") == {"result": {"name": "Wallet"}}
+
+
+@pytest.mark.asyncio
+async def test_cached_details(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+    tile_details_response: dict[str, Any],
+    tile_details_update_response: dict[str, Any],
+    tile_states_response: dict[str, Any],
+) -> None:
+    """Test that cached responses are reused until a Tile is explicitly updated.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+        tile_details_response: An API response payload.
+        tile_details_update_response: An API response payload.
+        tile_states_response: An API response payload.
+    """
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_states_response, status=200
+            ),
+        )
+        for details_response in (tile_details_response, tile_details_update_response):
+            authenticated_tile_api_server.add(
+                "production.tile-api.com",
+                f"/api/v1/tiles/{TILE_TILE_UUID}",
+                "get",
+                response=aiohttp.web_response.json_response(
+                    details_response, status=200
+                ),
+            )
+
+        cache = ResponseCache()
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL,
+                TILE_PASSWORD,
+                session,
+                client_uuid=TILE_CLIENT_UUID,
+                options=APIOptions(response_cache=cache),
+            )
+            tiles = await api.async_get_tiles()
+            tiles = await api.async_get_tiles()
+            assert cache.hits == 2
+            assert cache.misses == 2
+
+            tile = tiles[TILE_TILE_UUID]
+            await tile.async_update()
+            assert tile.latitude == 51.8943631
+
+            tiles = await api.async_get_tiles()
+            assert tiles[TILE_TILE_UUID].latitude == 51.8943631
+
+    aresponses.assert_plan_strictly_followed()
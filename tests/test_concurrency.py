@@ -0,0 +1,83 @@
+"""Define tests for the adaptive concurrency limiter."""
+
+import asyncio
+
+import pytest
+
+from pytile.concurrency import AdaptiveConcurrencyLimiter
+
+
+@pytest.mark.asyncio
+async def test_limit_adapts() -> None:
+    """Test that the limit grows on success and shrinks on overload."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=5, min_limit=1)
+    assert limiter.limit == 4
+    assert limiter.max_limit == 5
+
+    for _ in range(8):
+        await limiter.async_acquire()
+        limiter.release()
+    assert limiter.limit == 5
+
+    await limiter.async_acquire()
+    limiter.release(overloaded=True)
+    assert limiter.limit == 2
+
+    for _ in range(3):
+        await limiter.async_acquire()
+        limiter.release(overloaded=True)
+    assert limiter.limit == 1
+
+
+def test_invalid_limits() -> None:
+    """Test that invalid limits are rejected."""
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimiter(min_limit=0)
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimiter(min_limit=4, max_limit=2)
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_bounded() -> None:
+    """Test that no more than the limit of requests run at once."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+    peak = 0
+
+    async def request() -> None:
+        """Simulate a request."""
+        nonlocal peak
+        await limiter.async_acquire()
+        peak = max(peak, limiter.in_flight)
+        await asyncio.sleep(0)
+        limiter.release()
+
+    await asyncio.gather(*(request() for _ in range(10)))
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter() -> None:
+    """Test that a cancelled waiter doesn't leak a slot."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    await limiter.async_acquire()
+
+    waiter = asyncio.create_task(limiter.async_acquire())
+    await asyncio.sleep(0)
+
+    # Hand the slot to the waiter and cancel it before it gets to run:
+    limiter.release()
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter.in_flight == 0
+
+    # A waiter that is cancelled while queued is skipped:
+    await limiter.async_acquire()
+    waiter = asyncio.create_task(limiter.async_acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    limiter.release()
+    assert limiter.in_flight == 0
@@ -0,0 +1,142 @@
+"""Define tests for the polling coordinator."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from unittest.mock import AsyncMock, Mock
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pytile import async_login
+from pytile.coordinator import TileCoordinator
+
+from .common import TILE_CLIENT_UUID, TILE_EMAIL, TILE_PASSWORD, TILE_TILE_UUID
+
+
+def test_intervals() -> None:
+    """Test that polling intervals adapt to a Tile's state."""
+    coordinator = TileCoordinator(
+        Mock(), min_interval=10, base_interval=100, max_interval=1000
+    )
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    tile = Mock(dead=False, last_timestamp=now, lost=False, uuid=TILE_TILE_UUID)
+
+    # pylint: disable=protected-access
+    assert coordinator._get_interval(tile, moved=False) == 100
+    assert coordinator._get_interval(tile, moved=True) == 10
+
+    coordinator._intervals[TILE_TILE_UUID] = 10
+    assert coordinator._get_interval(tile, moved=False) == 100
+    coordinator._intervals[TILE_TILE_UUID] = 400
+    assert coordinator._get_interval(tile, moved=False) == 800
+    coordinator._intervals[TILE_TILE_UUID] = 800
+    assert coordinator._get_interval(tile, moved=False) == 1000
+
+    tile.lost = True
+    assert coordinator._get_interval(tile, moved=False) == 10
+
+    tile.lost = False
+    tile.last_timestamp = now - timedelta(days=2)
+    assert coordinator._get_interval(tile, moved=False) == 1000
+
+    tile.dead = True
+    assert coordinator._get_interval(tile, moved=True) == 1000
+
+
+@pytest.mark.asyncio
+async def test_poll_errors() -> None:
+    """Test that failed polls are rescheduled (unless the Tile was removed)."""
+    coordinator = TileCoordinator(Mock())
+    tile = Mock(
+        async_update=AsyncMock(side_effect=asyncio.TimeoutError), uuid=TILE_TILE_UUID
+    )
+
+    # pylint: disable=protected-access
+    coordinator._intervals[TILE_TILE_UUID] = 10
+    assert not await coordinator._async_poll_tile(tile)
+    assert [key for _, _, key in coordinator._schedule] == [TILE_TILE_UUID]
+
+    # A Tile that's no longer in the Tile list isn't polled again:
+    coordinator._schedule = []
+    coordinator._intervals.clear()
+    assert not await coordinator._async_poll_tile(tile)
+    tile.async_update = AsyncMock()
+    assert not await coordinator._async_poll_tile(tile)
+    assert not coordinator._schedule
+    assert not coordinator._intervals
+
+
+@pytest.mark.asyncio
+async def test_updates(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+    tile_details_response: dict[str, Any],
+    tile_details_update_response: dict[str, Any],
+    tile_states_response: dict[str, Any],
+) -> None:
+    """Test polling Tiles through the coordinator.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+        tile_details_response: An API response payload.
+        tile_details_update_response: An API response payload.
+        tile_states_response: An API response payload.
+    """
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_states_response, status=200
+            ),
+        )
+        for details_response in (
+            tile_details_response,
+            tile_details_update_response,
+            tile_details_update_response,
+        ):
+            authenticated_tile_api_server.add(
+                "production.tile-api.com",
+                f"/api/v1/tiles/{TILE_TILE_UUID}",
+                "get",
+                response=aiohttp.web_response.json_response(
+                    details_response, status=200
+                ),
+            )
+
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL, TILE_PASSWORD, session, client_uuid=TILE_CLIENT_UUID
+            )
+            coordinator = TileCoordinator(
+                api,
+                min_interval=0.01,
+                base_interval=0.02,
+                max_interval=0.03,
+                tile_list_interval=10,
+            )
+            intervals = coordinator._intervals  # pylint: disable=protected-access
+
+            updates = coordinator.async_updates()
+
+            # The fixture Tile's location is years old, so it starts out as "stale":
+            tile = await anext(updates)
+            assert tile.latitude == 51.528308
+            assert intervals[TILE_TILE_UUID] == 0.03
+
+            # Once the Tile moves, it's polled more often:
+            assert await anext(updates) is tile
+            assert tile.latitude == 51.8943631
+            assert intervals[TILE_TILE_UUID] == 0.01
+
+            # ...until it stops moving:
+            assert await anext(updates) is tile
+            assert intervals[TILE_TILE_UUID] == 0.03
+
+            await updates.aclose()
+
+    authenticated_tile_api_server.assert_plan_strictly_followed()
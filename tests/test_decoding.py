@@ -0,0 +1,29 @@
+"""Define tests for JSON decoders."""
+
+import json
+
+import pytest
+
+from pytile import decoding
+from pytile.decoding import get_json_decoder
+
+
+def test_fallback_decoder(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the standard library is used when no fast decoder is installed.
+
+    Args:
+        monkeypatch: A pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(decoding, "_get_msgspec_decoder", lambda: None)
+    monkeypatch.setattr(decoding, "_get_orjson_decoder", lambda: None)
+    assert get_json_decoder() is json.loads
+
+
+def test_fast_decoder() -> None:
+    """Test that a fast decoder is preferred when one is installed."""
+    pytest.importorskip("orjson")
+    decoder = get_json_decoder()
+    assert decoder is not json.loads
+    assert decoder(b'{"result": [1, 2.5, null]}') == {"result": [1, 2.5, None]}
+    with pytest.raises(ValueError):
+        decoder(b"{")
@@ -0,0 +1,147 @@
+"""Define tests for Tile change events."""
+
+import logging
+from typing import Any
+from unittest.mock import Mock
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pytile import async_login
+from pytile.errors import TileError
+from pytile.events import (
+    TileEvent,
+    TileEventType,
+    TileSnapshot,
+    add_event_listener,
+    compute_tile_events,
+)
+
+from .common import TILE_CLIENT_UUID, TILE_EMAIL, TILE_PASSWORD, TILE_TILE_UUID
+
+SNAPSHOT = TileSnapshot(
+    latitude=51.528308,
+    longitude=-0.3817765,
+    lost=False,
+    dead=False,
+    firmware_version="01.12.14.0",
+    ring_state="STOPPED",
+    voip_state="OFFLINE",
+)
+
+
+def test_compute_events() -> None:
+    """Test computing change events from two snapshots."""
+    assert not compute_tile_events(TILE_TILE_UUID, SNAPSHOT, SNAPSHOT)
+
+    # Moves below the threshold are ignored:
+    nudged = SNAPSHOT._replace(latitude=51.528309)
+    assert not compute_tile_events(TILE_TILE_UUID, SNAPSHOT, nudged)
+
+    changed = SNAPSHOT._replace(
+        latitude=51.8943631,
+        lost=True,
+        dead=True,
+        firmware_version="01.19.01.0",
+        ring_state="RINGING",
+        voip_state="ONLINE",
+    )
+    events = compute_tile_events(TILE_TILE_UUID, SNAPSHOT, changed)
+    assert [event.event_type for event in events] == [
+        TileEventType.MOVED,
+        TileEventType.LOST,
+        TileEventType.DEAD,
+        TileEventType.FIRMWARE_CHANGED,
+        TileEventType.RING_STATE_CHANGED,
+        TileEventType.VOIP_STATE_CHANGED,
+    ]
+    assert events[0] == TileEvent(
+        TILE_TILE_UUID,
+        TileEventType.MOVED,
+        (51.528308, -0.3817765),
+        (51.8943631, -0.3817765),
+    )
+
+    events = compute_tile_events(TILE_TILE_UUID, changed, SNAPSHOT)
+    assert TileEventType.FOUND in [event.event_type for event in events]
+    assert TileEventType.REVIVED in [event.event_type for event in events]
+
+    # Gaining or losing a location counts as moving:
+    unknown = SNAPSHOT._replace(latitude=None, longitude=None)
+    for old, new in ((unknown, SNAPSHOT), (SNAPSHOT, unknown)):
+        events = compute_tile_events(TILE_TILE_UUID, old, new)
+        assert [event.event_type for event in events] == [TileEventType.MOVED]
+
+
+@pytest.mark.asyncio
+async def test_event_listeners(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+    caplog: Mock,
+    tile_details_response: dict[str, Any],
+    tile_details_update_response: dict[str, Any],
+    tile_states_response: dict[str, Any],
+) -> None:
+    """Test that listeners receive change events from Tile updates.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+        caplog: A mocked logging utility.
+        tile_details_response: An API response payload.
+        tile_details_update_response: An API response payload.
+        tile_states_response: An API response payload.
+    """
+    caplog.set_level(logging.INFO)
+
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_states_response, status=200
+            ),
+        )
+        for details_response in (
+            tile_details_response,
+            tile_details_update_response,
+            tile_details_response,
+        ):
+            authenticated_tile_api_server.add(
+                "production.tile-api.com",
+                f"/api/v1/tiles/{TILE_TILE_UUID}",
+                "get",
+                response=aiohttp.web_response.json_response(
+                    details_response, status=200
+                ),
+            )
+
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL, TILE_PASSWORD, session, client_uuid=TILE_CLIENT_UUID
+            )
+            api_events: list[TileEvent] = []
+            remove_api_listener = api.add_tile_event_listener(api_events.append)
+
+            tiles = await api.async_get_tiles()
+            tile = tiles[TILE_TILE_UUID]
+            tile_events: list[TileEvent] = []
+            remove_tile_listener = add_event_listener(tile, tile_events.append)
+            add_event_listener(tile, Mock(side_effect=TileError("Broken listener")))
+
+            await tile.async_update()
+            assert [event.event_type for event in tile_events] == [TileEventType.MOVED]
+            assert api_events == tile_events
+            assert any(
+                "Error in Tile event listener" in e.message for e in caplog.records
+            )
+
+            remove_api_listener()
+            remove_tile_listener()
+            await tile.async_update()
+            assert len(api_events) == 1
+            assert len(tile_events) == 1
+
+    authenticated_tile_api_server.assert_plan_strictly_followed()
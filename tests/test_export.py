@@ -0,0 +1,173 @@
+"""Define tests for exporting Tiles and history."""
+
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+
+from pytile.export import (
+    ExportFormat,
+    async_export_history,
+    async_export_tiles,
+    export_history,
+    export_tiles,
+)
+
+from .common import build_tile
+
+UPDATES = [
+    {
+        "altitude": 12.5,
+        "horizontal_accuracy": 5.0,
+        "latitude": 51.5,
+        "location_timestamp": 1000,
+        "longitude": -0.1,
+    },
+    # Some location updates only carry a generic timestamp:
+    {"latitude": 51.6, "longitude": -0.2, "timestamp": 2000},
+]
+
+
+class AsyncSink:  # pylint: disable=too-few-public-methods
+    """Define an asynchronous sink that collects what's written to it."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.writes: list[str] = []
+
+    async def write(self, data: str) -> int:
+        """Write text.
+
+        Args:
+            data: The text.
+
+        Returns:
+            The number of characters written.
+        """
+        self.writes.append(data)
+        return len(data)
+
+
+async def _async_iter_updates() -> AsyncIterator[dict[str, Any]]:
+    """Yield the test location updates.
+
+    Yields:
+        Location updates.
+    """
+    for update in UPDATES:
+        yield update
+
+
+def test_export_tiles_ndjson() -> None:
+    """Test exporting Tiles to NDJSON."""
+    tiles = [build_tile(f"tile{idx}", 51.5, -0.1) for idx in range(5)]
+    sink = io.StringIO()
+
+    assert export_tiles(tiles, sink, chunk_size=2) == 5
+
+    rows = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert [row["uuid"] for row in rows] == [f"tile{idx}" for idx in range(5)]
+    for tile, row in zip(tiles, rows):
+        expected = tile.as_dict()
+        for field in ("last_timestamp", "lost_timestamp"):
+            expected[field] = expected[field].isoformat()
+        assert row == expected
+
+
+def test_export_tiles_csv() -> None:
+    """Test exporting a subset of Tile fields to CSV."""
+    tiles = [build_tile("tile0", 51.5, -0.1), build_tile("tile1", None, None)]
+    sink = io.StringIO(newline="")
+
+    assert (
+        export_tiles(
+            tiles,
+            sink,
+            export_format=ExportFormat.CSV,
+            fields=("uuid", "latitude", "last_timestamp"),
+        )
+        == 2
+    )
+
+    sink.seek(0)
+    assert list(csv.reader(sink)) == [
+        ["uuid", "latitude", "last_timestamp"],
+        ["tile0", "51.5", tiles[0].last_timestamp.isoformat()],  # type: ignore[union-attr]
+        ["tile1", "", ""],
+    ]
+
+
+def test_export_tiles_errors() -> None:
+    """Test invalid export arguments."""
+    with pytest.raises(ValueError):
+        export_tiles([], io.StringIO(), fields=("uuid", "battery"))
+    with pytest.raises(ValueError):
+        export_tiles([], io.StringIO(), fields=())
+    with pytest.raises(ValueError):
+        export_tiles([], io.StringIO(), export_format="xml")  # type: ignore[arg-type]
+
+
+def test_export_history() -> None:
+    """Test exporting location updates (with and without a CSV header)."""
+    sink = io.StringIO(newline="")
+    assert (
+        export_history(
+            UPDATES[:1],
+            sink,
+            export_format=ExportFormat.CSV,
+            fields=("location_timestamp", "latitude"),
+            tile_uuid="tile0",
+        )
+        == 1
+    )
+    export_history(
+        UPDATES[1:],
+        sink,
+        export_format=ExportFormat.CSV,
+        fields=("location_timestamp", "latitude"),
+        tile_uuid="tile1",
+        header=False,
+    )
+
+    sink.seek(0)
+    assert list(csv.reader(sink)) == [
+        ["tile_uuid", "location_timestamp", "latitude"],
+        ["tile0", "1000", "51.5"],
+        ["tile1", "2000", "51.6"],
+    ]
+
+    # A header is written even if there are no updates:
+    sink = io.StringIO(newline="")
+    assert export_history([], sink, export_format=ExportFormat.CSV) == 0
+    assert sink.getvalue().startswith("location_timestamp,")
+
+
+@pytest.mark.asyncio
+async def test_async_export() -> None:
+    """Test exporting to an asynchronous sink."""
+    sink = AsyncSink()
+    assert await async_export_history(_async_iter_updates(), sink, chunk_size=1) == 2
+    assert len(sink.writes) == 2
+    assert [json.loads(write) for write in sink.writes] == [
+        UPDATES[0],
+        {
+            "altitude": None,
+            "horizontal_accuracy": None,
+            "latitude": 51.6,
+            "location_timestamp": 2000,
+            "longitude": -0.2,
+        },
+    ]
+
+    sink = AsyncSink()
+    tiles = [build_tile("tile0", 51.5, -0.1)]
+    assert (
+        await async_export_tiles(
+            tiles, sink, export_format=ExportFormat.CSV, fields=("uuid",)
+        )
+        == 1
+    )
+    assert sink.writes == ["uuid\r\ntile0\r\n"]
@@ -0,0 +1,113 @@
+"""Define tests for geofences."""
+
+import pytest
+
+from pytile.geofence import (
+    CircleFence,
+    GeofenceEngine,
+    GeofenceEvent,
+    GeofenceEventType,
+    PolygonFence,
+)
+
+from .common import build_tile
+
+# Roughly 100 meters of latitude:
+LATITUDE_100M = 0.0008993
+
+HOME = CircleFence("home", 51.5, -0.1, 200)
+# A square, ~1 km on each side, to the east of home:
+OFFICE = PolygonFence(
+    "office", [(51.495, -0.08), (51.505, -0.08), (51.505, -0.066), (51.495, -0.066)]
+)
+
+
+def test_fence_distances() -> None:
+    """Test computing signed distances to fence boundaries."""
+    assert HOME.signed_distance(51.5, -0.1) == pytest.approx(-200)
+    assert HOME.signed_distance(51.5 + 3 * LATITUDE_100M, -0.1) == pytest.approx(
+        100, rel=1e-3
+    )
+
+    assert OFFICE.signed_distance(51.5, -0.073) == pytest.approx(-487, rel=1e-2)
+    assert OFFICE.signed_distance(51.505 + LATITUDE_100M * 0.66, -0.073) == (
+        pytest.approx(66, rel=1e-2)
+    )
+    assert OFFICE.signed_distance(51.5, -0.1) > 0
+
+    with pytest.raises(ValueError):
+        PolygonFence("line", [(0, 0), (1, 1)])
+
+
+def test_enter_and_exit() -> None:
+    """Test emitting enter and exit events as Tiles move."""
+    engine = GeofenceEngine()
+    engine.add_fence(HOME)
+    engine.add_fence(OFFICE)
+    assert set(engine.fences) == {"home", "office"}
+
+    events = engine.evaluate(
+        [
+            build_tile("tile1", 51.5, -0.1),
+            build_tile("tile2", 51.5, -0.073),
+            build_tile("tile3", None, None),
+        ]
+    )
+    assert events == [
+        GeofenceEvent("tile1", "home", GeofenceEventType.ENTER, 51.5, -0.1),
+        GeofenceEvent("tile2", "office", GeofenceEventType.ENTER, 51.5, -0.073),
+    ]
+    assert engine.get_fences_for_tile("tile1") == {"home"}
+
+    # Nothing changes while the Tiles stay put:
+    assert not engine.evaluate([build_tile("tile1", 51.5, -0.1)])
+
+    # tile1 drives to the office:
+    events = engine.evaluate([build_tile("tile1", 51.5, -0.073)])
+    assert [(event.fence_id, event.event_type) for event in events] == [
+        ("home", GeofenceEventType.EXIT),
+        ("office", GeofenceEventType.ENTER),
+    ]
+    assert engine.get_fences_for_tile("tile1") == {"office"}
+
+
+def test_hysteresis() -> None:
+    """Test that inaccurate positions near a boundary don't cause flapping."""
+    engine = GeofenceEngine(max_hysteresis=100)
+    engine.add_fence(HOME)
+
+    just_inside = 51.5 + LATITUDE_100M * 1.9
+    just_outside = 51.5 + LATITUDE_100M * 2.5
+    far_outside = 51.5 + LATITUDE_100M * 3.5
+
+    assert engine.evaluate([build_tile("tile", just_inside, -0.1, accuracy=80)])
+
+    # ~50 meters outside with 80 meters of accuracy isn't enough to exit:
+    assert not engine.evaluate([build_tile("tile", just_outside, -0.1, accuracy=80)])
+    assert not engine.evaluate([build_tile("tile", just_inside, -0.1, accuracy=80)])
+
+    # ...but it is with an accurate position:
+    assert engine.evaluate([build_tile("tile", just_outside, -0.1, accuracy=5)])
+
+    # The hysteresis is capped:
+    engine.evaluate([build_tile("tile", just_inside, -0.1)])
+    assert engine.evaluate([build_tile("tile", far_outside, -0.1, accuracy=5000)])
+
+
+def test_remove_fence() -> None:
+    """Test removing and replacing fences."""
+    engine = GeofenceEngine()
+    engine.add_fence(HOME)
+    engine.evaluate([build_tile("tile", 51.5, -0.1)])
+
+    # Replacing a fence keeps memberships:
+    engine.add_fence(CircleFence("home", 51.5, -0.1, 300))
+    assert engine.get_fences_for_tile("tile") == {"home"}
+
+    engine.remove_fence("home")
+    engine.remove_fence("home")
+    assert not engine.get_fences_for_tile("tile")
+    assert not engine.evaluate([build_tile("tile", 51.5, -0.1)])
+
+    with pytest.raises(ValueError):
+        GeofenceEngine(cell_size=0)
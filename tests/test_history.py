@@ -0,0 +1,190 @@
+"""Define tests for retrieving location history."""
+
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pytile import async_login, history
+from pytile.history import (
+    HistoryColumns,
+    async_get_tile_history_columns,
+    async_iter_tile_history,
+    split_time_range,
+)
+
+from .common import TILE_CLIENT_UUID, TILE_EMAIL, TILE_PASSWORD, TILE_TILE_UUID
+
+HOUR_MS = 3600 * 1000
+
+# The mock API returns at most this many location updates per response:
+PAGE_SIZE = 5
+
+
+def test_split_time_range() -> None:
+    """Test splitting a time range into windows."""
+    assert split_time_range(0, 9, 4) == [(0, 3), (4, 7), (8, 9)]
+    assert split_time_range(0, 7, 4) == [(0, 3), (4, 7)]
+    assert split_time_range(5, 5, 4) == [(5, 5)]
+    assert not split_time_range(5, 4, 4)
+
+    with pytest.raises(ValueError):
+        split_time_range(0, 9, 0)
+
+
+@pytest.mark.parametrize("has_numpy", [True, False])
+def test_history_columns(has_numpy: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test storing location updates as columns and slicing them by time.
+
+    Args:
+        has_numpy: Whether NumPy should be used.
+        monkeypatch: A pytest monkeypatch fixture.
+    """
+    if has_numpy:
+        numpy = pytest.importorskip("numpy")
+    monkeypatch.setattr(history, "HAS_NUMPY", has_numpy)
+
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    start_ms = round(start.timestamp() * 1000)
+    columns = HistoryColumns.from_updates(
+        {
+            "altitude": 10.0,
+            "horizontal_accuracy": idx,
+            "latitude": 51.5 + idx / 100,
+            "location_timestamp": start_ms + idx * HOUR_MS,
+            "longitude": -0.38,
+        }
+        for idx in range(10)
+    )
+    assert len(columns) == 10
+    assert list(columns.latitudes) == [51.5 + idx / 100 for idx in range(10)]
+
+    subset = columns.slice_time(
+        start + timedelta(hours=2, minutes=30), start + timedelta(hours=5)
+    )
+    assert len(subset) == 3
+    assert list(subset.timestamps) == [start_ms + idx * HOUR_MS for idx in (3, 4, 5)]
+    assert list(subset.accuracies) == [3.0, 4.0, 5.0]
+    assert len(subset.slice_time(start, start + timedelta(hours=3))) == 1
+    assert not subset.slice_time(start, start)
+
+    if has_numpy:
+        assert numpy.shares_memory(subset.latitudes, columns.latitudes)
+    else:
+        assert isinstance(subset.latitudes, memoryview)
+        assert subset.latitudes.obj is columns.latitudes.obj
+
+    # Missing values are stored as NaN:
+    sparse = HistoryColumns.from_updates(
+        [{"latitude": 51.5, "location_timestamp": start_ms, "longitude": -0.38}]
+    )
+    assert math.isnan(sparse.altitudes[0])
+    assert math.isnan(sparse.accuracies[0])
+
+
+@pytest.mark.asyncio
+async def test_iter_history(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+    tile_details_response: dict[str, Any],
+    tile_states_response: dict[str, Any],
+) -> None:
+    """Test streaming a Tile's history across windows and incomplete responses.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+        tile_details_response: An API response payload.
+        tile_states_response: An API response payload.
+    """
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2023, 1, 4, tzinfo=timezone.utc)
+    start_ms = round(start.timestamp() * 1000)
+    # One location update per hour (inclusive of both ends):
+    all_timestamps = list(range(start_ms, start_ms + 72 * HOUR_MS + 1, HOUR_MS))
+    requests = []
+
+    def history_response(request: aiohttp.web.Request) -> aiohttp.web.Response:
+        """Return the (possibly incomplete) history within the requested range.
+
+        Args:
+            request: An aiohttp request.
+
+        Returns:
+            An aiohttp response.
+        """
+        start_ts = int(request.query["start_ts"])
+        end_ts = int(request.query["end_ts"])
+        requests.append((start_ts, end_ts))
+        timestamps = [ts for ts in all_timestamps if start_ts <= ts <= end_ts]
+        return aiohttp.web_response.json_response(
+            {
+                "result": {
+                    "complete_history": "Y" if len(timestamps) <= PAGE_SIZE else "N",
+                    "location_updates": [
+                        {"latitude": 51.5, "longitude": -0.38, "location_timestamp": ts}
+                        for ts in reversed(timestamps[:PAGE_SIZE])
+                    ],
+                }
+            },
+            status=200,
+        )
+
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_states_response, status=200
+            ),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            f"/api/v1/tiles/{TILE_TILE_UUID}",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_details_response, status=200
+            ),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            f"/api/v1/tiles/location/history/{TILE_TILE_UUID}",
+            "get",
+            response=history_response,
+            repeat=aresponses.INFINITY,
+        )
+
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL, TILE_PASSWORD, session, client_uuid=TILE_CLIENT_UUID
+            )
+            tiles = await api.async_get_tiles()
+            tile = tiles[TILE_TILE_UUID]
+
+            updates = [
+                update
+                async for update in async_iter_tile_history(
+                    tile, start, end, window=timedelta(hours=24), max_concurrency=2
+                )
+            ]
+            assert [
+                update["location_timestamp"] for update in updates
+            ] == all_timestamps
+
+            # Each day-long window needs five requests to page through its 24 updates
+            # (and the end of the range gets a one-millisecond window of its own):
+            assert len(requests) == 3 * 5 + 1
+            assert requests[0] == (start_ms, start_ms + 24 * HOUR_MS - 1)
+
+            columns = await async_get_tile_history_columns(
+                tile, start, end, window=timedelta(hours=24)
+            )
+            assert list(columns.timestamps) == all_timestamps
+
+            # Stopping early doesn't leave requests behind:
+            async for _ in async_iter_tile_history(tile, start, end):
+                break
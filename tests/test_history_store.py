@@ -0,0 +1,159 @@
+"""Define tests for the local history store."""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pytile import async_login
+from pytile.api import APIOptions
+from pytile.history_store import HistoryStore
+
+from .common import TILE_CLIENT_UUID, TILE_EMAIL, TILE_PASSWORD, TILE_TILE_UUID
+
+HOUR_MS = 3600 * 1000
+
+
+@pytest.mark.asyncio
+async def test_history_store(  # pylint: disable=too-many-locals
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+    tile_details_response: dict[str, Any],
+    tile_states_response: dict[str, Any],
+    tmp_path: Path,
+) -> None:
+    """Test that only history missing from the store is requested.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+        tile_details_response: An API response payload.
+        tile_states_response: An API response payload.
+        tmp_path: A temporary directory.
+    """
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    start = now - timedelta(days=10)
+    start_ms = round(start.timestamp() * 1000)
+    # One location update per hour, up until now:
+    all_timestamps = list(range(start_ms, start_ms + 240 * HOUR_MS + 1, HOUR_MS))
+    requests = []
+
+    def history_response(request: aiohttp.web.Request) -> aiohttp.web.Response:
+        """Return the history within the requested range.
+
+        Args:
+            request: An aiohttp request.
+
+        Returns:
+            An aiohttp response.
+        """
+        start_ts = int(request.query["start_ts"])
+        end_ts = int(request.query["end_ts"])
+        requests.append((start_ts, end_ts))
+        return aiohttp.web_response.json_response(
+            {
+                "result": {
+                    "complete_history": "Y",
+                    "location_updates": [
+                        {"latitude": 51.5, "longitude": -0.38, "location_timestamp": ts}
+                        for ts in all_timestamps
+                        if start_ts <= ts <= end_ts
+                    ],
+                }
+            },
+            status=200,
+        )
+
+    def get_timestamps(history: dict[str, Any]) -> list[int]:
+        """Return the timestamps of a history response.
+
+        Args:
+            history: A history response.
+
+        Returns:
+            A list of timestamps.
+        """
+        return [
+            update["location_timestamp"]
+            for update in history["result"]["location_updates"]
+        ]
+
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_states_response, status=200
+            ),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            f"/api/v1/tiles/{TILE_TILE_UUID}",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_details_response, status=200
+            ),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            f"/api/v1/tiles/location/history/{TILE_TILE_UUID}",
+            "get",
+            response=history_response,
+            repeat=aresponses.INFINITY,
+        )
+
+        store = HistoryStore(tmp_path / "history.db", settle_time=timedelta(hours=6))
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL,
+                TILE_PASSWORD,
+                session,
+                client_uuid=TILE_CLIENT_UUID,
+                options=APIOptions(history_store=store),
+            )
+            tiles = await api.async_get_tiles()
+            tile = tiles[TILE_TILE_UUID]
+
+            # The first request for a time range goes to the API:
+            history = await tile.async_history(
+                start + timedelta(days=2), start + timedelta(days=4)
+            )
+            assert get_timestamps(history) == all_timestamps[48:97]
+            assert len(requests) == 1
+
+            # ...after which it is answered locally:
+            history = await tile.async_history(
+                start + timedelta(days=3), start + timedelta(days=4)
+            )
+            assert get_timestamps(history) == all_timestamps[72:97]
+            assert len(requests) == 1
+
+            # Only the gaps around a stored range are requested:
+            requests.clear()
+            history = await tile.async_history(start, now)
+            assert get_timestamps(history) == all_timestamps
+            assert requests[0] == (start_ms, start_ms + 48 * HOUR_MS - 1)
+            assert requests[1][0] == start_ms + 96 * HOUR_MS + 1
+
+            # History that hasn't settled yet is requested every time:
+            requests.clear()
+            history = await tile.async_history(start, now)
+            assert get_timestamps(history) == all_timestamps
+            assert len(requests) == 1
+            assert requests[0][0] > round(now.timestamp() * 1000) - 7 * HOUR_MS
+
+        store.close()
+
+        # The store persists across instances:
+        store = HistoryStore(tmp_path / "history.db")
+        updates = await store.async_query(
+            TILE_TILE_UUID, start, start + timedelta(days=1)
+        )
+        assert [update["location_timestamp"] for update in updates] == (
+            all_timestamps[:25]
+        )
+        store.close()
@@ -0,0 +1,149 @@
+"""Define tests for metrics."""
+
+from typing import Any
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pytile import async_login
+from pytile.api import API, APIOptions
+from pytile.metrics import Counter, Histogram, Metrics, render_prometheus
+from pytile.trace import RequestTrace
+
+from .common import TILE_CLIENT_UUID, TILE_EMAIL, TILE_PASSWORD, TILE_TILE_UUID
+
+
+def test_counter() -> None:
+    """Test rendering a counter."""
+    counter = Counter("test_total", "A test counter.", ("endpoint",))
+    counter.inc(endpoint="tiles")
+    counter.inc(2, endpoint="tiles")
+    counter.inc(endpoint='say "hi"\n')
+
+    assert counter.get(endpoint="tiles") == 3
+    assert counter.get(endpoint="other") == 0
+    assert counter.render() == [
+        "# HELP test_total A test counter.",
+        "# TYPE test_total counter",
+        'test_total{endpoint="say \\"hi\\"\\n"} 1',
+        'test_total{endpoint="tiles"} 3',
+    ]
+
+    with pytest.raises(ValueError):
+        counter.inc()
+    with pytest.raises(ValueError):
+        counter.inc(method="GET")
+
+
+def test_histogram() -> None:
+    """Test rendering a histogram."""
+    histogram = Histogram("test_seconds", "A test histogram.", buckets=(0.5, 1))
+    for value in (0.25, 0.5, 0.75, 2):
+        histogram.observe(value)
+
+    assert histogram.get_count() == 4
+    assert histogram.render() == [
+        "# HELP test_seconds A test histogram.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{le="0.5"} 2',
+        'test_seconds_bucket{le="1"} 3',
+        'test_seconds_bucket{le="+Inf"} 4',
+        "test_seconds_sum 3.5",
+        "test_seconds_count 4",
+    ]
+
+
+def test_record_request() -> None:
+    """Test the outcomes that requests are recorded with."""
+    metrics = Metrics()
+    metrics.record_request(RequestTrace("get", "tiles/{uuid}", 200, 0.1, retries=2))
+    metrics.record_request(
+        RequestTrace("get", "tiles/{uuid}", None, 0.0, cache_hit=True)
+    )
+    metrics.record_request(
+        RequestTrace("get", "tiles/{uuid}", 503, 0.1, error=RuntimeError())
+    )
+    metrics.record_request(
+        RequestTrace("get", "tiles/{uuid}", 412, 0.1, error=RuntimeError())
+    )
+
+    labels = {"method": "GET", "endpoint": "tiles/{uuid}"}
+    for outcome in ("success", "cache_hit", "server_error", "client_error"):
+        assert metrics.requests.get(**labels, outcome=outcome) == 1
+    # Cache hits aren't included in the latency histogram:
+    assert metrics.request_duration.get_count(**labels) == 3
+    assert metrics.request_retries.get(**labels) == 2
+
+
+@pytest.mark.asyncio
+async def test_metrics_disabled_by_default() -> None:
+    """Test that API objects only record metrics when they're given some."""
+    async with aiohttp.ClientSession() as session:
+        api = API(TILE_EMAIL, TILE_PASSWORD, session)
+        assert api._options.metrics is None  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_metrics(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+    tile_states_response: dict[str, Any],
+) -> None:
+    """Test that API objects record into their metrics.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+        tile_states_response: An API response payload.
+    """
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_states_response, status=200
+            ),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            f"/api/v1/tiles/{TILE_TILE_UUID}",
+            "get",
+            aresponses.Response(text="", status=412),
+        )
+
+        metrics = Metrics()
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL,
+                TILE_PASSWORD,
+                session,
+                client_uuid=TILE_CLIENT_UUID,
+                options=APIOptions(metrics=metrics),
+            )
+            await api.async_get_tiles()
+
+    aresponses.assert_plan_strictly_followed()
+
+    assert metrics.logins.get(outcome="success") == 1
+    assert (
+        metrics.requests.get(
+            method="GET", endpoint="tiles/tile_states", outcome="success"
+        )
+        == 1
+    )
+    assert (
+        metrics.requests.get(
+            method="GET", endpoint="tiles/{uuid}", outcome="client_error"
+        )
+        == 1
+    )
+    assert metrics.response_bytes.get(method="GET", endpoint="tiles/tile_states") > 0
+    assert metrics.tiles_refreshed.get_count() == 1
+    assert metrics.tiles_skipped.get(reason="no_details") == 1
+
+    rendered = render_prometheus(metrics)
+    assert rendered.endswith("\n")
+    assert 'pytile_logins_total{outcome="success"} 1\n' in rendered
+    assert "pytile_tiles_refreshed_count 1\n" in rendered
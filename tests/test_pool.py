@@ -0,0 +1,222 @@
+"""Define tests for the account pool."""
+
+import asyncio
+import re
+from typing import Any
+from unittest.mock import AsyncMock, Mock
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pytile.api import APIOptions
+from pytile.errors import InvalidAuthError
+from pytile.pool import AccountPool
+
+from .common import TILE_CLIENT_UUID, TILE_PASSWORD, TILE_TILE_UUID
+
+
+@pytest.mark.asyncio
+async def test_refresh_accounts(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+    create_client_response: dict[str, Any],
+    create_session_response: dict[str, Any],
+    tile_details_response: dict[str, Any],
+    tile_states_response: dict[str, Any],
+) -> None:
+    """Test refreshing many accounts and merging their Tiles.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+        create_client_response: An API response payload.
+        create_session_response: An API response payload.
+        tile_details_response: An API response payload.
+        tile_states_response: An API response payload.
+    """
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            re.compile(r"/api/v1/clients/.+"),
+            "put",
+            response=aiohttp.web_response.json_response(
+                create_client_response, status=200
+            ),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            re.compile(r"/api/v1/clients/.+/sessions"),
+            "post",
+            response=aiohttp.web_response.json_response(
+                create_session_response, status=200
+            ),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_states_response, status=200
+            ),
+            repeat=2,
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            f"/api/v1/tiles/{TILE_TILE_UUID}",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_details_response, status=200
+            ),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            f"/api/v1/tiles/{TILE_TILE_UUID}",
+            "get",
+            aresponses.Response(text="", status=500),
+        )
+
+        pool = AccountPool(max_concurrency=4)
+        api = await pool.async_add_account(
+            "user1@email.com",
+            TILE_PASSWORD,
+            client_uuid=TILE_CLIENT_UUID,
+            options=APIOptions(payload_log_sample_rate=0),
+        )
+        await pool.async_add_account("user2@email.com", TILE_PASSWORD)
+
+        # Accounts share the pool's concurrency limiter (and keep their own options):
+        # pylint: disable=protected-access
+        assert api._concurrency_limiter is pool._concurrency_limiter
+        assert api._options.payload_log_sample_rate == 0
+        assert list(pool.accounts) == ["user1@email.com", "user2@email.com"]
+
+        tiles = await pool.async_refresh()
+        assert list(tiles) == [TILE_TILE_UUID]
+
+        await pool.async_close()
+        assert not pool.accounts
+        assert not pool.tiles
+
+
+@pytest.mark.asyncio
+async def test_failed_login(aresponses: ResponsesMockServer) -> None:
+    """Test that a failed login doesn't add an account.
+
+    Args:
+        aresponses: An aresponses server.
+    """
+    aresponses.add(
+        "production.tile-api.com",
+        re.compile(r"/api/v1/clients/.+"),
+        "put",
+        aresponses.Response(text="", status=401),
+    )
+
+    pool = AccountPool()
+    with pytest.raises(InvalidAuthError):
+        await pool.async_add_account("user@email.com", TILE_PASSWORD)
+    assert not pool.accounts
+    await pool.async_close()
+
+
+@pytest.mark.asyncio
+async def test_staggered_polling(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that account refreshes are spread over the polling interval.
+
+    Args:
+        monkeypatch: A pytest monkeypatch fixture.
+    """
+    refreshed: list[str] = []
+
+    def login(email: str, *args: Any, **kwargs: Any) -> Mock:
+        """Return a mock API object.
+
+        Args:
+            email: An email address for a Tile account.
+            *args: Additional args.
+            **kwargs: Additional kwargs.
+
+        Returns:
+            A mock API object.
+        """
+
+        async def get_tiles(**kwargs: Any) -> dict[str, Any]:
+            """Record a refresh.
+
+            Args:
+                **kwargs: Additional kwargs.
+
+            Returns:
+                No Tiles.
+            """
+            refreshed.append(email)
+            return {}
+
+        return Mock(async_close=AsyncMock(), async_get_tiles=get_tiles)
+
+    monkeypatch.setattr("pytile.pool.async_login", AsyncMock(side_effect=login))
+
+    pool = AccountPool(poll_interval=0.2)
+    await pool.async_add_account("user1@email.com", TILE_PASSWORD)
+    await pool.async_add_account("user2@email.com", TILE_PASSWORD)
+
+    # user1 is refreshed at 0.0s and 0.2s, user2 at ~0.124s, and user3 (added while
+    # running) at ~0.047s:
+    task = asyncio.create_task(pool.async_run())
+    await asyncio.sleep(0.01)
+    await pool.async_add_account("user3@email.com", TILE_PASSWORD)
+    await asyncio.sleep(0.22)
+    assert refreshed == [
+        "user1@email.com",
+        "user3@email.com",
+        "user2@email.com",
+        "user1@email.com",
+    ]
+
+    # Adding an account again replaces (and closes) the existing one:
+    old_api = pool.accounts["user1@email.com"]
+    new_api = await pool.async_add_account("user1@email.com", TILE_PASSWORD)
+    assert pool.accounts["user1@email.com"] is new_api
+    old_api.async_close.assert_awaited_once()
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await pool.async_close()
+
+
+@pytest.mark.asyncio
+async def test_refresh_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that an account that times out doesn't stop the others from refreshing.
+
+    Args:
+        monkeypatch: The pytest monkeypatch fixture.
+    """
+
+    async def login(email: str, *args: Any, **kwargs: Any) -> Mock:
+        """Return a mock API object.
+
+        Args:
+            email: An email address for a Tile account.
+            *args: Additional args.
+            **kwargs: Additional kwargs.
+
+        Returns:
+            A mock API object.
+        """
+        if email == "slow@email.com":
+            get_tiles = AsyncMock(side_effect=asyncio.TimeoutError)
+        else:
+            get_tiles = AsyncMock(return_value={f"{email}-tile": Mock()})
+        return Mock(async_close=AsyncMock(), async_get_tiles=get_tiles)
+
+    monkeypatch.setattr("pytile.pool.async_login", AsyncMock(side_effect=login))
+
+    pool = AccountPool()
+    for email in ("user1@email.com", "slow@email.com", "user2@email.com"):
+        await pool.async_add_account(email, TILE_PASSWORD)
+
+    tiles = await pool.async_refresh()
+    assert set(tiles) == {"user1@email.com-tile", "user2@email.com-tile"}
+    await pool.async_close()
@@ -0,0 +1,99 @@
+"""Define tests for the client-side rate limiter."""
+
+import asyncio
+from typing import Any
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pytile import async_login
+from pytile.api import APIOptions
+from pytile.rate_limit import RateLimiter, TokenBucket, get_endpoint_class
+
+from .common import TILE_CLIENT_UUID, TILE_EMAIL, TILE_PASSWORD, TILE_TILE_UUID
+
+
+def test_endpoint_classes() -> None:
+    """Test classifying endpoints."""
+    assert get_endpoint_class(f"clients/{TILE_CLIENT_UUID}") == "auth"
+    assert get_endpoint_class(f"clients/{TILE_CLIENT_UUID}/sessions") == "auth"
+    assert get_endpoint_class("tiles/tile_states") == "states"
+    assert get_endpoint_class(f"tiles/{TILE_TILE_UUID}") == "details"
+    assert get_endpoint_class(f"tiles/location/history/{TILE_TILE_UUID}") == "history"
+    assert get_endpoint_class("bad_endpoint") == "other"
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"rate": 0},
+        {"rate": -1},
+        {"endpoint_rates": {"auth": 0}},
+        {"burst": 0},
+        {"burst": 0.5},
+    ],
+)
+def test_invalid_limiter(kwargs: dict[str, Any]) -> None:
+    """Test that invalid rate limiter settings are rejected.
+
+    Args:
+        kwargs: The rate limiter's keyword arguments.
+    """
+    with pytest.raises(ValueError):
+        RateLimiter(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket() -> None:
+    """Test that a token bucket delays requests beyond its burst size."""
+    bucket = TokenBucket(rate=100, capacity=2)
+    assert await bucket.async_acquire() == 0
+    assert await bucket.async_acquire() == 0
+    wait = await bucket.async_acquire()
+    assert 0 < wait <= 0.01
+
+    # A cancelled request gives its reserved token back:
+    bucket = TokenBucket(rate=1, capacity=1)
+    await bucket.async_acquire()
+    task = asyncio.create_task(bucket.async_acquire())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert bucket._tokens > -1  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_shared_limiter(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+) -> None:
+    """Test that requests are counted against per-endpoint-class budgets.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+    """
+    limiter = RateLimiter(100, burst=3, endpoint_rates={"auth": 200})
+
+    async with authenticated_tile_api_server, aiohttp.ClientSession() as session:
+        await async_login(
+            TILE_EMAIL,
+            TILE_PASSWORD,
+            session,
+            client_uuid=TILE_CLIENT_UUID,
+            options=APIOptions(rate_limiter=limiter),
+        )
+
+    stats = limiter.stats["auth"]
+    assert stats.requests == 2
+    assert stats.delayed == 0
+
+    await asyncio.gather(
+        *(limiter.async_acquire("tiles/tile_states") for _ in range(5))
+    )
+    stats = limiter.stats["states"]
+    assert stats.requests == 5
+    assert stats.delayed == 2
+    assert 0 < stats.max_wait <= stats.total_wait
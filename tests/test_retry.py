@@ -0,0 +1,205 @@
+"""Define tests for retry and circuit breaking policies."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Any
+from unittest.mock import Mock
+
+import aiohttp
+import pytest
+from aiohttp.client_exceptions import ClientConnectionError, ClientResponseError
+from aresponses import ResponsesMockServer
+from multidict import CIMultiDict
+
+from pytile import async_login
+from pytile.api import APIOptions
+from pytile.errors import CircuitOpenError, RequestError
+from pytile.retry import CircuitBreaker, RetryPolicy, get_retry_after
+
+from .common import TILE_CLIENT_UUID, TILE_EMAIL, TILE_PASSWORD
+
+
+def _response_error(status: int, headers: dict[str, str] | None = None) -> Any:
+    """Return an HTTP response error.
+
+    Args:
+        status: The HTTP status.
+        headers: Optional response headers.
+
+    Returns:
+        A ClientResponseError.
+    """
+    return ClientResponseError(
+        Mock(),
+        (),
+        status=status,
+        headers=None if headers is None else CIMultiDict(headers),
+    )
+
+
+def test_retry_after() -> None:
+    """Test parsing Retry-After headers."""
+    assert get_retry_after(ClientConnectionError()) is None
+    assert get_retry_after(_response_error(503)) is None
+    assert get_retry_after(_response_error(503, {"Retry-After": "2"})) == 2
+    assert get_retry_after(_response_error(503, {"Retry-After": "soon"})) is None
+
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=60)
+    delay = get_retry_after(
+        _response_error(503, {"Retry-After": format_datetime(retry_at, usegmt=True)})
+    )
+    assert delay is not None
+    assert 55 < delay <= 60
+
+    # Dates without a timezone ("-0000") are treated as UTC:
+    delay = get_retry_after(
+        _response_error(
+            503, {"Retry-After": format_datetime(retry_at.replace(tzinfo=None))}
+        )
+    )
+    assert delay is not None
+    assert 55 < delay <= 60
+
+
+def test_retry_policy() -> None:
+    """Test deciding whether (and when) to retry a request."""
+    policy = RetryPolicy(base_delay=1, max_attempts=3, max_delay=10)
+
+    delay = policy.get_retry_delay("get", _response_error(503), 2)
+    assert delay is not None
+    assert 0 <= delay <= 2
+    assert policy.get_retry_delay("GET", ClientConnectionError(), 1) is not None
+    assert policy.get_retry_delay("get", TimeoutError(), 1) is not None
+
+    # Non-idempotent methods, permanent errors, and exhausted attempts aren't retried:
+    assert policy.get_retry_delay("post", _response_error(503), 1) is None
+    assert policy.get_retry_delay("get", _response_error(404), 1) is None
+    assert policy.get_retry_delay("get", _response_error(503), 3) is None
+
+    # Retry-After is honored (unless it asks for too long a delay):
+    error = _response_error(429, {"Retry-After": "5"})
+    assert policy.get_retry_delay("get", error, 1) == 5
+    error = _response_error(429, {"Retry-After": "60"})
+    assert policy.get_retry_delay("get", error, 1) is None
+
+
+def test_circuit_breaker(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test circuit breaker state transitions.
+
+    Args:
+        monkeypatch: A pytest monkeypatch fixture.
+    """
+    now = 0.0
+    monkeypatch.setattr("pytile.retry.monotonic", lambda: now)
+
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=10)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request("tiles/tile_states")
+
+    now = 10.0
+    assert breaker.state == "half_open"
+    breaker.before_request("tiles/tile_states")
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    now = 20.0
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_retry_request(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+    tile_states_response: dict[str, Any],
+) -> None:
+    """Test that a transient error is retried.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+        tile_states_response: An API response payload.
+    """
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            aresponses.Response(text="", status=503),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_states_response, status=200
+            ),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL,
+                TILE_PASSWORD,
+                session,
+                client_uuid=TILE_CLIENT_UUID,
+                options=APIOptions(retry_policy=RetryPolicy(base_delay=0)),
+            )
+            data = await api._async_request(  # pylint: disable=protected-access
+                "get", "tiles/tile_states"
+            )
+            assert data == tile_states_response
+
+    authenticated_tile_api_server.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+) -> None:
+    """Test that requests fail fast once the circuit opens.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+    """
+    breaker = CircuitBreaker(failure_threshold=1)
+
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            aresponses.Response(text="", status=404),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            aresponses.Response(text="", status=502),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL,
+                TILE_PASSWORD,
+                session,
+                client_uuid=TILE_CLIENT_UUID,
+                options=APIOptions(circuit_breaker=breaker),
+            )
+            # Non-transient errors don't count against the circuit:
+            with pytest.raises(RequestError):
+                await api.async_get_tiles()
+            assert breaker.state == "closed"
+
+            with pytest.raises(RequestError):
+                await api.async_get_tiles()
+            assert breaker.state == "open"
+            with pytest.raises(CircuitOpenError):
+                await api.async_get_tiles()
+
+    authenticated_tile_api_server.assert_plan_strictly_followed()
@@ -0,0 +1,167 @@
+"""Define tests for persistable session state."""
+
+import logging
+import stat
+from pathlib import Path
+from time import time
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+from yarl import URL
+
+from pytile import async_login
+from pytile.api import API, API_URL_SCAFFOLD, APIOptions
+from pytile.errors import SessionExpiredError
+from pytile.session import JSONFileSessionStore, MemorySessionStore, SessionState
+
+from .common import TILE_CLIENT_UUID, TILE_EMAIL, TILE_PASSWORD, TILE_USER_UUID
+
+
+@pytest.mark.asyncio
+async def test_export_without_session() -> None:
+    """Test that exporting state without an active session fails."""
+    async with aiohttp.ClientSession() as session:
+        api = API(TILE_EMAIL, TILE_PASSWORD, session)
+        with pytest.raises(SessionExpiredError):
+            api.export_session_state()
+
+
+@pytest.mark.asyncio
+async def test_json_file_store(tmp_path: Path) -> None:
+    """Test saving and loading session state from JSON files.
+
+    Args:
+        tmp_path: A temporary directory.
+    """
+    store = JSONFileSessionStore(tmp_path / "sessions")
+    assert await store.async_load(TILE_EMAIL) is None
+
+    state: SessionState = {
+        "client_established": True,
+        "client_uuid": TILE_CLIENT_UUID,
+        "cookies": {"session": "abc"},
+        "session_expiry": 1,
+        "user_uuid": TILE_USER_UUID,
+    }
+    await store.async_save(TILE_EMAIL, state)
+    assert await store.async_load(TILE_EMAIL) == state
+
+    # Session files are only readable by their owner and no temporary files remain:
+    [path] = (tmp_path / "sessions").iterdir()
+    assert path.suffix == ".json"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    # A failed save leaves the existing file alone:
+    with (
+        patch("pytile.session.json.dump", side_effect=TypeError),
+        pytest.raises(TypeError),
+    ):
+        await store.async_save(TILE_EMAIL, state)
+    assert list((tmp_path / "sessions").iterdir()) == [path]
+    assert await store.async_load(TILE_EMAIL) == state
+
+
+@pytest.mark.asyncio
+async def test_resume_session(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+) -> None:
+    """Test that a saved session is resumed without any login requests.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+    """
+    store = MemorySessionStore()
+
+    async with authenticated_tile_api_server:
+        async with aiohttp.ClientSession() as session:
+            session.cookie_jar.update_cookies({"session": "abc"}, URL(API_URL_SCAFFOLD))
+            api = await async_login(
+                TILE_EMAIL,
+                TILE_PASSWORD,
+                session,
+                client_uuid=TILE_CLIENT_UUID,
+                options=APIOptions(session_store=store),
+            )
+
+        # The second login should be served entirely from the store:
+        async with aiohttp.ClientSession() as session:
+            resumed_api = await async_login(
+                TILE_EMAIL,
+                TILE_PASSWORD,
+                session,
+                options=APIOptions(session_store=store),
+            )
+            assert resumed_api.client_uuid == TILE_CLIENT_UUID
+            assert resumed_api.user_uuid == TILE_USER_UUID
+            assert resumed_api.export_session_state() == api.export_session_state()
+            assert api.export_session_state()["cookies"] == {"session": "abc"}
+
+    authenticated_tile_api_server.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_resume_expired_session(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+) -> None:
+    """Test that an expired saved session results in a new login.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+    """
+    store = MemorySessionStore()
+    await store.async_save(
+        TILE_EMAIL,
+        {
+            "client_established": False,
+            "client_uuid": TILE_CLIENT_UUID,
+            "cookies": {},
+            "session_expiry": int(time() * 1000) - 1000,
+            "user_uuid": TILE_USER_UUID,
+        },
+    )
+
+    async with authenticated_tile_api_server, aiohttp.ClientSession() as session:
+        api = await async_login(
+            TILE_EMAIL, TILE_PASSWORD, session, options=APIOptions(session_store=store)
+        )
+        state = await store.async_load(TILE_EMAIL)
+        assert state
+        assert state["client_uuid"] == api.client_uuid
+        assert state["session_expiry"] > time() * 1000
+
+    authenticated_tile_api_server.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_save_session_failure(
+    authenticated_tile_api_server: ResponsesMockServer,
+    caplog: pytest.LogCaptureFixture,
+    tmp_path: Path,
+) -> None:
+    """Test that a session that can't be saved doesn't fail the login.
+
+    Args:
+        authenticated_tile_api_server: A mock Tile API server connection.
+        caplog: A mock logging utility.
+        tmp_path: A temporary directory.
+    """
+    # The store's directory can't be created (since a file is in its way):
+    (tmp_path / "sessions").touch()
+    store = JSONFileSessionStore(tmp_path / "sessions")
+
+    async with authenticated_tile_api_server, aiohttp.ClientSession() as session:
+        with caplog.at_level(logging.WARNING):
+            api = await async_login(
+                TILE_EMAIL,
+                TILE_PASSWORD,
+                session,
+                options=APIOptions(session_store=store),
+            )
+        assert api.user_uuid == TILE_USER_UUID
+        assert "Unable to save the Tile session state" in caplog.text
@@ -0,0 +1,180 @@
+"""Define tests for track simplification and downsampling."""
+
+import math
+from collections.abc import AsyncIterator
+from datetime import timedelta
+from typing import Any
+
+import pytest
+
+from pytile.simplify import (
+    SimplificationMethod,
+    TrackReducer,
+    async_reduce_track,
+    reduce_track,
+    simplify,
+)
+
+MINUTE_MS = 60 * 1000
+START_MS = 1672531200000  # 2023-01-01T00:00:00Z
+
+# The number of degrees of latitude that are ~1 meter apart:
+LATITUDE_METER = 1 / 111194.93
+
+
+def _build_update(
+    idx: int, latitude: float, longitude: float, **kwargs: Any
+) -> dict[str, Any]:
+    """Build a location update that happened idx minutes after the start.
+
+    Args:
+        idx: The number of minutes after the start.
+        latitude: The latitude.
+        longitude: The longitude.
+        **kwargs: Additional fields.
+
+    Returns:
+        A location update.
+    """
+    return {
+        "latitude": latitude,
+        "location_timestamp": START_MS + idx * MINUTE_MS,
+        "longitude": longitude,
+        **kwargs,
+    }
+
+
+def _build_zigzag(count: int, amplitude: float) -> list[dict[str, Any]]:
+    """Build a track heading north with a sideways wobble every other update.
+
+    Args:
+        count: The number of location updates.
+        amplitude: The size (in meters) of the wobble.
+
+    Returns:
+        Location updates.
+    """
+    longitude_meter = LATITUDE_METER / math.cos(math.radians(51.5))
+    return [
+        _build_update(
+            idx,
+            51.5 + idx * 100 * LATITUDE_METER,
+            (idx % 2) * amplitude * longitude_meter,
+        )
+        for idx in range(count)
+    ]
+
+
+@pytest.mark.parametrize("method", list(SimplificationMethod))
+def test_simplify(method: SimplificationMethod) -> None:
+    """Test simplifying a track.
+
+    Args:
+        method: The simplification algorithm.
+    """
+    # Wobbles smaller than the tolerance are removed:
+    track = _build_zigzag(21, 0.1)
+    assert simplify(track, 25, method=method) == [track[0], track[-1]]
+
+    # A corner larger than the tolerance is kept:
+    corner = [
+        _build_update(0, 51.5, 0.0),
+        _build_update(1, 51.5 + 500 * LATITUDE_METER, 0.0),
+        _build_update(2, 51.5 + 1000 * LATITUDE_METER, 0.0),
+        _build_update(3, 51.5 + 1000 * LATITUDE_METER, 0.01),
+    ]
+    assert simplify(corner, 25, method=method) == [corner[0], corner[2], corner[3]]
+
+    # Short tracks are returned as-is:
+    assert simplify(track[:2], 25, method=method) == track[:2]
+
+
+def test_reduce_track_filters() -> None:
+    """Test dropping inaccurate updates and downsampling by time."""
+    updates = [
+        _build_update(idx, 51.5, 0.0, horizontal_accuracy=5.0 if idx % 3 else 500.0)
+        for idx in range(12)
+    ]
+    updates.append(_build_update(12, 51.5, 0.0))
+    updates.append(_build_update(13, 51.5, 0.0, horizontal_accuracy=None))
+
+    # Updates without an accuracy (or with a null one) are treated as inaccurate:
+    assert [
+        update["location_timestamp"]
+        for update in reduce_track(updates, max_accuracy=50)
+    ] == [START_MS + idx * MINUTE_MS for idx in (1, 2, 4, 5, 7, 8, 10, 11)]
+
+    # Only the first update of every 5-minute bucket is kept:
+    assert [
+        update["location_timestamp"]
+        for update in reduce_track(updates, interval=timedelta(minutes=5))
+    ] == [START_MS + idx * MINUTE_MS for idx in (0, 5, 10)]
+
+    # Filters are applied before downsampling:
+    assert [
+        update["location_timestamp"]
+        for update in reduce_track(
+            updates, interval=timedelta(minutes=5), max_accuracy=50
+        )
+    ] == [START_MS + idx * MINUTE_MS for idx in (1, 5, 10)]
+
+    with pytest.raises(ValueError):
+        TrackReducer(chunk_size=2)
+
+
+@pytest.mark.parametrize("method", list(SimplificationMethod))
+def test_reduce_track_chunks(method: SimplificationMethod) -> None:
+    """Test simplifying a long track a chunk at a time.
+
+    Args:
+        method: The simplification algorithm.
+    """
+    # A staircase that alternates between heading north and east every 50 updates:
+    longitude_meter = LATITUDE_METER / math.cos(math.radians(51.5))
+    track = []
+    for idx in range(501):
+        leg, step = divmod(idx, 50)
+        north = (leg + 1) // 2 * 50 + (step if leg % 2 == 0 else 0)
+        east = leg // 2 * 50 + (step if leg % 2 == 1 else 0)
+        track.append(
+            _build_update(
+                idx,
+                51.5 + north * 100 * LATITUDE_METER,
+                east * 100 * longitude_meter,
+            )
+        )
+
+    # Updates without a location are dropped:
+    track.insert(10, {"location_timestamp": track[10]["location_timestamp"]})
+
+    # Since chunks overlap, the result matches that of simplifying the whole track:
+    reduced = list(reduce_track(track, tolerance=25, method=method, chunk_size=64))
+    assert reduced == track[:1] + track[51:502:50]
+
+
+@pytest.mark.asyncio
+async def test_async_reduce_track() -> None:
+    """Test reducing an asynchronous stream of location updates."""
+    track = _build_zigzag(1000, 0.1)
+
+    async def async_iter_updates() -> AsyncIterator[dict[str, Any]]:
+        """Yield location updates.
+
+        Yields:
+            Location updates.
+        """
+        for update in track:
+            yield update
+
+    reduced = [
+        update
+        async for update in async_reduce_track(
+            async_iter_updates(),
+            tolerance=25,
+            method=SimplificationMethod.VISVALINGAM,
+            chunk_size=100,
+        )
+    ]
+    # A straight track can't be carried over between chunks, so (to keep memory
+    # bounded) every chunk keeps its endpoints:
+    assert reduced == track[:1] + track[99::99] + track[-1:]
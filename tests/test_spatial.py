@@ -0,0 +1,118 @@
+"""Define tests for the spatial index."""
+
+import random
+
+import pytest
+
+from pytile.events import TileEvent, TileEventType
+from pytile.geo import haversine
+from pytile.spatial import TileIndex
+
+from .common import build_tile
+
+
+def test_invalid_cell_size() -> None:
+    """Test that an invalid cell size is rejected."""
+    with pytest.raises(ValueError):
+        TileIndex(cell_size=0)
+
+
+def test_queries() -> None:
+    """Test that queries match a linear scan."""
+    rng = random.Random(0)
+    tiles = {}
+    for idx in range(300):
+        # Cluster most Tiles around London, but scatter some across the globe
+        # (including around the antimeridian and the poles):
+        if idx % 3:
+            latitude = 51.5 + rng.uniform(-0.2, 0.2)
+            longitude = -0.1 + rng.uniform(-0.3, 0.3)
+        else:
+            latitude = rng.uniform(-90, 90)
+            longitude = rng.uniform(-180, 180)
+        tiles[f"{idx:016x}"] = build_tile(f"{idx:016x}", latitude, longitude)
+    tiles["no_location"] = build_tile("no_location", None, None)
+
+    index = TileIndex(cell_size=0.05)
+    index.update_tiles(tiles)
+    assert len(index) == 301
+    assert "no_location" in index
+
+    located = [
+        (tile.uuid, tile.latitude, tile.longitude)
+        for tile in tiles.values()
+        if tile.latitude is not None and tile.longitude is not None
+    ]
+    points = [(51.5, -0.1), (0, 179.99), (89.9, 0), (-45, -120)]
+    for latitude, longitude in points:
+        expected = sorted(
+            (
+                haversine(latitude, longitude, tile_latitude, tile_longitude),
+                tile_uuid,
+            )
+            for tile_uuid, tile_latitude, tile_longitude in located
+        )
+
+        for radius in (500, 5000, 2_000_000):
+            assert [
+                tile.uuid
+                for tile, _ in index.within_radius(latitude, longitude, radius)
+            ] == [tile_uuid for distance, tile_uuid in expected if distance <= radius]
+
+        for count in (1, 5, 500):
+            nearest = index.nearest(latitude, longitude, count)
+            assert [tile.uuid for tile, _ in nearest] == [
+                tile_uuid for _, tile_uuid in expected[:count]
+            ]
+
+    for south, west, north, east in ((51.4, -0.2, 51.6, 0.0), (-60, 170, 60, -170)):
+        expected_uuids = {
+            tile_uuid
+            for tile_uuid, tile_latitude, tile_longitude in located
+            if south <= tile_latitude <= north
+            and (
+                west <= tile_longitude <= east
+                if west <= east
+                else tile_longitude >= west or tile_longitude <= east
+            )
+        }
+        assert {
+            tile.uuid for tile in index.within_bbox(south, west, north, east)
+        } == expected_uuids
+
+    assert not index.nearest(51.5, -0.1, 0)
+
+
+def test_updates() -> None:
+    """Test keeping the index up to date as Tiles move."""
+    tile = build_tile("tile", 51.5, -0.1)
+    index = TileIndex()
+    index.add(tile)
+    assert [found.uuid for found, _ in index.nearest(51.5, -0.1)] == ["tile"]
+
+    index.handle_event(
+        TileEvent("tile", TileEventType.MOVED, (51.5, -0.1), (48.85, 2.35))
+    )
+    assert not index.within_radius(51.5, -0.1, 1000)
+    assert [found.uuid for found, _ in index.within_radius(48.85, 2.35, 1000)] == [
+        "tile"
+    ]
+
+    # Events for Tiles that aren't indexed are ignored:
+    index.handle_event(TileEvent("other", TileEventType.MOVED, None, (0, 0)))
+    assert "other" not in index
+
+    # Other events re-index a Tile at its current location (which picks up drift
+    # below its move threshold):
+    index.handle_event(TileEvent("tile", TileEventType.LOST, False, True))
+    assert not index.within_radius(48.85, 2.35, 1000)
+    assert index.within_radius(51.5, -0.1, 1000)
+
+    # A Tile that loses its location drops out of queries:
+    index.handle_event(
+        TileEvent("tile", TileEventType.MOVED, (51.5, -0.1), (None, None))
+    )
+    assert not index.nearest(51.5, -0.1)
+
+    index.update_tiles({})
+    assert not index
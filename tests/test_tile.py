@@ -1,16 +1,20 @@
 """Define tests for the client object."""
 
+import asyncio
 import logging
+from copy import deepcopy
 from datetime import datetime
 from typing import Any
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 import aiohttp
 import pytest
 from aresponses import ResponsesMockServer
 
 from pytile import async_login
-from pytile.tile import Tile
+from pytile.api import API, APIOptions
+from pytile.errors import RequestError
+from pytile.tile import Tile, TileUpdateStatus
 
 from .common import (
     TILE_CLIENT_UUID,
@@ -143,6 +147,137 @@ async def test_get_tiles(
     aresponses.assert_plan_strictly_followed()
 
 
+@pytest.mark.asyncio
+async def test_get_tiles_compact(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+    tile_details_response: dict[str, Any],
+    tile_states_response: dict[str, Any],
+) -> None:
+    """Test that compact Tiles drop their raw payloads but keep extra fields.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+        tile_details_response: An API response payload.
+        tile_states_response: An API response payload.
+    """
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_states_response, status=200
+            ),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            f"/api/v1/tiles/{TILE_TILE_UUID}",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_details_response, status=200
+            ),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL,
+                TILE_PASSWORD,
+                session,
+                client_uuid=TILE_CLIENT_UUID,
+                options=APIOptions(
+                    compact_tiles=True,
+                    tile_extra_fields=[
+                        "last_tile_state.connection_state",
+                        "metadata.battery_state",
+                        "name.missing",
+                        "missing",
+                    ],
+                ),
+            )
+            tiles = await api.async_get_tiles()
+            tile = tiles[TILE_TILE_UUID]
+
+            assert tile.raw_data is None
+            assert not hasattr(tile, "__dict__")
+            full_tile = Tile(Mock(), tile_details_response)
+            assert full_tile.raw_data is tile_details_response
+            assert tile.as_dict() == full_tile.as_dict()
+            assert tile.extra == {
+                "last_tile_state.connection_state": "DISCONNECTED",
+                "metadata.battery_state": "10",
+                "name.missing": None,
+                "missing": None,
+            }
+
+    authenticated_tile_api_server.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_get_tiles_incremental(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+    tile_details_response: dict[str, Any],
+    tile_details_update_response: dict[str, Any],
+    tile_states_response: dict[str, Any],
+) -> None:
+    """Test that an incremental refresh only requests details for changed Tiles.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+        tile_details_response: An API response payload.
+        tile_details_update_response: An API response payload.
+        tile_states_response: An API response payload.
+    """
+    moved_tile_states_response = deepcopy(tile_states_response)
+    moved_tile_states_response["result"][0]["location"]["location_timestamp"] += 1000
+
+    async with authenticated_tile_api_server:
+        for states_response, details_response in (
+            (tile_states_response, tile_details_response),
+            (tile_states_response, None),
+            (moved_tile_states_response, tile_details_update_response),
+        ):
+            authenticated_tile_api_server.add(
+                "production.tile-api.com",
+                "/api/v1/tiles/tile_states",
+                "get",
+                response=aiohttp.web_response.json_response(
+                    states_response, status=200
+                ),
+            )
+            if details_response:
+                authenticated_tile_api_server.add(
+                    "production.tile-api.com",
+                    f"/api/v1/tiles/{TILE_TILE_UUID}",
+                    "get",
+                    response=aiohttp.web_response.json_response(
+                        details_response, status=200
+                    ),
+                )
+
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL, TILE_PASSWORD, session, client_uuid=TILE_CLIENT_UUID
+            )
+            tiles = await api.async_get_tiles(incremental=True)
+            tile = tiles[TILE_TILE_UUID]
+            assert tile.latitude == 51.528308
+
+            # The Tile's state hasn't changed, so no details should be requested:
+            tiles = await api.async_get_tiles(incremental=True)
+            assert tiles[TILE_TILE_UUID] is tile
+
+            # The Tile has moved, so the existing object should be updated in place:
+            tiles = await api.async_get_tiles(incremental=True)
+            assert tiles[TILE_TILE_UUID] is tile
+            assert tile.latitude == 51.8943631
+
+    aresponses.assert_plan_strictly_followed()
+
+
 @pytest.mark.asyncio
 async def test_get_tiles_http_error(
     aresponses: ResponsesMockServer,
@@ -413,3 +548,139 @@ async def test_tile_update(
             assert tile.longitude == -0.4930538
 
     aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_update_tiles(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+    tile_details_response: dict[str, Any],
+    tile_details_update_response: dict[str, Any],
+    tile_states_response: dict[str, Any],
+) -> None:
+    """Test updating many Tiles at once.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+        tile_details_response: An API response payload.
+        tile_details_update_response: An API response payload.
+        tile_states_response: An API response payload.
+    """
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_states_response, status=200
+            ),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            f"/api/v1/tiles/{TILE_TILE_UUID}",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_details_response, status=200
+            ),
+        )
+        for response in (
+            aiohttp.web_response.json_response(
+                tile_details_update_response, status=200
+            ),
+            aiohttp.web_response.json_response(
+                tile_details_update_response, status=200
+            ),
+            aresponses.Response(text="", status=412),
+            aresponses.Response(text="", status=404),
+        ):
+            authenticated_tile_api_server.add(
+                "production.tile-api.com",
+                f"/api/v1/tiles/{TILE_TILE_UUID}",
+                "get",
+                response=response,
+            )
+
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL, TILE_PASSWORD, session, client_uuid=TILE_CLIENT_UUID
+            )
+            tiles = await api.async_get_tiles()
+            tile = tiles[TILE_TILE_UUID]
+
+            statuses = []
+            for _ in range(4):
+                # Duplicate Tiles are only updated once:
+                results = await api.async_update_tiles([tile, tile])
+                assert list(results) == [TILE_TILE_UUID]
+                assert results[TILE_TILE_UUID].tile is tile
+                statuses.append(results[TILE_TILE_UUID].status)
+
+            assert statuses == [
+                TileUpdateStatus.UPDATED,
+                TileUpdateStatus.UNCHANGED,
+                TileUpdateStatus.LABEL,
+                TileUpdateStatus.ERROR,
+            ]
+            assert isinstance(results[TILE_TILE_UUID].error, RequestError)
+            assert tile.latitude == 51.8943631
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_update_tiles_concurrency(
+    tile_details_response: dict[str, Any],
+) -> None:
+    """Test that updating many Tiles respects the concurrency limit.
+
+    Args:
+        tile_details_response: An API response payload.
+    """
+    in_flight = 0
+    max_in_flight = 0
+
+    payloads = {}
+    for idx in range(10):
+        payloads[f"tiles/tile{idx}"] = data = deepcopy(tile_details_response)
+        data["result"]["tile_uuid"] = f"tile{idx}"
+
+    async def async_request(
+        method: str, endpoint: str, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Return a Tile details payload (after a while).
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            **kwargs: Additional request arguments.
+
+        Returns:
+            An API response payload.
+        """
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return payloads[endpoint]
+
+    tiles = [Tile(async_request, payload) for payload in payloads.values()]
+
+    async with aiohttp.ClientSession() as session:
+        api = API(TILE_EMAIL, TILE_PASSWORD, session)
+        results = await api.async_update_tiles(reversed(tiles), max_concurrency=3)
+
+        with pytest.raises(ValueError):
+            await api.async_update_tiles(tiles, max_concurrency=0)
+
+        # Errors other than request failures (e.g., bugs) aren't swallowed:
+        broken_tile = Tile(AsyncMock(side_effect=RuntimeError), payloads["tiles/tile0"])
+        with pytest.raises(RuntimeError):
+            await api.async_update_tiles([broken_tile])
+
+    assert max_in_flight == 3
+    assert list(results) == [f"tile{idx}" for idx in reversed(range(10))]
+    assert all(
+        result.status is TileUpdateStatus.UNCHANGED for result in results.values()
+    )
@@ -0,0 +1,188 @@
+"""Define tests for request instrumentation."""
+
+import math
+from typing import Any
+from unittest.mock import Mock
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from pytile import async_login
+from pytile.api import APIOptions
+from pytile.cache import ResponseCache
+from pytile.errors import RequestError, TileError
+from pytile.retry import RetryPolicy
+from pytile.trace import EndpointLatency, LatencyAggregator, RequestTrace
+from pytile.util import get_endpoint_template
+
+from .common import (
+    TILE_CLIENT_UUID,
+    TILE_EMAIL,
+    TILE_PASSWORD,
+    TILE_TILE_UUID,
+)
+
+
+def test_endpoint_template() -> None:
+    """Test replacing the identifiers in an endpoint."""
+    assert get_endpoint_template(f"tiles/{TILE_TILE_UUID}") == "tiles/{uuid}"
+    assert (
+        get_endpoint_template(f"clients/{TILE_CLIENT_UUID}/sessions")
+        == "clients/{uuid}/sessions"
+    )
+    assert (
+        get_endpoint_template(f"tiles/location/history/{TILE_TILE_UUID}")
+        == "tiles/location/history/{uuid}"
+    )
+    assert get_endpoint_template("tiles/tile_states") == "tiles/tile_states"
+
+
+def test_latency_aggregator() -> None:
+    """Test aggregating request latencies per endpoint."""
+    aggregator = LatencyAggregator(buckets=(0.1, 0.2))
+    for duration in (0.05, 0.05, 0.15, 0.15, 0.3):
+        aggregator(RequestTrace("get", "tiles/{uuid}", 200, duration, retries=1))
+    aggregator(RequestTrace("get", "tiles/{uuid}", None, 0.0, cache_hit=True))
+    aggregator(
+        RequestTrace("put", "clients/{uuid}", 503, 0.5, error=RuntimeError("oops"))
+    )
+
+    stats = aggregator.endpoints[("GET", "tiles/{uuid}")]
+    assert stats.count == 6
+    assert stats.cache_hit_count == 1
+    assert stats.retry_count == 5
+    assert stats.bucket_counts == [2, 2, 1]
+    assert stats.mean == pytest.approx(0.14)
+    assert stats.percentile(40) == pytest.approx(0.1)
+    assert stats.percentile(50) == pytest.approx(0.125)
+    assert stats.percentile(100) == pytest.approx(0.3)
+    assert aggregator.endpoints[("PUT", "clients/{uuid}")].error_count == 1
+
+    aggregator.reset()
+    assert not aggregator.endpoints
+    assert math.isnan(EndpointLatency().percentile(50))
+    assert math.isnan(EndpointLatency().mean)
+
+
+@pytest.mark.asyncio
+async def test_request_hooks(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+    tile_details_response: dict[str, Any],
+    tile_states_response: dict[str, Any],
+) -> None:
+    """Test that every request is reported to the request hooks.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+        tile_details_response: An API response payload.
+        tile_states_response: An API response payload.
+    """
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            aresponses.Response(text="", status=503),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_states_response, status=200
+            ),
+        )
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            f"/api/v1/tiles/{TILE_TILE_UUID}",
+            "get",
+            response=aiohttp.web_response.json_response(
+                tile_details_response, status=200
+            ),
+        )
+
+        traces: list[RequestTrace] = []
+        aggregator = LatencyAggregator()
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL,
+                TILE_PASSWORD,
+                session,
+                client_uuid=TILE_CLIENT_UUID,
+                options=APIOptions(
+                    response_cache=ResponseCache(),
+                    retry_policy=RetryPolicy(base_delay=0),
+                    request_hooks=[traces.append],
+                ),
+            )
+            remove_aggregator = api.add_request_hook(aggregator)
+            # A hook that fails with a Tile error doesn't affect requests (or other
+            # hooks):
+            api.add_request_hook(Mock(side_effect=TileError))
+
+            await api.async_get_tiles()
+            remove_aggregator()
+            await api.async_get_tiles()
+
+    aresponses.assert_plan_strictly_followed()
+
+    assert [(trace.method, trace.endpoint, trace.cache_hit) for trace in traces] == [
+        ("put", "clients/{uuid}", False),
+        ("post", "clients/{uuid}/sessions", False),
+        ("get", "tiles/tile_states", False),
+        ("get", "tiles/{uuid}", False),
+        ("get", "tiles/tile_states", True),
+        ("get", "tiles/{uuid}", True),
+    ]
+
+    states_trace = traces[2]
+    assert states_trace.status == 200
+    assert states_trace.retries == 1
+    assert states_trace.error is None
+    assert states_trace.response_bytes > 0
+    assert 0 <= states_trace.wire <= states_trace.duration
+    assert states_trace.queued + states_trace.wire <= states_trace.duration
+
+    assert set(aggregator.endpoints) == {
+        ("GET", "tiles/tile_states"),
+        ("GET", "tiles/{uuid}"),
+    }
+    assert aggregator.endpoints[("GET", "tiles/tile_states")].retry_count == 1
+
+
+@pytest.mark.asyncio
+async def test_request_hooks_error(
+    aresponses: ResponsesMockServer,
+    authenticated_tile_api_server: ResponsesMockServer,
+) -> None:
+    """Test that failed requests are reported to the request hooks.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_tile_api_server: A mock Tile API server connection.
+    """
+    async with authenticated_tile_api_server:
+        authenticated_tile_api_server.add(
+            "production.tile-api.com",
+            "/api/v1/tiles/tile_states",
+            "get",
+            aresponses.Response(text="", status=404),
+        )
+
+        traces: list[RequestTrace] = []
+        async with aiohttp.ClientSession() as session:
+            api = await async_login(
+                TILE_EMAIL, TILE_PASSWORD, session, client_uuid=TILE_CLIENT_UUID
+            )
+            api.add_request_hook(traces.append)
+            with pytest.raises(RequestError):
+                await api.async_get_tiles()
+
+    aresponses.assert_plan_strictly_followed()
+
+    assert len(traces) == 1
+    assert traces[0].status == 404
+    assert traces[0].error is not None